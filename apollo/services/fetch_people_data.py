@@ -1,15 +1,60 @@
-from config import Config, logging
+from config import Config
+from concurrent.futures import ThreadPoolExecutor
 from apollo.services.validate_payload import validate_payload
 from apollo.utils.request_helper import make_request_with_retry
+from apollo.utils.response_cache import get_apollo_cache
+from apollo.utils.contact_index import APOLLO_ID_KEY
 
 
 # Use Config class to access ENVs
 APOLLO_API_URL = Config.APOLLO_API_URL
+APOLLO_PAGE_CONCURRENCY = Config.APOLLO_PAGE_CONCURRENCY
+
+
+def _contact_rows(data: dict) -> list:
+    return [
+        {
+            "First Name": contact.get("first_name", "N/A"),
+            "Last Name": contact.get("last_name", "N/A"),
+            "Job Title": contact.get("title", "N/A"),
+            "Email": contact.get("email", "N/A"),
+            "Company": contact.get("organization_name", "N/A"),
+            "LinkedIn URL": contact.get("linkedin_url", "N/A"),
+            APOLLO_ID_KEY: contact.get("person_id") or contact.get("id"),
+        }
+        for contact in data.get("contacts") or []
+    ]
+
+
+def _fetch_page(company_name: str, payload: dict, headers: dict, page: int) -> dict:
+    """
+    Fetches one results page, from the Apollo response cache when it has a fresh copy.
+    """
+    page_payload = {**payload, "page": page}
+    cache = get_apollo_cache()
+
+    if cache:
+        data = cache.get(APOLLO_API_URL, page_payload)
+        if data is not None:
+            return data
+
+    try:
+        data = make_request_with_retry(APOLLO_API_URL, headers, page_payload)
+    except Exception as e:
+        raise RuntimeError(f"Error fetching page {page} for {company_name}: {e}") from e
+
+    if cache:
+        cache.put(APOLLO_API_URL, page_payload, data)
+
+    return data
 
 
 def fetch_apollo_people_data(company_name: str, payload: dict, headers: dict) -> list:
     """
     Fetches enriched people data from Apollo.io API.
+    Page 1 reports pagination.total_pages; the remaining pages are then fetched
+    APOLLO_PAGE_CONCURRENCY at a time, all paced by the shared Apollo rate limiter.
+    A page that keeps failing fails the whole company, so it is never recorded as finished.
 
     :param company_name: str, Company name for the search
     :param payload: dict, Request payload
@@ -19,31 +64,17 @@ def fetch_apollo_people_data(company_name: str, payload: dict, headers: dict) ->
     if not validate_payload(payload):
         raise ValueError(f"Invalid payload for company: {company_name}")
 
-    page = 1
-    enriched_data = []
-
-    while True:
-        try:
-            payload["page"] = page
-            data = make_request_with_retry(APOLLO_API_URL, headers, payload)
-
-            if "contacts" in data:
-                for contact in data["contacts"]:
-                    enriched_data.append({
-                        "First Name": contact.get("first_name", "N/A"),
-                        "Last Name": contact.get("last_name", "N/A"),
-                        "Job Title": contact.get("title", "N/A"),
-                        "Email": contact.get("email", "N/A"),
-                        "Company": contact.get("organization_name", "N/A"),
-                        "LinkedIn URL": contact.get("linkedin_url", "N/A"),
-                    })
-
-            if page >= data.get("pagination", {}).get("total_pages", 0):
-                break
-
-            page += 1
-        except Exception as e:
-            print(f"Error fetching data for {company_name}: {e}")
-            break
+    data = _fetch_page(company_name, payload, headers, 1)
+    enriched_data = _contact_rows(data)
+    total_pages = data.get("pagination", {}).get("total_pages", 0)
+
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=min(APOLLO_PAGE_CONCURRENCY, total_pages - 1)) as executor:
+            # map keeps the contacts in page order
+            for page_rows in executor.map(
+                lambda page: _contact_rows(_fetch_page(company_name, payload, headers, page)),
+                range(2, total_pages + 1),
+            ):
+                enriched_data.extend(page_rows)
 
     return enriched_data
@@ -1,2 +1,6 @@
 from .concurrency_limiter import limit_concurrency
-from .request_helper import make_request_with_retry
\ No newline at end of file
+from .request_helper import make_request_with_retry
+from .rate_limiter import TokenBucket, get_apollo_rate_limiter
+from .incremental_writer import IncrementalCsvWriter
+from .response_cache import ApolloResponseCache, get_apollo_cache, apollo_cache_key
+from .contact_index import ContactIndex
\ No newline at end of file
@@ -1,25 +1,54 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 
-def limit_concurrency(tasks: list, handler, max_concurrent: int = 5) -> list:
+def limit_concurrency(tasks, handler, max_concurrent: int = 5, on_result=None) -> list:
     """
     Limits the number of concurrent tasks.
+    Tasks are submitted as slots free up, so at most twice max_concurrent are pending at once
+    and tasks may be a lazy iterable. With on_result, every result is handed to
+    on_result(task, result) as soon as its task finishes and is not kept in the returned list.
 
-    :param tasks: list, Tasks to process
+    :param tasks: iterable, Tasks to process
     :param handler: function, Handler function for processing each task
     :param max_concurrent: int, Maximum concurrent tasks
-    :return: list, Results of processed tasks
+    :param on_result: function, Optional callback for each task's result
+    :return: list, Results of processed tasks (empty with on_result)
     """
     results = []
-    
-    with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
-        future_to_task = {executor.submit(handler, task): task for task in tasks}
+    tasks = iter(tasks)
+    window = max_concurrent * 2
+
+    def collect(done):
+        for future in done:
+            task = future_to_task.pop(future)
 
-        for future in as_completed(future_to_task):
             try:
-                results.append(future.result())
+                result = future.result()
+            except Exception as e:
+                logging.error(f"Task failed: {e}")
+                continue
 
+            try:
+                if on_result:
+                    on_result(task, result)
+                else:
+                    results.append(result)
             except Exception as e:
-                print(f"Task failed: {e}")
+                logging.error(f"Result handler failed for {task}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+        future_to_task = {}
+
+        for task in tasks:
+            if len(future_to_task) >= window:
+                done, _ = wait(future_to_task, return_when=FIRST_COMPLETED)
+                collect(done)
+
+            future_to_task[executor.submit(handler, task)] = task
+
+        while future_to_task:
+            done, _ = wait(future_to_task, return_when=FIRST_COMPLETED)
+            collect(done)
 
-    return results
\ No newline at end of file
+    return results
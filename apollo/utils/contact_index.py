@@ -0,0 +1,79 @@
+import os
+import csv
+from config import logging
+
+
+# Row key carrying the Apollo person id; it is used for deduplication and not written to the CSV
+APOLLO_ID_KEY = "_apollo_id"
+
+
+def normalize_linkedin_url(url):
+    """
+    Canonical form of a LinkedIn profile URL: https, no www, query string or trailing slash, lower case.
+    """
+    if not url or url == "N/A":
+        return None
+
+    url = url.strip().split("?")[0].rstrip("/").casefold()
+    url = url.replace("http://", "https://", 1).replace("://www.", "://", 1)
+    return url if "://" in url else f"https://{url}"
+
+
+class ContactIndex:
+    """
+    Apollo person ids and LinkedIn URLs of the contacts written so far, so a person returned
+    for several companies (e.g. "Deloitte" and "Deloitte UK") is written once.
+    Not thread-safe: it is meant for limit_concurrency's on_result, which runs on the submitting thread.
+    """
+
+    def __init__(self):
+        self._keys = set()
+        self.duplicates = 0
+
+    @staticmethod
+    def _contact_keys(row):
+        keys = []
+
+        if row.get(APOLLO_ID_KEY):
+            keys.append(f"id:{row[APOLLO_ID_KEY]}")
+
+        linkedin_url = normalize_linkedin_url(row.get("LinkedIn URL"))
+        if linkedin_url:
+            keys.append(f"linkedin:{linkedin_url}")
+
+        return keys
+
+    def load_csv(self, path: str):
+        """
+        Indexes the contacts of an existing output file, e.g. when a run resumes.
+        Only LinkedIn URLs can be recovered, as person ids are not written.
+        """
+        if not os.path.exists(path):
+            return
+
+        with open(path, "r", newline="") as file:
+            for row in csv.DictReader(file):
+                self._keys.update(self._contact_keys(row))
+
+        logging.info(f"Indexed {len(self._keys)} contacts already in {path}")
+
+    def filter_new(self, rows: list) -> list:
+        """
+        Returns the rows whose person id or LinkedIn URL has not been seen, and indexes them.
+        """
+        new_rows = []
+
+        for row in rows:
+            keys = self._contact_keys(row)
+
+            if any(key in self._keys for key in keys):
+                self.duplicates += 1
+                continue
+
+            self._keys.update(keys)
+            new_rows.append(row)
+
+        return new_rows
+
+    def log_stats(self):
+        logging.info(f"Skipped {self.duplicates} contacts already written for another company")
@@ -0,0 +1,104 @@
+import os
+import csv
+import threading
+from config import logging
+
+
+class IncrementalCsvWriter:
+    """
+    Appends each company's contacts to the output CSV as soon as the company is finished,
+    and records the company in a checkpoint file next to it (<output_file>.checkpoint).
+    A rerun with the same output file skips the checkpointed companies and appends the rest.
+
+    Every checkpoint line stores the output size after the company's rows were written, so rows
+    of a company that was being written when the previous run died are truncated on resume.
+
+    Usage:
+        with IncrementalCsvWriter(output_file, fieldnames) as writer:
+            if not writer.is_done(company):
+                writer.write_company(company, rows)
+    """
+
+    def __init__(self, output_file: str, fieldnames: list, checkpoint_file: str = None):
+        self.output_file = output_file
+        self.fieldnames = fieldnames
+        self.checkpoint_file = checkpoint_file or f"{output_file}.checkpoint"
+        self.completed = set()
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._checkpoint = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        resume_offset = self._load_checkpoint()
+
+        if resume_offset is None:
+            self._file = open(self.output_file, 'w', newline='')
+            self._checkpoint = open(self.checkpoint_file, 'w')
+            csv.DictWriter(self._file, fieldnames=self.fieldnames).writeheader()
+            self._file.flush()
+        else:
+            self._file = open(self.output_file, 'r+', newline='')
+            self._file.truncate(resume_offset)
+            self._file.seek(resume_offset)
+            self._checkpoint = open(self.checkpoint_file, 'a')
+            logging.warning(f"Resuming {self.output_file}: skipping {len(self.completed)} finished companies")
+
+        #* Row keys outside fieldnames (e.g. ids used for deduplication) are not written
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction='ignore')
+
+    def _load_checkpoint(self):
+        """
+        Reads the finished companies and returns the output size to resume from,
+        or None to start a new output file.
+        """
+        if not (os.path.exists(self.checkpoint_file) and os.path.exists(self.output_file)):
+            return None
+
+        resume_offset = None
+
+        with open(self.checkpoint_file, 'r') as checkpoint:
+            for line in checkpoint:
+                company, _, offset = line.rstrip('\n').rpartition('\t')
+                if not offset.isdigit():
+                    continue  # Partially written line of an interrupted run
+
+                self.completed.add(company)
+                resume_offset = int(offset)
+
+        if resume_offset is None:
+            return None
+
+        return min(resume_offset, os.path.getsize(self.output_file))
+
+    def is_done(self, company: str) -> bool:
+        return company in self.completed
+
+    def write_company(self, company: str, rows: list):
+        """
+        Appends a company's rows, flushes them to disk, then checkpoints the company.
+        """
+        with self._lock:
+            self._writer.writerows(rows)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            self._checkpoint.write(f"{company}\t{self._file.tell()}\n")
+            self._checkpoint.flush()
+
+            self.completed.add(company)
+            self.rows_written += len(rows)
+
+    def close(self):
+        for file in (self._file, self._checkpoint):
+            if file:
+                file.close()
+
+        logging.info(f"Wrote {self.rows_written} rows to {self.output_file}, {len(self.completed)} companies finished")
@@ -0,0 +1,140 @@
+import time
+import threading
+from datetime import datetime, timezone
+from config import Config, logging
+from email.utils import parsedate_to_datetime
+
+
+# Use Config class to access ENVs
+APOLLO_RATE_LIMIT = Config.APOLLO_RATE_LIMIT
+APOLLO_RATE_BURST = Config.APOLLO_RATE_BURST
+
+
+def retry_after_seconds(value) -> float:
+    """
+    Seconds to wait from a Retry-After header, given either as seconds or as an HTTP date.
+    """
+    if not value:
+        return 0.0
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every Apollo request, whichever company or page it is for.
+    Tokens refill at the per-minute rate and up to `burst` can be spent at once. Apollo's
+    rate-limit headers lower the rate and drain the bucket when the quota runs low, and a
+    429 pauses every caller until its Retry-After has passed.
+    """
+
+    def __init__(self, rate_per_minute: float = APOLLO_RATE_LIMIT, burst: int = APOLLO_RATE_BURST):
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.tokens = float(burst)
+        self.paused_until = 0.0
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent.
+        """
+        start_time = time.monotonic()
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.requests += 1
+                    self.throttled_seconds += now - start_time
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """
+        Stops all requests for the given number of seconds, e.g. after a 429.
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def update_from_headers(self, headers):
+        """
+        Adjusts the bucket to the quota Apollo reports on every response
+        (x-rate-limit-minute, x-minute-requests-left, x-hourly-requests-left).
+        """
+        minute_limit = headers.get('x-rate-limit-minute')
+        minute_left = headers.get('x-minute-requests-left')
+        hourly_left = headers.get('x-hourly-requests-left')
+
+        with self._lock:
+            if minute_limit and minute_limit.isdigit() and int(minute_limit) / 60 < self.rate:
+                self.rate = int(minute_limit) / 60
+                logging.warning(f"Apollo allows {minute_limit} requests per minute, lowering the request rate")
+
+            if minute_left and minute_left.isdigit():
+                self.tokens = min(self.tokens, int(minute_left))
+
+        #! Quota windows are assumed to reset on the wall-clock minute and hour
+        if minute_left == '0':
+            self.pause(60 - time.time() % 60)
+        if hourly_left == '0':
+            logging.warning("Apollo hourly quota used up, pausing requests until the next hour")
+            self.pause(3600 - time.time() % 3600)
+
+    def rate_limited_for(self, seconds: float):
+        """
+        Records a 429 response and pauses all requests for its Retry-After.
+        """
+        with self._lock:
+            self.rate_limited += 1
+
+        logging.warning(f"Apollo rate limit hit, pausing requests for {seconds:.1f} seconds")
+        self.pause(seconds)
+
+    def log_stats(self):
+        logging.info(
+            f"Apollo requests: {self.requests}, rate limited: {self.rate_limited}, "
+            f"time spent waiting for the rate limit: {self.throttled_seconds:.1f} seconds"
+        )
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_apollo_rate_limiter() -> TokenBucket:
+    """
+    Returns the process-wide Apollo token bucket, creating it on first use.
+    """
+    global _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket()
+
+        return _rate_limiter
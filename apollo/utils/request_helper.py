@@ -1,10 +1,19 @@
 import time
 import requests
+from config import logging
+from scraper_utils.http_session import get_http_session
+from apollo.utils.rate_limiter import get_apollo_rate_limiter, retry_after_seconds
+
+
+# Client errors that another attempt will not fix
+NON_RETRYABLE_STATUSES = {400, 401, 403, 404, 422}
 
 
 def make_request_with_retry(url: str, headers: dict, payload: dict, retries: int = 3) -> dict:
     """
     Makes an HTTP request with retry logic and exponential backoff.
+    Every attempt waits for a token from the shared Apollo rate limiter, whose quota is
+    updated from the response headers; a 429 pauses all requests for its Retry-After.
 
     :param url: str, The API URL
     :param headers: dict, Request headers
@@ -12,17 +21,35 @@ def make_request_with_retry(url: str, headers: dict, payload: dict, retries: int
     :param retries: int, Maximum number of retries
     :return: dict, The API response
     """
+    rate_limiter = get_apollo_rate_limiter()
+
     for attempt in range(retries + 1):
+        rate_limiter.acquire()
+
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = get_http_session().post(url, json=payload, headers=headers, timeout=30)
+            rate_limiter.update_from_headers(response.headers)
+
+            if response.status_code == 429:
+                wait_time = retry_after_seconds(response.headers.get('Retry-After')) or 2 ** attempt
+                rate_limiter.rate_limited_for(wait_time)
+
             response.raise_for_status()
 
             return response.json()
         except requests.exceptions.RequestException as e:
+            status_code = e.response.status_code if e.response is not None else None
+
+            if status_code in NON_RETRYABLE_STATUSES:
+                raise RuntimeError(f"Request rejected with status {status_code}. Error: {e}")
+
             if attempt < retries:
+                if status_code == 429:
+                    continue  # The rate limiter already waits for Retry-After
+
                 wait_time = 2 ** attempt
-                
-                print(f"Retrying in {wait_time} seconds... (Attempt {attempt + 1}/{retries})")
+
+                logging.info(f"Retrying in {wait_time} seconds... (Attempt {attempt + 1}/{retries})")
                 time.sleep(wait_time)
             else:
-                raise RuntimeError(f"Max retries exceeded. Error: {e}")
\ No newline at end of file
+                raise RuntimeError(f"Max retries exceeded. Error: {e}")
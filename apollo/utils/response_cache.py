@@ -0,0 +1,70 @@
+import json
+import threading
+from urllib.parse import urlencode
+from config import Config, logging
+from scraper_utils.response_cache import ResponseCache
+
+
+# Use Config class to access ENVs
+APOLLO_CACHE_DIR = Config.APOLLO_CACHE_DIR
+APOLLO_CACHE_TTL = Config.APOLLO_CACHE_TTL
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, (list, tuple)):
+        return ";".join(sorted({_normalize_value(item) for item in value}))
+    return str(value)
+
+
+def apollo_cache_key(url: str, payload: dict) -> str:
+    """
+    Cache key of an Apollo search: the URL plus the payload with casefolded, whitespace-collapsed
+    strings and sorted, de-duplicated lists, so payloads that only differ in the order of
+    person_titles or locations, or in the case of q_keywords, share an entry. The page is part of it.
+    """
+    return f"{url}?{urlencode(sorted((key, _normalize_value(value)) for key, value in payload.items()))}"
+
+
+class ApolloResponseCache:
+    """
+    Persistent cache of Apollo search responses on top of the compressed ResponseCache store,
+    so re-runs over the same companies do not pay for the same pages again.
+    """
+
+    def __init__(self, directory: str = APOLLO_CACHE_DIR, ttl: int = APOLLO_CACHE_TTL):
+        self._cache = ResponseCache(directory=directory, ttl=ttl)
+
+    def get(self, url: str, payload: dict):
+        """
+        Returns the cached response data for a search, or None if it is missing or expired.
+        """
+        body = self._cache.get(apollo_cache_key(url, payload))
+        return json.loads(body) if body is not None else None
+
+    def put(self, url: str, payload: dict, data: dict):
+        self._cache.put(apollo_cache_key(url, payload), json.dumps(data).encode())
+
+    def log_stats(self):
+        logging.info(f"Apollo cache hits: {self._cache.hits}, misses: {self._cache.misses} (each miss is a paid request)")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_apollo_cache():
+    """
+    Returns the shared Apollo response cache, or None when APOLLO_CACHE_TTL is 0.
+    """
+    global _cache
+
+    if APOLLO_CACHE_TTL <= 0:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ApolloResponseCache()
+
+    return _cache
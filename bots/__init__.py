@@ -1 +1,2 @@
-from .bot_manager import process_job_search, process_job_listing_details, run_bot_manager
+from .bot_manager import process_job_search, process_job_listing_details, run_bot_manager, run_async_bot_manager, run_pipeline
+from .retry_scheduler import RetryScheduler, AsyncRetryScheduler
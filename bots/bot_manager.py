@@ -1,149 +1,933 @@
 import time
+import queue
+from collections import deque, defaultdict
+import asyncio
+import aiohttp
 import requests
-from database import get_session
+from functools import partial
+from database import get_session, log_pool_stats
 from config import Config, logging
-from database.models import JobSearch, JobListing
-from scraper_utils.last_page_finder import get_last_page
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from jobs.job_scraper import scrape_jobs_from_page, scrape_job_details
+from database.models import JobSearch
+from database.batch_writer import BatchWriter, apply_update
+from database.job_keys import log_dedup_stats
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from bots.retry_scheduler import RetryScheduler, AsyncRetryScheduler, retry_later, retry_later_async
+from database.work_source import (
+    iter_job_listing_refs, iter_job_listing_refs_async, reset_interrupted_job_listings,
+    mark_job_listing_failed, release_job_listing, log_scrape_progress
+)
+from scraper_utils.parse_pool import shutdown_parse_pool
+from scraper_utils.adaptive_limiter import get_adaptive_limiter
+from scraper_utils.http_session import log_connection_stats
+from scraper_utils.response_cache import CacheMissError, log_response_cache_stats
+from scraper_utils.last_page_finder import get_last_page, get_last_page_async
+from scraper_utils.fetch_engine import AsyncFetchEngine, run_async, gather_and_log, gather_windowed
+from jobs.link_generator import generate_page_url, generate_pagination_links, last_page_from_job_count
+from jobs.job_scraper import (
+    scrape_jobs_from_page, scrape_job_details, scrape_search_page,
+    scrape_jobs_from_page_async, scrape_job_details_async, scrape_search_page_async
+)
 
 
 # Use Config class to access ENVs
 MAX_BOTS = Config.MAX_BOTS
+ADAPTIVE_MAX_BOTS = Config.ADAPTIVE_MAX_BOTS
+ADAPTIVE_CONCURRENCY = Config.ADAPTIVE_CONCURRENCY
 RETRY_LIMIT = Config.RETRY_LIMIT
+FETCH_MODE = Config.FETCH_MODE
+PAGINATION_MODE = Config.PAGINATION_MODE
+PIPELINE_QUEUE_SIZE = Config.PIPELINE_QUEUE_SIZE
+MAX_CONCURRENT_REQUESTS = Config.MAX_CONCURRENT_REQUESTS
 TIMEOUT_URLS_FILE = Config.TIMEOUT_URLS_FILE
 
+# With adaptive concurrency the pools are sized for its ceiling and the limiter decides how many fetch at once
+WORKER_COUNT = ADAPTIVE_MAX_BOTS if ADAPTIVE_CONCURRENCY else MAX_BOTS
 
-def process_last_page(job_search):
+# Tasks submitted ahead of the workers; enough to keep them busy without queueing the whole table
+SUBMISSION_WINDOW = WORKER_COUNT * 2
+
+
+def _store_last_page(job_search_id, last_page, writer=None, pagination_links=None):
     """
-    Retrieve and update the last page number for a given job search.
-    Includes a retry mechanism with exponential backoff and logs the time taken.
-    If the last page retrieval fails due to a timeout, store the URL in a text file.
+    Persists the last page number found for a job search, and its pagination links if given,
+    through the batch writer if one is given.
+    """
+    values = {'last_page_number': last_page}
+
+    if pagination_links is not None:
+        values['pagination_links'] = pagination_links
+
+    if writer:
+        writer.update(JobSearch, job_search_id, values)
+    else:
+        apply_update(JobSearch, job_search_id, values)
+
+
+def process_last_page(job_search, writer=None, retry_count=0, retries=None):
+    """
+    Retrieve and update the last page number for a given job search, logging the time taken.
+    A failed attempt is retried with exponential backoff through the retry scheduler,
+    so the worker moves on to other job searches while it waits.
+    If the last page retrieval still fails after RETRY_LIMIT attempts, store the URL in a text file.
     """
     start_time = time.time()
-    success = False
-    retry_count = 0
-    last_page_url = f"{job_search.generated_link}&start=3000"  # Construct the last page URL
 
-    while retry_count < RETRY_LIMIT:
-        try:
-            # Attempt to retrieve the last page
-            last_page = get_last_page(job_search.generated_link)
-            
-            with get_session() as session:
-                job = session.query(JobSearch).filter_by(id=job_search.id).first()
-                job.last_page_number = last_page
-                session.commit()
-
-            success = True
-            break  # Exit loop if successful
-
-        except requests.exceptions.Timeout:
-            retry_count += 1
-            logging.warning(f"Timeout error retrieving last page for {job_search.job_title}. Retry {retry_count}/{RETRY_LIMIT}.")
-            time.sleep(2 ** retry_count)  # Exponential backoff for retries
+    try:
+        # Attempt to retrieve the last page
+        last_page = get_last_page(job_search.generated_link)
+        _store_last_page(job_search.id, last_page, writer)
 
-        except Exception as e:
-            retry_count += 1
-            logging.warning(f"Error retrieving last page for {job_search.job_title}. Retry {retry_count}/{RETRY_LIMIT}.")
-            time.sleep(2 ** retry_count)  # Exponential backoff for retries
+        end_time = time.time()
+        logging.info(f"Completed last page retrieval for {job_search.job_title} in {end_time - start_time:.2f} seconds")
+        return
 
-    if not success:
-        logging.error(f"Failed to determine last page for {job_search.job_title} after {RETRY_LIMIT} attempts")
+    except CacheMissError as e:
+        logging.warning(f"Skipping last page for {job_search.job_title}: {e}")
+        return
 
-        # Store the URL in a file for later retry
-        with open(TIMEOUT_URLS_FILE, "a") as f:
-            f.write(f"{last_page_url}\n")
-        logging.info(f"Stored timeout URL for {job_search.job_title} in {TIMEOUT_URLS_FILE}")
+    except requests.exceptions.Timeout:
+        logging.warning(f"Timeout error retrieving last page for {job_search.job_title}. Retry {retry_count + 1}/{RETRY_LIMIT}.")
 
-    end_time = time.time()
-    logging.info(f"Completed last page retrieval for {job_search.job_title} in {end_time - start_time:.2f} seconds")
+    except Exception as e:
+        logging.warning(f"Error retrieving last page for {job_search.job_title}. Retry {retry_count + 1}/{RETRY_LIMIT}.")
 
+    retry_count += 1
+    if retry_count < RETRY_LIMIT:
+        retry_later(retries, retry_count, process_last_page, job_search, writer, retry_count, retries)
+        return
 
-def process_job_search(job_search):
+    _store_timeout_url(job_search)
+
+
+def _store_timeout_url(job_search, page_url=None):
+    """
+    Records the URL of a job search that kept failing, for a later retry: the last page URL,
+    or the page a streamed walk could not get past. The search stays unsized.
+    """
+    last_page_url = page_url or f"{job_search.generated_link}&start=3000"  # Construct the last page URL
+    logging.error(f"Failed to determine last page for {job_search.job_title} after {RETRY_LIMIT} attempts")
+
+    # Store the URL in a file for later retry
+    with open(TIMEOUT_URLS_FILE, "a") as f:
+        f.write(f"{last_page_url}\n")
+    logging.info(f"Stored timeout URL for {job_search.job_title} in {TIMEOUT_URLS_FILE}")
+
+
+def process_job_search_page(job_search, page_num, page_url, on_job_listings=None, retry_count=0, retries=None):
+    """
+    Scrape one results page of a job search.
+    A failed attempt is retried with exponential backoff through the retry scheduler.
+    If on_job_listings is given, it is called with the listings stored from the page.
+    """
+    try:
+        job_listings = scrape_jobs_from_page(page_url, page_num, job_search.id)
+
+        if on_job_listings:
+            on_job_listings(job_listings)
+        logging.warning(f"Page {page_num} scraped successfully for {job_search.job_title}")
+        return
+
+    except CacheMissError as e:
+        logging.warning(f"Skipping page {page_num} of {job_search.job_title}: {e}")
+        return
+
+    except Exception as e:
+        retry_count += 1
+        logging.warning(f"Retry {retry_count}/{RETRY_LIMIT} for page {page_num} of {job_search.job_title}")
+
+    if retry_count < RETRY_LIMIT:
+        retry_later(
+            retries, retry_count, process_job_search_page,
+            job_search, page_num, page_url, on_job_listings, retry_count, retries
+        )
+        return
+
+    logging.error(f"Failed to scrape page {page_num} for {job_search.job_title} after {RETRY_LIMIT} attempts")
+
+
+def iter_search_pages(job_searches, first_page=1, finished_searches=None):
+    """
+    Flattens the pagination links of many job searches into one stream of
+    (job_search, page_num, page_url) work items, taking one page from each search in turn.
+    Every search advances at the same pace, so a search with hundreds of pages no longer
+    pins a worker while single-page searches leave the others idle.
+    Pages before first_page are left out, and so are the remaining pages of searches
+    whose id is added to finished_searches while the stream is consumed.
+    """
+    searches = deque(
+        (job_search, enumerate((job_search.pagination_links or [])[first_page - 1:], start=first_page))
+        for job_search in job_searches
+    )
+
+    while searches:
+        job_search, pages = searches.popleft()
+        page = next(pages, None)
+
+        if page is None or (finished_searches and job_search.id in finished_searches):
+            continue
+
+        page_num, page_url = page
+        yield job_search, page_num, page_url
+        searches.append((job_search, pages))
+
+
+def process_job_search(job_search, on_job_listings=None, retries=None):
     """
     Process each job search by scraping paginated links and job details.
     Logs time taken, retry attempts, and error messages.
+    The bot manager phases schedule pages individually through iter_search_pages instead.
+    If on_job_listings is given, it is called with the listings stored from every page.
     """
     start_time = time.time()
-    success = False
 
     for page_num, page_url in enumerate(job_search.pagination_links, start=1):
-        retry_count = 0
+        process_job_search_page(job_search, page_num, page_url, on_job_listings, retries=retries)
 
-        while retry_count < RETRY_LIMIT:
-            try:
-                scrape_jobs_from_page(page_url, page_num, job_search.id)
-                logging.warning(f"Page {page_num} scraped successfully for {job_search.job_title}")
+    end_time = time.time()
+    logging.warning(f"Completed job search for {job_search.job_title} in {end_time - start_time:.2f} seconds")
 
-                success = True
-                break
-            except Exception as e:
-                retry_count += 1
-                logging.warning(f"Retry {retry_count}/{RETRY_LIMIT} for page {page_num} of {job_search.job_title}")
-                time.sleep(2 ** retry_count)  # Exponential backoff
 
-        if not success:
+def process_search_streaming(job_search, page_num=1, seen_job_keys=None, on_job_listings=None, on_search_sized=None,
+                             writer=None, retry_count=0, retries=None):
+    """
+    Scrape a job search without the last page probe (PAGINATION_MODE=stream).
+    The first page is scraped like any other; if it shows a job count, the search is sized
+    from it, its pagination links are stored and on_search_sized is called so the remaining
+    pages can be scheduled. Otherwise pages are walked in order until one adds no new job
+    keys or has no next page control. Failed pages are retried through the retry scheduler.
+    """
+    seen_job_keys = set() if seen_job_keys is None else seen_job_keys
+
+    while True:
+        page_url = generate_page_url(job_search.generated_link, page_num)
+
+        try:
+            job_listings, search_page = scrape_search_page(page_url, page_num, job_search.id)
+
+        except CacheMissError as e:
+            logging.warning(f"Skipping page {page_num} of {job_search.job_title}: {e}")
+            return
+
+        except Exception as e:
+            retry_count += 1
+            logging.warning(f"Retry {retry_count}/{RETRY_LIMIT} for page {page_num} of {job_search.job_title}: {e!r}")
+
+            if retry_count < RETRY_LIMIT:
+                retry_later(
+                    retries, retry_count, process_search_streaming, job_search, page_num, seen_job_keys,
+                    on_job_listings, on_search_sized, writer, retry_count, retries
+                )
+                return
+
+            #! A page count is only stored once the walk reaches the end: 0 would read as no results,
+            #! and a truncated count as a complete walk that is never retried
             logging.error(f"Failed to scrape page {page_num} for {job_search.job_title} after {RETRY_LIMIT} attempts")
+            _store_timeout_url(job_search, page_url)
+            return
 
-    end_time = time.time()
-    logging.warning(f"Completed job search for {job_search.job_title} in {end_time - start_time:.2f} seconds")
+        retry_count = 0
+
+        if on_job_listings:
+            on_job_listings(job_listings)
 
+        last_page = _next_streaming_step(job_search, page_num, search_page, seen_job_keys)
 
-def process_job_listing_details(job_listing):
+        if last_page is None:
+            page_num += 1
+            continue
+
+        if page_num == 1 and search_page['job_count'] is not None:
+            _store_sized_search(job_search, last_page, writer)
+            if on_search_sized and last_page > 1:
+                on_search_sized(job_search)
+        else:
+            _store_walked_pages(job_search, last_page, writer)
+        return
+
+
+def process_sized_search_page(job_search, page_num, page_url, seen_job_keys, finished_searches, on_job_listings=None,
+                              retry_count=0, retries=None):
+    """
+    Scrape one of the remaining pages of a search sized from its first page (PAGINATION_MODE=stream).
+    The job count may promise more pages than Indeed serves, so a page that adds no new job keys
+    or has no next page control finishes the search: its page number is recorded in
+    finished_searches, and later pages of the search are no longer scheduled or fetched.
+    Failed pages are retried through the retry scheduler.
+    """
+    if page_num > finished_searches.get(job_search.id, page_num):
+        return
+
+    try:
+        job_listings, search_page = scrape_search_page(page_url, page_num, job_search.id)
+
+    except CacheMissError as e:
+        logging.warning(f"Skipping page {page_num} of {job_search.job_title}: {e}")
+        return
+
+    except Exception as e:
+        retry_count += 1
+        logging.warning(f"Retry {retry_count}/{RETRY_LIMIT} for page {page_num} of {job_search.job_title}: {e!r}")
+
+        if retry_count < RETRY_LIMIT:
+            retry_later(
+                retries, retry_count, process_sized_search_page, job_search, page_num, page_url, seen_job_keys,
+                finished_searches, on_job_listings, retry_count, retries
+            )
+            return
+
+        logging.error(f"Failed to scrape page {page_num} for {job_search.job_title} after {RETRY_LIMIT} attempts")
+        return
+
+    if on_job_listings:
+        on_job_listings(job_listings)
+
+    _finish_sized_search(job_search, page_num, search_page, seen_job_keys, finished_searches)
+
+
+def _finish_sized_search(job_search, page_num, search_page, seen_job_keys, finished_searches):
+    """
+    Records a sized search as finished at page_num if the page shows the results ran out.
+    """
+    if _next_streaming_step(job_search, page_num, search_page, seen_job_keys) is None:
+        return
+
+    if job_search.id not in finished_searches:
+        logging.warning(f"Stopped {job_search.job_title} at page {page_num}: no further results")
+
+    finished_searches[job_search.id] = min(page_num, finished_searches.get(job_search.id, page_num))
+
+
+def _next_streaming_step(job_search, page_num, search_page, seen_job_keys):
+    """
+    Decides how a streamed search continues after one of its pages was scraped.
+    Returns the search's last page number, or None if the next page should be walked.
+    """
+    if search_page['no_results']:
+        logging.info(f"No search results found for {job_search.job_title}")
+        return 0
+
+    #* Keys of every card on the page, including jobs deduplicated against other searches
+    job_keys = set(search_page['job_keys'])
+    new_job_keys = job_keys - seen_job_keys
+    seen_job_keys.update(job_keys)
+
+    if page_num == 1 and search_page['job_count'] is not None:
+        last_page = last_page_from_job_count(search_page['job_count'])
+        logging.info(f"{search_page['job_count']} jobs found for {job_search.job_title}, {last_page} pages")
+        return last_page if search_page['has_next_page'] else 1
+
+    if not new_job_keys:
+        return page_num - 1  # Indeed repeats its last page past the end of the results
+
+    if not search_page['has_next_page']:
+        return page_num
+
+    return None
+
+
+def _store_sized_search(job_search, last_page, writer=None):
+    """
+    Stores the page count read from a search's first page together with its pagination links,
+    and keeps them on the in-memory job search so its remaining pages can be scheduled.
+    """
+    pagination_links = generate_pagination_links(job_search.generated_link, last_page)
+    _store_last_page(job_search.id, last_page, writer, pagination_links)
+
+    job_search.last_page_number = last_page
+    job_search.pagination_links = pagination_links
+
+
+def _store_walked_pages(job_search, last_page, writer=None):
+    """
+    Records the pages a walked search turned out to have; they have all been scraped already.
+    """
+    _store_last_page(job_search.id, last_page, writer, generate_pagination_links(job_search.generated_link, last_page))
+    logging.warning(f"Walked {last_page} pages for {job_search.job_title}")
+
+
+def process_job_listing_details(job_listing, writer=None, retry_count=0, retries=None):
     """
     Process each job listing to scrape detailed job information.
-    Logs time taken, retry attempts, and error messages.
+    Logs time taken, retry attempts, and error messages. Network errors are retried
+    with exponential backoff through the retry scheduler, other errors are not retried.
+    The outcome is persisted in the listing's scrape state (done, or failed with the last error).
+    """
+    start_time = time.time()
+
+    try:
+        # Attempt to scrape job details
+        scrape_job_details(job_listing, attempts=retry_count + 1, writer=writer)
+        logging.info(f"Successfully scraped details for job ID {job_listing.id}")
+
+        end_time = time.time()
+        logging.info(f"Completed job details scraping for job ID {job_listing.id} in {end_time - start_time:.2f} seconds")
+        return
+
+    except CacheMissError as e:
+        # Offline replay: leave the listing pending for a later online run
+        logging.warning(f"Skipping job ID {job_listing.id}: {e}")
+        release_job_listing(job_listing.id, writer)
+        return
+
+    except requests.exceptions.Timeout as e:
+        retry_count += 1
+        last_error = repr(e)
+        logging.warning(f"Timeout error for job ID {job_listing.id}. Retry {retry_count}/{RETRY_LIMIT}.")
+
+    except requests.exceptions.RequestException as e:
+        retry_count += 1
+        last_error = repr(e)
+        logging.warning(f"Network error for job ID {job_listing.id}: {e}. Retry {retry_count}/{RETRY_LIMIT}.")
+
+    except Exception as e:
+        # Log non-network-related errors without retries
+        logging.error(f"Non-retryable error scraping details for job ID {job_listing.id}: {e}")
+        mark_job_listing_failed(job_listing.id, retry_count + 1, repr(e), writer)
+        return
+
+    if retry_count < RETRY_LIMIT:
+        retry_later(retries, retry_count, process_job_listing_details, job_listing, writer, retry_count, retries)
+        return
+
+    logging.error(f"Failed to scrape details for job ID {job_listing.id} after {RETRY_LIMIT} attempts")
+    mark_job_listing_failed(job_listing.id, retry_count, last_error, writer)
+
+
+async def process_last_page_async(fetch_engine, job_search, writer=None, retry_count=0, retries=None):
+    """
+    Asyncio counterpart of process_last_page. Retries are started by the event loop's timer,
+    so waiting for a backoff holds neither a thread nor a fetch engine slot.
+    """
+    start_time = time.time()
+
+    try:
+        # Attempt to retrieve the last page
+        last_page = await get_last_page_async(fetch_engine, job_search.generated_link)
+        await asyncio.to_thread(_store_last_page, job_search.id, last_page, writer)
+
+        end_time = time.time()
+        logging.info(f"Completed last page retrieval for {job_search.job_title} in {end_time - start_time:.2f} seconds")
+        return
+
+    except CacheMissError as e:
+        logging.warning(f"Skipping last page for {job_search.job_title}: {e}")
+        return
+
+    except Exception as e:
+        retry_count += 1
+        logging.warning(f"Error retrieving last page for {job_search.job_title}: {e!r}. Retry {retry_count}/{RETRY_LIMIT}.")
+
+    if retry_count < RETRY_LIMIT:
+        await retry_later_async(
+            retries, retry_count, process_last_page_async, fetch_engine, job_search, writer, retry_count, retries
+        )
+        return
+
+    await asyncio.to_thread(_store_timeout_url, job_search)
+
+
+async def process_job_search_page_async(fetch_engine, job_search, page_num, page_url, on_job_listings=None,
+                                        retry_count=0, retries=None):
+    """
+    Asyncio counterpart of process_job_search_page.
+    If on_job_listings is given, it is awaited with the listings stored from the page.
+    """
+    try:
+        job_listings = await scrape_jobs_from_page_async(fetch_engine, page_url, page_num, job_search.id)
+
+        if on_job_listings:
+            await on_job_listings(job_listings)
+        logging.warning(f"Page {page_num} scraped successfully for {job_search.job_title}")
+        return
+
+    except CacheMissError as e:
+        logging.warning(f"Skipping page {page_num} of {job_search.job_title}: {e}")
+        return
+
+    except Exception as e:
+        retry_count += 1
+        logging.warning(f"Retry {retry_count}/{RETRY_LIMIT} for page {page_num} of {job_search.job_title}: {e!r}")
+
+    if retry_count < RETRY_LIMIT:
+        await retry_later_async(
+            retries, retry_count, process_job_search_page_async,
+            fetch_engine, job_search, page_num, page_url, on_job_listings, retry_count, retries
+        )
+        return
+
+    logging.error(f"Failed to scrape page {page_num} for {job_search.job_title} after {RETRY_LIMIT} attempts")
+
+
+async def process_job_search_async(fetch_engine, job_search, on_job_listings=None, retries=None):
+    """
+    Asyncio counterpart of process_job_search. Pages of one search are still walked in order.
+    If on_job_listings is given, it is awaited with the listings stored from every page.
     """
     start_time = time.time()
-    success = False
-    retry_count = 0
 
-    while retry_count < RETRY_LIMIT:
+    for page_num, page_url in enumerate(job_search.pagination_links, start=1):
+        await process_job_search_page_async(fetch_engine, job_search, page_num, page_url, on_job_listings, retries=retries)
+
+    end_time = time.time()
+    logging.warning(f"Completed job search for {job_search.job_title} in {end_time - start_time:.2f} seconds")
+
+
+async def process_search_streaming_async(fetch_engine, job_search, page_num=1, seen_job_keys=None, on_job_listings=None,
+                                         on_search_sized=None, writer=None, retry_count=0, retries=None):
+    """
+    Asyncio counterpart of process_search_streaming.
+    If on_job_listings is given, it is awaited with the listings stored from every page.
+    """
+    seen_job_keys = set() if seen_job_keys is None else seen_job_keys
+
+    while True:
+        page_url = generate_page_url(job_search.generated_link, page_num)
+
         try:
-            # Attempt to scrape job details
-            scrape_job_details(job_listing)
-            success = True
-            logging.info(f"Successfully scraped details for job ID {job_listing.id}")
-            break  # Exit loop if successful
+            job_listings, search_page = await scrape_search_page_async(fetch_engine, page_url, page_num, job_search.id)
 
-        except requests.exceptions.Timeout:
-            retry_count += 1
-            logging.warning(f"Timeout error for job ID {job_listing.id}. Retry {retry_count}/{RETRY_LIMIT}.")
-            time.sleep(2 ** retry_count)  # Exponential backoff for retries
+        except CacheMissError as e:
+            logging.warning(f"Skipping page {page_num} of {job_search.job_title}: {e}")
+            return
 
-        except requests.exceptions.RequestException as e:
+        except Exception as e:
             retry_count += 1
-            logging.warning(f"Network error for job ID {job_listing.id}: {e}. Retry {retry_count}/{RETRY_LIMIT}.")
-            time.sleep(2 ** retry_count)
+            logging.warning(f"Retry {retry_count}/{RETRY_LIMIT} for page {page_num} of {job_search.job_title}: {e!r}")
 
-        except Exception as e:
-            # Log non-network-related errors without retries
-            logging.error(f"Non-retryable error scraping details for job ID {job_listing.id}: {e}")
-            break
+            if retry_count < RETRY_LIMIT:
+                await retry_later_async(
+                    retries, retry_count, process_search_streaming_async, fetch_engine, job_search, page_num,
+                    seen_job_keys, on_job_listings, on_search_sized, writer, retry_count, retries
+                )
+                return
 
-    if not success:
-        logging.error(f"Failed to scrape details for job ID {job_listing.id} after {RETRY_LIMIT} attempts")
+            logging.error(f"Failed to scrape page {page_num} for {job_search.job_title} after {RETRY_LIMIT} attempts")
+            await asyncio.to_thread(_store_timeout_url, job_search, page_url)
+            return
 
-    end_time = time.time()
-    logging.info(f"Completed job details scraping for job ID {job_listing.id} in {end_time - start_time:.2f} seconds")
+        retry_count = 0
+
+        if on_job_listings:
+            await on_job_listings(job_listings)
+
+        last_page = _next_streaming_step(job_search, page_num, search_page, seen_job_keys)
+
+        if last_page is None:
+            page_num += 1
+            continue
+
+        if page_num == 1 and search_page['job_count'] is not None:
+            await asyncio.to_thread(_store_sized_search, job_search, last_page, writer)
+            if on_search_sized and last_page > 1:
+                on_search_sized(job_search)
+        else:
+            await asyncio.to_thread(_store_walked_pages, job_search, last_page, writer)
+        return
+
+
+async def process_sized_search_page_async(fetch_engine, job_search, page_num, page_url, seen_job_keys, finished_searches,
+                                          on_job_listings=None, retry_count=0, retries=None):
+    """
+    Asyncio counterpart of process_sized_search_page.
+    If on_job_listings is given, it is awaited with the listings stored from the page.
+    """
+    if page_num > finished_searches.get(job_search.id, page_num):
+        return
+
+    try:
+        job_listings, search_page = await scrape_search_page_async(fetch_engine, page_url, page_num, job_search.id)
+
+    except CacheMissError as e:
+        logging.warning(f"Skipping page {page_num} of {job_search.job_title}: {e}")
+        return
+
+    except Exception as e:
+        retry_count += 1
+        logging.warning(f"Retry {retry_count}/{RETRY_LIMIT} for page {page_num} of {job_search.job_title}: {e!r}")
+
+        if retry_count < RETRY_LIMIT:
+            await retry_later_async(
+                retries, retry_count, process_sized_search_page_async, fetch_engine, job_search, page_num, page_url,
+                seen_job_keys, finished_searches, on_job_listings, retry_count, retries
+            )
+            return
+
+        logging.error(f"Failed to scrape page {page_num} for {job_search.job_title} after {RETRY_LIMIT} attempts")
+        return
+
+    if on_job_listings:
+        await on_job_listings(job_listings)
+
+    _finish_sized_search(job_search, page_num, search_page, seen_job_keys, finished_searches)
+
+
+async def process_job_listing_details_async(fetch_engine, job_listing, writer=None, retry_count=0, retries=None):
+    """
+    Asyncio counterpart of process_job_listing_details.
+    """
+    start_time = time.time()
+
+    try:
+        # Attempt to scrape job details
+        await scrape_job_details_async(fetch_engine, job_listing, attempts=retry_count + 1, writer=writer)
+        logging.info(f"Successfully scraped details for job ID {job_listing.id}")
+
+        end_time = time.time()
+        logging.info(f"Completed job details scraping for job ID {job_listing.id} in {end_time - start_time:.2f} seconds")
+        return
+
+    except CacheMissError as e:
+        # Offline replay: leave the listing pending for a later online run
+        logging.warning(f"Skipping job ID {job_listing.id}: {e}")
+        await asyncio.to_thread(release_job_listing, job_listing.id, writer)
+        return
+
+    except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+        retry_count += 1
+        last_error = repr(e)
+        logging.warning(f"Network error for job ID {job_listing.id}: {e!r}. Retry {retry_count}/{RETRY_LIMIT}.")
+
+    except Exception as e:
+        # Log non-network-related errors without retries
+        logging.error(f"Non-retryable error scraping details for job ID {job_listing.id}: {e}")
+        await asyncio.to_thread(mark_job_listing_failed, job_listing.id, retry_count + 1, repr(e), writer)
+        return
+
+    if retry_count < RETRY_LIMIT:
+        await retry_later_async(
+            retries, retry_count, process_job_listing_details_async,
+            fetch_engine, job_listing, writer, retry_count, retries
+        )
+        return
+
+    logging.error(f"Failed to scrape details for job ID {job_listing.id} after {RETRY_LIMIT} attempts")
+    await asyncio.to_thread(mark_job_listing_failed, job_listing.id, retry_count, last_error, writer)
+
+
+def submit_windowed(executor, fn, items, window: int, phase: str):
+    """
+    Submits fn(item) for every item of an iterable, keeping at most `window` futures
+    pending at once so memory does not grow with the number of items.
+    """
+    in_flight = set()
+
+    def log_failures(done):
+        for future in done:
+            try:
+                future.result()  # Raise exceptions if any
+            except Exception as e:
+                logging.error(f"Bot manager encountered an error in {phase} phase: {e}")
+
+    for item in items:
+        if len(in_flight) >= window:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            log_failures(done)
+
+        in_flight.add(executor.submit(fn, item))
+
+    done, _ = wait(in_flight)
+    log_failures(done)
+
+
+def load_job_searches():
+    """
+    Job searches to scrape in the job search phases: all of them in stream pagination mode,
+    otherwise those whose pagination links were generated from the last page probe.
+    """
+    with get_session() as session:
+        query = session.query(JobSearch)
+
+        if PAGINATION_MODE != "stream":
+            query = query.filter(JobSearch.pagination_links.isnot(None))
+
+        return query.all()
+
+
+def scrape_job_searches(executor, retries, job_searches, writer=None, on_job_listings=None):
+    """
+    Scrapes the results pages of job searches on an executor, one page per task, round-robin across searches.
+    In stream pagination mode the first pages go first and size their searches; the remaining
+    pages of every sized search are scheduled once all first pages (and their retries) are done,
+    until a page shows that its search ran out of results.
+    """
+    if PAGINATION_MODE == "stream":
+        sized_job_searches = []
+        seen_job_keys = defaultdict(set)
+        finished_searches = {}
+
+        submit_windowed(
+            executor,
+            lambda job_search: process_search_streaming(
+                job_search, seen_job_keys=seen_job_keys[job_search.id], on_job_listings=on_job_listings,
+                on_search_sized=sized_job_searches.append, writer=writer, retries=retries
+            ),
+            job_searches, SUBMISSION_WINDOW, "job search"
+        )
+        retries.join()
+
+        submit_windowed(
+            executor,
+            lambda page: process_sized_search_page(
+                *page, seen_job_keys[page[0].id], finished_searches, on_job_listings, retries=retries
+            ),
+            iter_search_pages(sized_job_searches, 2, finished_searches), SUBMISSION_WINDOW, "job search"
+        )
+        return
+
+    submit_windowed(
+        executor, lambda page: process_job_search_page(*page, on_job_listings, retries=retries),
+        iter_search_pages(job_searches), SUBMISSION_WINDOW, "job search"
+    )
+
+
+async def scrape_job_searches_async(fetch_engine, retries, job_searches, writer=None, on_job_listings=None):
+    """
+    Asyncio counterpart of scrape_job_searches.
+    """
+    if PAGINATION_MODE == "stream":
+        sized_job_searches = []
+        seen_job_keys = defaultdict(set)
+        finished_searches = {}
+
+        await gather_and_log(
+            (
+                process_search_streaming_async(
+                    fetch_engine, job_search, seen_job_keys=seen_job_keys[job_search.id],
+                    on_job_listings=on_job_listings, on_search_sized=sized_job_searches.append,
+                    writer=writer, retries=retries
+                )
+                for job_search in job_searches
+            ),
+            "job search",
+        )
+        await retries.join()
+
+        #* Pages are started through a window, so pages past a finished search's end are never created
+        await gather_windowed(
+            _aiter(iter_search_pages(sized_job_searches, 2, finished_searches)),
+            lambda page: process_sized_search_page_async(
+                fetch_engine, *page, seen_job_keys[page[0].id], finished_searches, on_job_listings, retries=retries
+            ),
+            MAX_CONCURRENT_REQUESTS * 2,
+            "job search",
+        )
+        return
+
+    #* Every page of every search is a work item, so they are started through a window to bound memory
+    await gather_windowed(
+        _aiter(iter_search_pages(job_searches)),
+        lambda page: process_job_search_page_async(fetch_engine, *page, on_job_listings, retries=retries),
+        MAX_CONCURRENT_REQUESTS * 2,
+        "job search",
+    )
+
+
+async def _aiter(items):
+    """
+    Wraps a lazy iterable as an async iterator for gather_windowed.
+    """
+    for item in items:
+        yield item
+
+
+def run_pipeline(writer=None):
+    """
+    Runs the job search and job listing details phases as one pipeline.
+    Listings parsed from each search page go onto a bounded queue that detail workers
+    drain straight away; a full queue blocks the page workers, which caps memory.
+    Failed detail scrapes come back through the same queue once their backoff has elapsed.
+    """
+    job_searches = load_job_searches()
+
+    job_listing_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    def detail_worker():
+        while True:
+            task = job_listing_queue.get()
+
+            if task is None:  # Sentinel: no more job search pages will be produced
+                break
+
+            try:
+                task()
+            except Exception as e:
+                logging.error(f"Bot manager encountered an error in job listing details phase: {e}")
+            finally:
+                job_listing_queue.task_done()
+
+    with ThreadPoolExecutor(max_workers=WORKER_COUNT) as detail_executor, \
+            RetryScheduler(job_listing_queue.put, "job listing details") as detail_retries:
+        detail_futures = [detail_executor.submit(detail_worker) for _ in range(WORKER_COUNT)]
+
+        def enqueue_job_listings(job_listings):
+            for job_listing in job_listings:
+                job_listing_queue.put(partial(process_job_listing_details, job_listing, writer, retries=detail_retries))
+
+        #* Pages of all searches share one window of page workers, taken round-robin across searches
+        with ThreadPoolExecutor(max_workers=WORKER_COUNT) as search_executor, \
+                RetryScheduler(search_executor.submit, "job search") as search_retries:
+            scrape_job_searches(search_executor, search_retries, job_searches, writer, enqueue_job_listings)
+
+        logging.warning("Job search phase completed, draining job listing queue.")
+
+        #* Every listing must be processed before waiting on retries, since a first attempt can still schedule one
+        job_listing_queue.join()
+        detail_retries.join()
+
+        for _ in detail_futures:
+            job_listing_queue.put(None)
+
+    logging.info("Job listing details phase completed.")
+
+
+async def run_pipeline_async(fetch_engine, writer=None):
+    """
+    Asyncio counterpart of run_pipeline, sharing one AsyncFetchEngine between page and detail workers.
+    """
+    job_searches = load_job_searches()
+
+    job_listing_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    detail_retries = AsyncRetryScheduler("job listing details")
+
+    async def enqueue_job_listings(job_listings):
+        for job_listing in job_listings:
+            await job_listing_queue.put(job_listing)
+
+    async def detail_worker():
+        while True:
+            job_listing = await job_listing_queue.get()
+
+            try:
+                if job_listing is None:  # Sentinel: no more job search pages will be produced
+                    break
+
+                await process_job_listing_details_async(fetch_engine, job_listing, writer, retries=detail_retries)
+            except Exception as e:
+                logging.error(f"Bot manager encountered an error in job listing details phase: {e}")
+            finally:
+                job_listing_queue.task_done()
+
+    detail_workers = [asyncio.create_task(detail_worker()) for _ in range(MAX_CONCURRENT_REQUESTS)]
+
+    async with AsyncRetryScheduler("job search") as search_retries:
+        await scrape_job_searches_async(fetch_engine, search_retries, job_searches, writer, enqueue_job_listings)
+    logging.warning("Job search phase completed, draining job listing queue.")
+
+    #* Every listing must be processed before waiting on retries, since a first attempt can still schedule one
+    async with detail_retries:
+        await job_listing_queue.join()
+
+    for _ in detail_workers:
+        await job_listing_queue.put(None)
+
+    await asyncio.gather(*detail_workers)
+    logging.info("Job listing details phase completed.")
+
+
+async def run_async_bot_manager(phase: str):
+    """
+    Asyncio version of run_bot_manager: every phase shares one AsyncFetchEngine,
+    so in-flight requests are bounded by MAX_CONCURRENT_REQUESTS instead of MAX_BOTS threads.
+    """
+    async with AsyncFetchEngine() as fetch_engine:
+        with BatchWriter() as writer:
+
+            if phase == "last_page":
+                with get_session() as session:
+                    job_searches = session.query(JobSearch).all()
+
+                async with AsyncRetryScheduler("last page retrieval") as retries:
+                    await gather_and_log(
+                        (
+                            process_last_page_async(fetch_engine, job_search, writer, retries=retries)
+                            for job_search in job_searches
+                        ),
+                        "last page retrieval",
+                    )
+                logging.warning("Last page retrieval phase completed.")
+
+            elif phase == "job_search_scraping":
+                job_searches = load_job_searches()
+
+                #* Page-level tasks in round-robin order, so the fetch engine semaphore serves all searches fairly
+                async with AsyncRetryScheduler("job search") as retries:
+                    await scrape_job_searches_async(fetch_engine, retries, job_searches, writer)
+                logging.warning("Job search phase completed.")
+
+            elif phase == "job_listing_scraping":
+                await asyncio.to_thread(reset_interrupted_job_listings)
+                async with AsyncRetryScheduler("job listing details") as retries:
+                    await gather_windowed(
+                        iter_job_listing_refs_async(),
+                        lambda job_listing: process_job_listing_details_async(
+                            fetch_engine, job_listing, writer, retries=retries
+                        ),
+                        MAX_CONCURRENT_REQUESTS * 2,
+                        "job listing details",
+                    )
+                logging.info("Job listing details phase completed.")
+
+            elif phase == "pipeline":
+                await run_pipeline_async(fetch_engine, writer)
 
 
 def run_bot_manager(phase: str):
     """
     Run the bot manager to handle concurrent tasks for retrieving last pages, 
     job searches, and job listing details scraping.
+    The "pipeline" phase runs job search and job listing details scraping together.
+    Row updates from all workers are written through one BatchWriter.
     """
-    logging.warning("Starting bot manager with concurrent scraping")
+    if phase == "last_page" and PAGINATION_MODE == "stream":
+        logging.warning("Skipping the last page phase: in stream pagination mode searches are sized from their first page")
+        return
+
+    if FETCH_MODE == "async":
+        logging.warning("Starting bot manager with the asyncio fetch engine")
+        run_async(run_async_bot_manager(phase))
+
+    else:
+        logging.warning("Starting bot manager with concurrent scraping")
+
+        with BatchWriter() as writer:
+            _run_threaded_phase(phase, writer)
+
+        log_connection_stats()
+
+        limiter = get_adaptive_limiter()
+        if limiter:
+            limiter.log_metrics()
+
+    shutdown_parse_pool()
+    log_response_cache_stats()
+    log_pool_stats()
+
+    if phase in ("job_search_scraping", "pipeline"):
+        log_dedup_stats()
 
+    if phase in ("job_listing_scraping", "pipeline"):
+        log_scrape_progress()
+
+    logging.warning("Bot manager completed all tasks.")
+
+
+def _run_threaded_phase(phase: str, writer):
+    """
+    Runs one bot manager phase on a ThreadPoolExecutor of WORKER_COUNT workers.
+    """
     if phase == "last_page":
 
         #? Phase 1: Retrieve last page for each job search
         with get_session() as session:
             job_searches = session.query(JobSearch).all()
 
-        with ThreadPoolExecutor(max_workers=MAX_BOTS) as executor:
-            futures = [executor.submit(process_last_page, job_search) for job_search in job_searches]
+        #* Failed attempts wait in the retry scheduler rather than in a worker thread
+        with ThreadPoolExecutor(max_workers=WORKER_COUNT) as executor, \
+                RetryScheduler(executor.submit, "last page retrieval") as retries:
+            futures = [
+                executor.submit(process_last_page, job_search, writer, retries=retries) for job_search in job_searches
+            ]
 
             # Collect results for last page retrieval phase
             for future in as_completed(futures):
@@ -156,19 +940,13 @@ def run_bot_manager(phase: str):
 
     elif phase == "job_search_scraping":
 
-        #? Phase 2: Process job searches (pagination links)
-        with get_session() as session:
-            job_searches = session.query(JobSearch).filter(JobSearch.pagination_links.isnot(None)).all()
+        #? Phase 2: Process job searches (pagination links, or first pages in stream pagination mode)
+        job_searches = load_job_searches()
 
-        with ThreadPoolExecutor(max_workers=MAX_BOTS) as executor:
-            futures = [executor.submit(process_job_search, job_search) for job_search in job_searches]
-            
-            # Collect results for job search phase
-            for future in as_completed(futures):
-                try:
-                    future.result()  # Raise exceptions if any
-                except Exception as e:
-                    logging.error(f"Bot manager encountered an error in job search phase: {e}")
+        #* Pages rather than whole searches are the unit of work, so phase time tracks total pages
+        with ThreadPoolExecutor(max_workers=WORKER_COUNT) as executor, \
+                RetryScheduler(executor.submit, "job search") as retries:
+            scrape_job_searches(executor, retries, job_searches, writer)
 
         logging.warning("Job search phase completed.")
 
@@ -176,20 +954,20 @@ def run_bot_manager(phase: str):
     elif phase == "job_listing_scraping":
 
         #? Phase 3: Process job listing details after all paginated pages are scraped
-        with get_session() as session:
-            job_listings = session.query(JobListing).all()
-
-        with ThreadPoolExecutor(max_workers=MAX_BOTS) as executor:
-            futures = [executor.submit(process_job_listing_details, job_listing) for job_listing in job_listings]
+        #* Only outstanding listings are streamed, so an interrupted run resumes where it stopped
+        reset_interrupted_job_listings()
 
-            # Collect results for job listing details phase
-            for future in as_completed(futures):
-                try:
-                    future.result()  # Raise exceptions if any
-                except Exception as e:
-                    logging.error(f"Bot manager encountered an error in job listing details phase: {e}")
+        #* Listings are streamed by keyset pages and submitted through a bounded window
+        with ThreadPoolExecutor(max_workers=WORKER_COUNT) as executor, \
+                RetryScheduler(executor.submit, "job listing details") as retries:
+            submit_windowed(
+                executor, partial(process_job_listing_details, writer=writer, retries=retries), iter_job_listing_refs(),
+                SUBMISSION_WINDOW, "job listing details"
+            )
 
         logging.info("Job listing details phase completed.")
 
+    elif phase == "pipeline":
 
-    logging.warning("Bot manager completed all tasks.")
\ No newline at end of file
+        #? Phases 2 and 3 together: job listings are detail-scraped as soon as their page is parsed
+        run_pipeline(writer)
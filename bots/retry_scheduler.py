@@ -0,0 +1,193 @@
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import threading
+from config import Config, logging
+
+
+# Use Config class to access ENVs
+RETRY_BASE_DELAY = Config.RETRY_BASE_DELAY
+RETRY_MAX_DELAY = Config.RETRY_MAX_DELAY
+
+
+def backoff_delay(retry_count: int) -> float:
+    """
+    Exponential backoff for the given retry (1 for the first), capped at RETRY_MAX_DELAY.
+    Half of the delay is random jitter so retries of a burst of failures do not fire together.
+    """
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (retry_count - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RetryScheduler:
+    """
+    Delay queue for failed tasks of the threaded bot manager.
+    Retries wait in a heap keyed by their next eligible time instead of sleeping in a
+    worker thread; a single timer thread hands each one to `submit` (e.g. executor.submit)
+    once its backoff has elapsed, so workers keep picking up fresh work meanwhile.
+
+    Usage:
+        with ThreadPoolExecutor() as executor, RetryScheduler(executor.submit, "job search") as retries:
+            executor.submit(process_job_search, job_search, retries=retries)
+    """
+
+    def __init__(self, submit, phase: str):
+        self.submit = submit
+        self.phase = phase
+        self.scheduled = 0
+        self._heap = []
+        self._sequence = itertools.count()  # Tie-breaker so tasks themselves are never compared
+        self._outstanding = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._timer = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def schedule(self, retry_count: int, fn, *args, **kwargs):
+        """
+        Queues fn(*args, **kwargs) to run after the backoff delay of the given retry.
+        """
+        due = time.monotonic() + backoff_delay(retry_count)
+
+        with self._condition:
+            heapq.heappush(self._heap, (due, next(self._sequence), fn, args, kwargs))
+            self._outstanding += 1
+            self.scheduled += 1
+            self._condition.notify_all()
+
+    def join(self):
+        """
+        Blocks until every scheduled retry, including retries scheduled by retries, has run.
+        Call it once the tasks that may schedule retries have finished.
+        """
+        with self._condition:
+            while self._outstanding:
+                self._condition.wait()
+
+    def close(self):
+        """
+        Waits for outstanding retries, then stops the timer thread.
+        """
+        self.join()
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        if self._timer.is_alive():
+            self._timer.join()
+
+        logging.info(f"Retry scheduler for {self.phase} phase scheduled {self.scheduled} retries")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._condition.wait(timeout)
+
+                if self._closed:
+                    return
+
+                _, _, fn, args, kwargs = heapq.heappop(self._heap)
+
+            self.submit(self._wrap(fn, args, kwargs))
+
+    def _wrap(self, fn, args, kwargs):
+        def run_retry():
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                logging.error(f"Bot manager encountered an error in {self.phase} phase: {e}")
+            finally:
+                with self._condition:
+                    self._outstanding -= 1
+                    self._condition.notify_all()
+
+        return run_retry
+
+
+class AsyncRetryScheduler:
+    """
+    Asyncio counterpart of RetryScheduler: each retry is started as a new task by the
+    event loop's timer once its backoff has elapsed, so no worker coroutine or
+    submission window slot is held while it waits.
+    """
+
+    def __init__(self, phase: str):
+        self.phase = phase
+        self.scheduled = 0
+        self._outstanding = 0
+        self._tasks = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.join()
+        logging.info(f"Retry scheduler for {self.phase} phase scheduled {self.scheduled} retries")
+
+    def schedule(self, retry_count: int, coroutine_fn, *args, **kwargs):
+        """
+        Starts coroutine_fn(*args, **kwargs) as a task after the backoff delay of the given retry.
+        """
+        self._outstanding += 1
+        self.scheduled += 1
+        self._idle.clear()
+        asyncio.get_running_loop().call_later(
+            backoff_delay(retry_count), self._start, coroutine_fn, args, kwargs
+        )
+
+    async def join(self):
+        """
+        Waits until every scheduled retry, including retries scheduled by retries, has finished.
+        """
+        await self._idle.wait()
+
+    def _start(self, coroutine_fn, args, kwargs):
+        task = asyncio.create_task(coroutine_fn(*args, **kwargs))
+        self._tasks.add(task)  # Keep a reference so the task is not garbage collected
+        task.add_done_callback(self._finish)
+
+    def _finish(self, task):
+        self._tasks.discard(task)
+
+        if not task.cancelled() and task.exception():
+            logging.error(f"Bot manager encountered an error in {self.phase} phase: {task.exception()}")
+
+        self._outstanding -= 1
+        if not self._outstanding:
+            self._idle.set()
+
+
+def retry_later(retries, retry_count: int, fn, *args, **kwargs):
+    """
+    Runs fn(*args, **kwargs) again after the backoff of the given retry: through the
+    scheduler when one is given, otherwise by sleeping on the calling thread.
+    """
+    if retries is None:
+        time.sleep(backoff_delay(retry_count))
+        fn(*args, **kwargs)
+    else:
+        retries.schedule(retry_count, fn, *args, **kwargs)
+
+
+async def retry_later_async(retries, retry_count: int, coroutine_fn, *args, **kwargs):
+    """
+    Asyncio counterpart of retry_later.
+    """
+    if retries is None:
+        await asyncio.sleep(backoff_delay(retry_count))
+        await coroutine_fn(*args, **kwargs)
+    else:
+        retries.schedule(retry_count, coroutine_fn, *args, **kwargs)
@@ -1,11 +1,15 @@
 import os
 import csv
 import requests
-from database import get_session
+from database import get_session, init_database
 from sqlalchemy import func, desc
 from config import Config, logging
-from datetime import datetime, timezone
-from database.models import JobListing, JobSearch
+from database.models import JobListing, CompanyAlias
+from database.company_index import build_company_index
+from database.export_to_csv import export_path, write_query_to_csv
+from database.bulk_import import import_job_listings_from_csv
+from apollo.utils.incremental_writer import IncrementalCsvWriter
+from database.maintenance import delete_zero_page_searches, delete_na_job_titles, count_unique_companies
 
 
 # Use Config class to access ENVs
@@ -47,95 +51,33 @@ def remove_zero_page_records(input_file, output_file):
         logging.error(f"Error processing CSV file: {e}")
 
 
-def delete_zero_page_records():
+def delete_zero_page_records(dry_run=False):
     """
     Deletes all records from the JobSearch table where the last_page_number is 0.
-    Logs the number of records deleted.
+    Logs the number of records deleted, or only counts them with dry_run.
     """
-    with get_session() as session:
-        # Query to find all job search records with last_page_number = 0
-        zero_page_records = session.query(JobSearch).filter(JobSearch.last_page_number == 0).all()
-        
-        # Count records to delete
-        record_count = len(zero_page_records)
-        
-        if record_count > 0:
-            for record in zero_page_records:
-                session.delete(record)
-
-            session.commit()
-            logging.info(f"Deleted {record_count} records with last_page_number = 0 from JobSearch table.")
-            
-        else:
-            logging.info("No records found with last_page_number = 0 in JobSearch table.")
+    return delete_zero_page_searches(dry_run=dry_run)
 
 
-def remove_na_job_titles():
+def remove_na_job_titles(dry_run=False):
     """
     Deletes all records from the JobListing table where job_title is 'N/A'.
-    Logs the number of records deleted.
-    """
-    with get_session() as session:
-        # Query to find all job listings with job_title = 'N/A'
-        na_job_listings = session.query(JobListing).filter(JobListing.job_title == 'N/A').all()
-        
-        # Count records to delete
-        record_count = len(na_job_listings)
-        
-        if record_count > 0:
-            for record in na_job_listings:
-                session.delete(record)
-            session.commit()
-            logging.info(f"Deleted {record_count} records with job_title = 'N/A' from JobListing table.")
-        else:
-            logging.info("No records found with job_title = 'N/A' in JobListing table.")
-
-
-def count_unique_companies():
-    """
-    Counts the total number of unique company names in the JobListing table.
-    Logs the total count of unique companies.
+    Logs the number of records deleted, or only counts them with dry_run.
     """
-    with get_session() as session:
-        # Get the count of unique company names
-        unique_companies_count = session.query(JobListing.company).distinct().count()
-        
-        logging.info(f"Total number of unique companies: {unique_companies_count}")
-        return unique_companies_count
+    return delete_na_job_titles(dry_run=dry_run)
 
 
 def upload_job_listings_from_csv(csv_file):
     """
     Reads entries from a CSV file and inserts them into the JobListing table.
+    The file is streamed in chunks by the bulk importer (COPY on Postgres), and
+    listings whose job key is already stored are updated instead of duplicated.
     
     Parameters:
     - csv_file: str, the path to the CSV file to read
     """
     try:
-        with open(csv_file, 'r') as file:
-            reader = csv.DictReader(file)
-            job_listings = []
-            for row in reader:
-                job_listings.append(JobListing(
-                    job_search_id=int(row['job_search_id']),
-                    date_scraped=datetime.now(timezone.utc),
-                    page_number=int(row['page_number']),
-                    job_title=row['job_title'],
-                    company=row['company'],
-                    location=row['location'],
-                    posted_date=row['posted_date'],
-                    job_link=row['job_link'],
-                    stars=row['stars'] if row['stars'] else None,
-                    job_type=row['job_type'] if row['job_type'] else None,
-                    full_description=row['full_description'] if row['full_description'] else None,
-                    apply_now_link=row['apply_now_link'] if row['apply_now_link'] else None
-                ))
-
-        # Insert the job listings into the database
-        with get_session() as session:
-            session.bulk_save_objects(job_listings)
-            session.commit()
-            logging.info(f"Uploaded {len(job_listings)} job listings from {csv_file} into the database.")
+        import_job_listings_from_csv(csv_file)
 
     except Exception as e:
         logging.error(f"Error uploading job listings from CSV: {e}")
@@ -144,7 +86,7 @@ def upload_job_listings_from_csv(csv_file):
 def export_non_null_apply_links_to_csv(output_file):
     """
     Counts and exports all records in the JobListing table where apply_now_link is NOT null.
-    Saves the results to a CSV file.
+    Saves the results to a CSV file, streaming the rows in chunks.
 
     Parameters:
     - output_file: str, the path to save the CSV file.
@@ -152,78 +94,75 @@ def export_non_null_apply_links_to_csv(output_file):
     try:
         with get_session() as session:
             # Query to find all job listings where apply_now_link is not null
-            # job_listings = session.query(JobListing).filter(JobListing.apply_now_link.isnot(None)).all()
+            # job_listings = session.query(JobListing).filter(JobListing.apply_now_link.isnot(None))
 
             # Query to find the first 100 job listings where apply_now_link is not null
             job_listings = (
-                session.query(JobListing)
+                session.query(
+                    JobListing.id, JobListing.job_title, JobListing.company, JobListing.location,
+                    JobListing.posted_date, JobListing.job_link, JobListing.stars, JobListing.job_type,
+                    JobListing.full_description, JobListing.apply_now_link
+                )
                 .filter(JobListing.apply_now_link.isnot(None))
+                .order_by(JobListing.id)
                 .limit(100)
-                .all()
             )
 
-            # Count the total number of records
-            record_count = len(job_listings)
-            logging.info(f"Total job listings with apply_now_link not null: {record_count}")
-
             # Export records to a CSV file
-            with open(output_file, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-
-                # Write the header
-                writer.writerow(['ID', 'Job Title', 'Company', 'Location', 'Posted Date', 
-                                 'Job Link', 'Stars', 'Job Type', 'Full Description', 'Apply Now Link'])
-
-                # Write each job listing to the CSV
-                for job in job_listings:
-                    writer.writerow([
-                        job.id,
-                        job.job_title,
-                        job.company,
-                        job.location,
-                        job.posted_date,
-                        job.job_link,
-                        job.stars,
-                        job.job_type,
-                        job.full_description,
-                        job.apply_now_link
-                    ])
+            output_file = export_path(output_file)
+            record_count = write_query_to_csv(job_listings, output_file, [
+                'ID', 'Job Title', 'Company', 'Location', 'Posted Date',
+                'Job Link', 'Stars', 'Job Type', 'Full Description', 'Apply Now Link'
+            ])
+
+            if not record_count:
+                logging.warning(f"No job listings with apply_now_link found, {output_file} not written")
+                return
 
+            # Count the total number of records
+            logging.info(f"Total job listings with apply_now_link not null: {record_count}")
             logging.info(f"Exported {record_count} job listings to {output_file}")
 
     except Exception as e:
         logging.error(f"Error exporting job listings to CSV: {e}")
 
 
-def export_job_count_by_company(output_file):
+def export_job_count_by_company(output_file, normalize=True):
     """
     Generates a CSV file that lists companies and their corresponding job counts, 
     ordered in descending order of job listings.
+    With normalize, variants of a company name ("Amazon", "Amazon UK", "Amazon Web Services (AWS)")
+    are counted under their canonical name from a freshly built company index.
 
     Parameters:
     - output_file: str, the path to save the CSV file.
+    - normalize: bool, whether to group company name variants together.
     """
     try:
+        if normalize:
+            build_company_index()
+
         with get_session() as session:
+            #* Names missing from the company index are counted as scraped
+            company = func.coalesce(CompanyAlias.canonical_company, JobListing.company) if normalize else JobListing.company
+
             # Query to count jobs per company and order by count in descending order
             job_counts = (
-                session.query(JobListing.company, func.count(JobListing.id).label("job_count"))
-                .group_by(JobListing.company)
+                session.query(company.label("company"), func.count(JobListing.id).label("job_count"))
+                .outerjoin(CompanyAlias, CompanyAlias.company == JobListing.company)
+                .group_by(company)
                 .order_by(desc("job_count"))
-                .all()
             )
 
             # Export the results to a CSV file
-            with open(output_file, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                # Write the header
-                writer.writerow(["Company", "Job Count"])
+            output_file = export_path(output_file)
+            record_count = write_query_to_csv(job_counts, output_file, ["Company", "Job Count"])
 
-                # Write each company's job count to the CSV
-                for company, job_count in job_counts:
-                    writer.writerow([company, job_count])
+            if not record_count:
+                logging.warning(f"No companies found, {output_file} not written")
+                return
 
-            logging.info(f"Exported job counts by company to {output_file}")
+            logging.info(f"Exported job counts for {record_count} companies to {output_file}")
 
     except Exception as e:
         logging.error(f"Error exporting job counts by company to CSV: {e}")
@@ -232,7 +171,7 @@ def export_job_count_by_company(output_file):
 def fetch_apollo_data(input_file, output_file):
     """
     Fetches enriched people data from Apollo.io API based on provided company names.
-    Saves the results to a CSV file.
+    Appends each company's results to a CSV file as soon as they are fetched.
 
     Parameters:
     - input_file: str, path to the input CSV file with companies.
@@ -271,16 +210,22 @@ def fetch_apollo_data(input_file, output_file):
         "HR Business Advisor"
     ]
 
-    enriched_data = []
-    has_errors = False
-    
+    failed_companies = 0
+
     try:
-        # Read the input file
-        with open(input_file, 'r') as csvfile:
+        #* Each company's contacts are appended and checkpointed as soon as its pages are fetched,
+        #* so a rerun with the same output file skips the companies already finished
+        with open(input_file, 'r') as csvfile, IncrementalCsvWriter(output_file, [
+            "First Name", "Last Name", "Job Title", "Email", "Company", "LinkedIn URL"
+        ]) as writer:
             reader = csv.DictReader(csvfile)
             
             for row in reader:
                 company_name = row['Company']
+
+                if writer.is_done(company_name):
+                    continue
+
                 logging.info(f"Fetching data for company: {company_name}")
                 
                 # Apollo.io API request payload
@@ -298,6 +243,8 @@ def fetch_apollo_data(input_file, output_file):
                 # Add company name to the payload
                 # payload["q_keywords"] = company_name
 
+                company_data = []
+
                 while True:
                     try:
                         # Make the API request
@@ -314,7 +261,7 @@ def fetch_apollo_data(input_file, output_file):
                         if "contacts" in data and data["contacts"]:
 
                             for contact in data["contacts"]:
-                                enriched_data.append({
+                                company_data.append({
                                     "First Name": contact.get("first_name", "N/A"),
                                     "Last Name": contact.get("last_name", "N/A"),
                                     "Job Title": contact.get("title", "N/A"),
@@ -327,39 +274,23 @@ def fetch_apollo_data(input_file, output_file):
                         if data.get("pagination", {}).get("page") < data.get("pagination", {}).get("total_pages", 0):
                             payload["page"] += 1
                         else:
+                            writer.write_company(company_name, company_data)
                             break
 
 
                     except requests.exceptions.RequestException as e:
+                        #! Not checkpointed, so the next run fetches this company again
                         logging.error(f"Request error for company {company_name}: {e}")
-                        has_errors = True
+                        failed_companies += 1
                         break
 
+        if failed_companies:
+            logging.warning(f"Enriched data saved to {output_file}, but {failed_companies} companies failed and will be fetched again on the next run.")
+        else:
+            logging.info(f"Enriched data successfully saved to {output_file}")
 
     except Exception as e:
         logging.error(f"Error during data enrichment: {e}")
-        has_errors = True
-
-
-    # Save enriched data to CSV if no errors occurred
-    if not has_errors and enriched_data:
-        # Save enriched data to CSV
-        try:
-            with open(output_file, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=[
-                    "First Name", "Last Name", "Job Title", "Email", "Company", "LinkedIn URL"
-                ])
-
-                writer.writeheader()
-                writer.writerows(enriched_data)
-
-            logging.info(f"Enriched data successfully saved to {output_file}")
-
-        except Exception as e:
-            logging.error(f"Error saving enriched data to CSV: {e}")
-
-    else:
-        logging.warning("No data was written to the CSV due to errors.")
 
 
 def fetch_apollo_people_data(input_file: str, output_file: str):
@@ -463,6 +394,8 @@ def fetch_apollo_people_data(input_file: str, output_file: str):
 
 # Example usage
 if __name__ == "__main__":
+    init_database()
+
     # input_csv_file = os.path.join(os.path.dirname(__file__), 'csv_exports/JobSearch.csv')
     # output_csv_file = os.path.join(os.path.dirname(__file__), 'csv_exports/CleanedJobSearch.csv')
 
@@ -481,6 +414,9 @@ if __name__ == "__main__":
     #! Remove job listings with "N/A" job titles
     # remove_na_job_titles()
 
+    #? Other maintenance (stale listings, duplicates) runs from the CLI, e.g.
+    #? python -m database.maintenance duplicate-listings --dry-run
+
     # export_non_null_apply_links_to_csv(output_csv_file)
 
     # TODO Count and log the total number of unique companies
@@ -17,6 +17,50 @@ SCRAPER_API_URL_VAR = "SCRAPER_API_URL"
 TIMEOUT_URLS_FILE_VAR = "TIMEOUT_URLS_FILE"
 APOLLO_API_KEY_VAR = "APOLLO_API_KEY"
 APOLLO_API_URL_VAR = "APOLLO_API_URL"
+FETCH_MODE_VAR = "FETCH_MODE" # "threads" (default) or "async"
+MAX_CONCURRENT_REQUESTS_VAR = "MAX_CONCURRENT_REQUESTS" # In-flight request cap for the async fetch engine
+ASYNC_THREAD_WORKERS_VAR = "ASYNC_THREAD_WORKERS" # Threads running the async engine's blocking work (database writes, cache I/O)
+HTTP_POOL_SIZE_VAR = "HTTP_POOL_SIZE" # Keep-alive connections per host in each pooled session
+HTTP_KEEPALIVE_TIMEOUT_VAR = "HTTP_KEEPALIVE_TIMEOUT" # Seconds an idle async connection is kept open
+HTTP_RETRIES_VAR = "HTTP_RETRIES" # Transport-level retries for connection errors and 502/503/504
+PIPELINE_QUEUE_SIZE_VAR = "PIPELINE_QUEUE_SIZE" # Job listings buffered between page and detail workers
+WORK_BATCH_SIZE_VAR = "WORK_BATCH_SIZE" # Rows fetched per keyset page when streaming work from the database
+MAX_SCRAPE_ATTEMPTS_VAR = "MAX_SCRAPE_ATTEMPTS" # Attempts across runs before a failed listing is given up on
+WRITE_BATCH_SIZE_VAR = "WRITE_BATCH_SIZE" # Pending row updates that trigger a batched flush
+WRITE_FLUSH_INTERVAL_VAR = "WRITE_FLUSH_INTERVAL" # Seconds between time-based flushes of batched updates
+HTML_PARSER_VAR = "HTML_PARSER" # BeautifulSoup backend; defaults to lxml when installed
+PARSER_PROCESSES_VAR = "PARSER_PROCESSES" # Processes that parse fetched pages off the GIL; 0 parses in the fetch worker
+RESPONSE_CACHE_MODE_VAR = "RESPONSE_CACHE_MODE" # "off" (default), "on" or "offline" (replay from cache, no network)
+RESPONSE_CACHE_DIR_VAR = "RESPONSE_CACHE_DIR"
+RESPONSE_CACHE_TTL_VAR = "RESPONSE_CACHE_TTL" # Seconds a cached response is served in "on" mode
+RESPONSE_CACHE_MAX_MB_VAR = "RESPONSE_CACHE_MAX_MB" # Compressed size above which least recently used responses are evicted
+ADAPTIVE_CONCURRENCY_VAR = "ADAPTIVE_CONCURRENCY" # "true" lets latency and error rate drive the in-flight limit, starting at MAX_BOTS
+ADAPTIVE_MIN_BOTS_VAR = "ADAPTIVE_MIN_BOTS"
+ADAPTIVE_MAX_BOTS_VAR = "ADAPTIVE_MAX_BOTS"
+TARGET_LATENCY_VAR = "TARGET_LATENCY" # p95 request latency in seconds the adaptive limit aims for
+ERROR_RATE_THRESHOLD_VAR = "ERROR_RATE_THRESHOLD" # Share of timeouts/429/5xx that makes the adaptive limit back off
+RETRY_BASE_DELAY_VAR = "RETRY_BASE_DELAY" # Seconds before the first retry; doubles on every further retry
+RETRY_MAX_DELAY_VAR = "RETRY_MAX_DELAY"
+PAGINATION_MODE_VAR = "PAGINATION_MODE" # "probe" finds the last page with a start=3000 request, "stream" sizes searches from their first page
+RESULTS_PER_PAGE_VAR = "RESULTS_PER_PAGE" # Step of the start= parameter between Indeed results pages, also used to size searches from their job count
+MAX_SEARCH_PAGES_VAR = "MAX_SEARCH_PAGES" # Results pages Indeed serves per search at most; sized searches are clamped to it
+EXPORT_CHUNK_SIZE_VAR = "EXPORT_CHUNK_SIZE" # Rows fetched from the database and written per chunk by the exporters
+EXPORT_GZIP_VAR = "EXPORT_GZIP" # "true" writes gzip-compressed .csv.gz exports
+COLUMNAR_EXPORT_FORMAT_VAR = "COLUMNAR_EXPORT_FORMAT" # "parquet" or "arrow" (Arrow IPC files); needs pyarrow
+COLUMNAR_EXPORT_COMPRESSION_VAR = "COLUMNAR_EXPORT_COMPRESSION"
+IMPORT_CHUNK_SIZE_VAR = "IMPORT_CHUNK_SIZE" # CSV rows inserted per transaction by the bulk importer
+MAINTENANCE_BATCH_SIZE_VAR = "MAINTENANCE_BATCH_SIZE" # Rows deleted or updated per statement by database maintenance
+STALE_LISTING_DAYS_VAR = "STALE_LISTING_DAYS" # Age in days after which job listings are pruned as stale
+DB_POOL_SIZE_VAR = "DB_POOL_SIZE" # Pooled database connections; derived from MAX_BOTS (or ADAPTIVE_MAX_BOTS) when unset
+DB_MAX_OVERFLOW_VAR = "DB_MAX_OVERFLOW" # Connections opened beyond the pool size under load; defaults to the pool size
+DB_POOL_TIMEOUT_VAR = "DB_POOL_TIMEOUT" # Seconds a thread waits for a free connection before failing
+APOLLO_CONCURRENCY_VAR = "APOLLO_CONCURRENCY" # Companies enriched at the same time
+APOLLO_PAGE_CONCURRENCY_VAR = "APOLLO_PAGE_CONCURRENCY" # Result pages of one company fetched at the same time after page 1
+APOLLO_RATE_LIMIT_VAR = "APOLLO_RATE_LIMIT" # Apollo requests per minute across all companies; lowered by Apollo's rate-limit headers
+APOLLO_RATE_BURST_VAR = "APOLLO_RATE_BURST" # Requests that may be sent back to back before the rate limit paces them
+APOLLO_CACHE_DIR_VAR = "APOLLO_CACHE_DIR"
+APOLLO_CACHE_TTL_VAR = "APOLLO_CACHE_TTL" # Seconds a cached Apollo search page is reused; 0 disables the cache
+COMPANY_MATCH_THRESHOLD_VAR = "COMPANY_MATCH_THRESHOLD" # Similarity (0-1) from which two normalised company names are merged
 
 # Configuration class
 class Config:
@@ -30,6 +74,50 @@ class Config:
     TIMEOUT_URLS_FILE: str = os.getenv(TIMEOUT_URLS_FILE_VAR)
     APOLLO_API_KEY: str = os.getenv(APOLLO_API_KEY_VAR)
     APOLLO_API_URL: str = os.getenv(APOLLO_API_URL_VAR)
+    FETCH_MODE: str = os.getenv(FETCH_MODE_VAR, "threads")
+    MAX_CONCURRENT_REQUESTS: int = int(os.getenv(MAX_CONCURRENT_REQUESTS_VAR, 200))
+    ASYNC_THREAD_WORKERS: int = int(os.getenv(ASYNC_THREAD_WORKERS_VAR, min(32, (os.cpu_count() or 1) + 4)))
+    HTTP_POOL_SIZE: int = int(os.getenv(HTTP_POOL_SIZE_VAR, 10))
+    HTTP_KEEPALIVE_TIMEOUT: int = int(os.getenv(HTTP_KEEPALIVE_TIMEOUT_VAR, 30))
+    HTTP_RETRIES: int = int(os.getenv(HTTP_RETRIES_VAR, 2))
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv(PIPELINE_QUEUE_SIZE_VAR, 1000))
+    WORK_BATCH_SIZE: int = int(os.getenv(WORK_BATCH_SIZE_VAR, 1000))
+    MAX_SCRAPE_ATTEMPTS: int = int(os.getenv(MAX_SCRAPE_ATTEMPTS_VAR, 10))
+    WRITE_BATCH_SIZE: int = int(os.getenv(WRITE_BATCH_SIZE_VAR, 500))
+    WRITE_FLUSH_INTERVAL: float = float(os.getenv(WRITE_FLUSH_INTERVAL_VAR, 2.0))
+    HTML_PARSER: str = os.getenv(HTML_PARSER_VAR)
+    PARSER_PROCESSES: int = int(os.getenv(PARSER_PROCESSES_VAR, 0))
+    RESPONSE_CACHE_MODE: str = os.getenv(RESPONSE_CACHE_MODE_VAR, "off")
+    RESPONSE_CACHE_DIR: str = os.getenv(RESPONSE_CACHE_DIR_VAR, "response_cache")
+    RESPONSE_CACHE_TTL: int = int(os.getenv(RESPONSE_CACHE_TTL_VAR, 7 * 24 * 3600))
+    RESPONSE_CACHE_MAX_MB: int = int(os.getenv(RESPONSE_CACHE_MAX_MB_VAR, 2048))
+    ADAPTIVE_CONCURRENCY: bool = os.getenv(ADAPTIVE_CONCURRENCY_VAR, "false").lower() == "true"
+    ADAPTIVE_MIN_BOTS: int = int(os.getenv(ADAPTIVE_MIN_BOTS_VAR, 2))
+    ADAPTIVE_MAX_BOTS: int = int(os.getenv(ADAPTIVE_MAX_BOTS_VAR, 100))
+    TARGET_LATENCY: float = float(os.getenv(TARGET_LATENCY_VAR, 30))
+    ERROR_RATE_THRESHOLD: float = float(os.getenv(ERROR_RATE_THRESHOLD_VAR, 0.05))
+    RETRY_BASE_DELAY: float = float(os.getenv(RETRY_BASE_DELAY_VAR, 2.0))
+    RETRY_MAX_DELAY: float = float(os.getenv(RETRY_MAX_DELAY_VAR, 60.0))
+    PAGINATION_MODE: str = os.getenv(PAGINATION_MODE_VAR, "probe")
+    RESULTS_PER_PAGE: int = int(os.getenv(RESULTS_PER_PAGE_VAR, 10))
+    MAX_SEARCH_PAGES: int = int(os.getenv(MAX_SEARCH_PAGES_VAR, 100))
+    EXPORT_CHUNK_SIZE: int = int(os.getenv(EXPORT_CHUNK_SIZE_VAR, 5000))
+    EXPORT_GZIP: bool = os.getenv(EXPORT_GZIP_VAR, "false").lower() == "true"
+    COLUMNAR_EXPORT_FORMAT: str = os.getenv(COLUMNAR_EXPORT_FORMAT_VAR, "parquet")
+    COLUMNAR_EXPORT_COMPRESSION: str = os.getenv(COLUMNAR_EXPORT_COMPRESSION_VAR, "zstd")
+    IMPORT_CHUNK_SIZE: int = int(os.getenv(IMPORT_CHUNK_SIZE_VAR, 5000))
+    MAINTENANCE_BATCH_SIZE: int = int(os.getenv(MAINTENANCE_BATCH_SIZE_VAR, 10000))
+    STALE_LISTING_DAYS: int = int(os.getenv(STALE_LISTING_DAYS_VAR, 90))
+    DB_POOL_SIZE: str = os.getenv(DB_POOL_SIZE_VAR)
+    DB_MAX_OVERFLOW: str = os.getenv(DB_MAX_OVERFLOW_VAR)
+    DB_POOL_TIMEOUT: int = int(os.getenv(DB_POOL_TIMEOUT_VAR, 30))
+    APOLLO_CONCURRENCY: int = int(os.getenv(APOLLO_CONCURRENCY_VAR, 10))
+    APOLLO_PAGE_CONCURRENCY: int = int(os.getenv(APOLLO_PAGE_CONCURRENCY_VAR, 4))
+    APOLLO_RATE_LIMIT: float = float(os.getenv(APOLLO_RATE_LIMIT_VAR, 100))
+    APOLLO_RATE_BURST: int = int(os.getenv(APOLLO_RATE_BURST_VAR, 10))
+    APOLLO_CACHE_DIR: str = os.getenv(APOLLO_CACHE_DIR_VAR, "apollo_cache")
+    APOLLO_CACHE_TTL: int = int(os.getenv(APOLLO_CACHE_TTL_VAR, 30 * 24 * 3600))
+    COMPANY_MATCH_THRESHOLD: float = float(os.getenv(COMPANY_MATCH_THRESHOLD_VAR, 0.9))
 
     @classmethod
     def validate_env(cls):
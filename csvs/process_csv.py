@@ -1,69 +1,110 @@
 import csv
+from config import Config, logging
+from scraper_utils.company_names import normalize_company_name
+from database.company_index import canonical_company_map
 from apollo.utils.concurrency_limiter import limit_concurrency
+from apollo.utils.incremental_writer import IncrementalCsvWriter
+from apollo.utils.contact_index import ContactIndex
+from apollo.utils.response_cache import get_apollo_cache
+from apollo.utils.rate_limiter import get_apollo_rate_limiter
 from apollo.services.fetch_people_data import fetch_apollo_people_data
 
 
-def process_csv(input_file: str, output_file: str, headers: dict):
+# Use Config class to access ENVs
+APOLLO_CONCURRENCY = Config.APOLLO_CONCURRENCY
+
+
+def process_csv(input_file: str, output_file: str, headers: dict, max_concurrent: int = APOLLO_CONCURRENCY):
     """
     Processes a CSV file to fetch Apollo.io data for companies and save enriched data.
 
     :param input_file: str, Path to the input CSV file
     :param output_file: str, Path to save the output CSV file
     :param headers: dict, Request headers
+    :param max_concurrent: int, Companies enriched at the same time
     """
-    with open(input_file, "r") as infile:
+    fieldnames = ["First Name", "Last Name", "Job Title", "Email", "Company", "LinkedIn URL"]
+
+    #* Each company's contacts are written and checkpointed as soon as it finishes, so a rerun
+    #* after a crash only enriches the companies that were not finished
+    #* A person found for several companies is written once, by Apollo person id or LinkedIn URL
+    with open(input_file, "r") as infile, IncrementalCsvWriter(output_file, fieldnames) as writer:
+        contact_index = ContactIndex()
+        contact_index.load_csv(output_file)
+
         reader = csv.DictReader(infile)
-        companies = [row["Company"] for row in reader]
+        canonical_companies = canonical_company_map()
+        queued = set()
+        variants = []
+
+        #* Variants of a company already queued ("Amazon UK" after "Amazon") would return the same people.
+        #* Names are resolved through the company index like the job count export; names missing
+        #* from it only match variants with the same normalized form
+        def unique_companies():
+            for row in reader:
+                company = row["Company"]
+                form = normalize_company_name(canonical_companies.get(company, company))
+
+                if form in queued:
+                    variants.append(company)
+                    continue
+
+                queued.add(form)
+                if not writer.is_done(company):
+                    yield company
+
+        companies = unique_companies()
+
+        limit_concurrency(
+            companies,
+            lambda company: fetch_apollo_people_data(
+                company,
+                {
+                    "person_locations": ["London, United Kingdom"],
+                    "contact_email_status": ["likely to engage"],
+                    # "person_titles": [
+                    #     "Compensation & Benefits", "Culture, Diversity & Inclusion", "HR Business Partner"
+                    # ],
+                    "person_titles": [
+                        "Compensation & Benefits",
+                        "Culture, Diversity & Inclusion",
+                        "Employee & Labor Relations",
+                        "Health & Safety",
+                        "Human Resource Information System",
+                        "Human Resources",
+                        "HR Business Partner",
+                        "Learning & Development",
+                        "Organizational Development",
+                        "Recruiting & Talent Acquisition",
+                        "Talent Management",
+                        "Workforce Management",
+                        "People Operations",
+                        "Recruitment",
+                        "Talent",
+                        "Recruiter",
+                        "Equity and Inclusion",
+                        "Talent Acquisition",
+                        "Recruitment Lead",
+                        "Recruiting",
+                        "HR Business Advisor",
+                        "Employee Relations Associate",
+                        "HR Business Advisor"
+                    ],
+                    "departments": ["master human resources"],
+                    "page": 1,
+                    "per_page": 100,
+                    "q_keywords": company,
+                },
+                headers,
+            ),
+            max_concurrent,
+            on_result=lambda company, contacts: writer.write_company(company, contact_index.filter_new(contacts)),
+        )
 
-    enriched_data = limit_concurrency(
-        companies,
-        lambda company: fetch_apollo_people_data(
-            company,
-            {
-                "person_locations": ["London, United Kingdom"],
-                "contact_email_status": ["likely to engage"],
-                # "person_titles": [
-                #     "Compensation & Benefits", "Culture, Diversity & Inclusion", "HR Business Partner"
-                # ],
-                "person_titles": [
-                    "Compensation & Benefits",
-                    "Culture, Diversity & Inclusion",
-                    "Employee & Labor Relations",
-                    "Health & Safety",
-                    "Human Resource Information System",
-                    "Human Resources",
-                    "HR Business Partner",
-                    "Learning & Development",
-                    "Organizational Development",
-                    "Recruiting & Talent Acquisition",
-                    "Talent Management",
-                    "Workforce Management",
-                    "People Operations",
-                    "Recruitment",
-                    "Talent",
-                    "Recruiter",
-                    "Equity and Inclusion",
-                    "Talent Acquisition",
-                    "Recruitment Lead",
-                    "Recruiting",
-                    "HR Business Advisor",
-                    "Employee Relations Associate",
-                    "HR Business Advisor"
-                ],
-                "departments": ["master human resources"],
-                "page": 1,
-                "per_page": 100,
-                "q_keywords": company,
-            },
-            headers,
-        ),
-    )
+    logging.info(f"Skipped {len(variants)} company name variants of companies already enriched")
+    contact_index.log_stats()
+    get_apollo_rate_limiter().log_stats()
 
-    with open(output_file, "w", newline="") as outfile:
-        writer = csv.DictWriter(outfile, fieldnames=[
-            "First Name", "Last Name", "Job Title", "Email", "Company", "LinkedIn URL"
-        ])
-        
-        writer.writeheader()
-        for data in enriched_data:
-            writer.writerows(data)
\ No newline at end of file
+    cache = get_apollo_cache()
+    if cache:
+        cache.log_stats()
\ No newline at end of file
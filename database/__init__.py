@@ -1,20 +1,69 @@
 from .models import Base
+from .migrations import run_migrations
+from .pool import InstrumentedQueuePool
 from config import Config, logging
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, scoped_session
 
 # Use Config class to access ENVs
 DATABASE_URI = Config.DATABASE_URI
+FETCH_MODE = Config.FETCH_MODE
+DB_POOL_SIZE = Config.DB_POOL_SIZE
+DB_MAX_OVERFLOW = Config.DB_MAX_OVERFLOW
+DB_POOL_TIMEOUT = Config.DB_POOL_TIMEOUT
+
+
+def _pool_options(database_uri):
+    """
+    Pool settings sized for the bot manager's concurrency: one connection per worker thread,
+    plus the batch writer's flusher and the main thread, with as much overflow again for the
+    pipeline phase's second executor. The async engine writes from its asyncio.to_thread
+    workers, so it gets one connection per ASYNC_THREAD_WORKERS thread plus the flusher and
+    the event loop thread. DB_POOL_SIZE and DB_MAX_OVERFLOW override these.
+    """
+    url = make_url(database_uri)
+
+    #! In-memory SQLite lives in a single connection and keeps SQLAlchemy's default pool
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+
+    if FETCH_MODE == "async":
+        pool_size = Config.ASYNC_THREAD_WORKERS + 2
+    else:
+        pool_size = (Config.ADAPTIVE_MAX_BOTS if Config.ADAPTIVE_CONCURRENCY else Config.MAX_BOTS) + 2
+
+    pool_size = int(DB_POOL_SIZE) if DB_POOL_SIZE else pool_size
+
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': pool_size,
+        'max_overflow': int(DB_MAX_OVERFLOW) if DB_MAX_OVERFLOW else pool_size,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_pre_ping': True,  # Replace connections the server closed while idle
+    }
+
 
 #? Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URI)
+engine = create_engine(DATABASE_URI, **_pool_options(DATABASE_URI))
 
-#* Create a configured "Session" class
-Session = sessionmaker(bind=engine)
+#* Thread-local sessions: every thread reuses its own Session, which each `with get_session()`
+#* block closes again, returning the connection to the pool
+Session = scoped_session(sessionmaker(bind=engine))
 
 def get_session():
     return Session()
 
-#? Create all tables in the engine (if they don't exist)
-Base.metadata.create_all(engine)
-logging.info("Database initialized and tables created.")
\ No newline at end of file
+def log_pool_stats():
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.log_stats()
+
+def init_database():
+    """
+    Creates any missing tables and applies the column migrations. Entry points call this at startup
+    rather than on import, so spawned parser processes that re-import the entry module never touch the schema.
+    """
+    #? Create all tables in the engine (if they don't exist)
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    logging.info("Database initialized and tables created.")
@@ -0,0 +1,184 @@
+import time
+import threading
+from config import Config, logging
+from database import get_session
+from sqlalchemy import update, bindparam
+
+
+# Use Config class to access ENVs
+WRITE_BATCH_SIZE = Config.WRITE_BATCH_SIZE
+WRITE_FLUSH_INTERVAL = Config.WRITE_FLUSH_INTERVAL
+
+
+class Increment:
+    """
+    Column value that is added to the stored value instead of replacing it.
+    """
+
+    def __init__(self, amount):
+        self.amount = amount
+
+
+def _update_statement(table, columns, increments):
+    """
+    Builds an UPDATE ... WHERE id = :row_id statement that can be executed with many parameter sets.
+    """
+    values = {column: bindparam(f"v_{column}") for column in columns}
+    values.update({column: table.c[column] + bindparam(f"v_{column}") for column in increments})
+
+    return update(table).where(table.c.id == bindparam("row_id")).values(values)
+
+
+def _execute_updates(session, model, rows):
+    """
+    Executes the pending updates of one model, one executemany per distinct set of columns.
+    rows maps a primary key to the column values to write.
+    """
+    table = model.__table__
+    groups = {}
+
+    for row_id, values in rows.items():
+        columns = tuple(sorted(key for key, value in values.items() if not isinstance(value, Increment)))
+        increments = tuple(sorted(key for key, value in values.items() if isinstance(value, Increment)))
+
+        params = {"row_id": row_id}
+        for key, value in values.items():
+            params[f"v_{key}"] = value.amount if isinstance(value, Increment) else value
+
+        groups.setdefault((columns, increments), []).append(params)
+
+    for (columns, increments), params in groups.items():
+        session.execute(_update_statement(table, columns, increments), params)
+
+
+def apply_update(model, row_id, values):
+    """
+    Writes a single row update immediately, for callers running without a BatchWriter.
+    """
+    with get_session() as session:
+        _execute_updates(session, model, {row_id: values})
+        session.commit()
+
+
+class BatchWriter:
+    """
+    Write-behind buffer for row updates coming from many worker threads.
+    Updates are coalesced per row and flushed as executemany batches in one transaction,
+    either when WRITE_BATCH_SIZE rows are pending or every WRITE_FLUSH_INTERVAL seconds.
+
+    Usage:
+        with BatchWriter() as writer:
+            writer.update(JobListing, job_id, {"stars": "4.1"})
+    """
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE, flush_interval: float = WRITE_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.flush_count = 0
+        self.flush_seconds = 0.0
+
+    def __enter__(self):
+        self._flusher.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def update(self, model, row_id, values: dict):
+        """
+        Queues an update of one row. Later values for the same row overwrite earlier ones
+        and Increment values are summed, so a row is written at most once per flush.
+        """
+        with self._lock:
+            rows = self._pending.setdefault(model, {})
+            row = rows.get(row_id)
+
+            if row is None:
+                rows[row_id] = dict(values)
+                self._pending_count += 1
+            else:
+                for key, value in values.items():
+                    if isinstance(value, Increment) and isinstance(row.get(key), Increment):
+                        row[key] = Increment(row[key].amount + value.amount)
+                    else:
+                        row[key] = value
+
+            should_flush = self._pending_count >= self.batch_size
+
+        # Flushing on the caller's thread applies back-pressure when the database falls behind
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes every pending update in a single transaction.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                pending_count, self._pending_count = self._pending_count, 0
+
+            if not pending_count:
+                return
+
+            start_time = time.time()
+
+            try:
+                with get_session() as session:
+                    for model, rows in pending.items():
+                        _execute_updates(session, model, rows)
+                    session.commit()
+
+                self.rows_written += pending_count
+                self.flush_count += 1
+                self.flush_seconds += time.time() - start_time
+
+            except Exception as e:
+                #! One bad row must not lose the scraped data of the whole batch
+                logging.error(f"Failed to flush {pending_count} batched updates, writing them row by row: {e}")
+                self._write_individually(pending)
+
+    def _write_individually(self, pending):
+        """
+        Writes the updates of a failed flush one row per transaction; only rows that fail
+        on their own are dropped.
+        """
+        for model, rows in pending.items():
+            for row_id, values in rows.items():
+                try:
+                    apply_update(model, row_id, values)
+                    self.rows_written += 1
+
+                except Exception as e:
+                    self.rows_failed += 1
+                    logging.error(f"Dropped update of {model.__tablename__} row {row_id}: {e}")
+
+    def close(self):
+        """
+        Stops the periodic flusher and writes whatever is still pending.
+        """
+        self._closed.set()
+        if self._flusher.is_alive():
+            self._flusher.join()
+
+        self.flush()
+        self.log_stats()
+
+    def log_stats(self):
+        average = (self.flush_seconds / self.flush_count) if self.flush_count else 0
+        logging.info(
+            f"Batch writer wrote {self.rows_written} rows in {self.flush_count} flushes "
+            f"(average flush {average:.3f} seconds), {self.rows_failed} rows failed"
+        )
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
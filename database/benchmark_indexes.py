@@ -0,0 +1,182 @@
+import time
+import random
+import argparse
+from config import logging
+from itertools import islice
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select, insert, func, desc, text
+from database.work_source import outstanding_job_listing_filter
+from database.models import Base, JobSearch, JobListing, SCRAPE_PENDING, SCRAPE_DONE, SCRAPE_FAILED
+
+
+# Listings generated per job search, and rows inserted per statement
+LISTINGS_PER_SEARCH = 100
+INSERT_CHUNK_SIZE = 10000
+
+
+def _job_searches(search_count):
+    for search_id in range(1, search_count + 1):
+        last_page_number = 0 if search_id % 50 == 0 else 7
+        yield {
+            'id': search_id,
+            'job_title': f"Job title {search_id}",
+            'generated_link': f"https://www.indeed.com/jobs?q=title+{search_id}",
+            'last_page_number': last_page_number,
+            'pagination_links': [f"https://www.indeed.com/jobs?q=title+{search_id}&start=10"] if search_id % 10 else None,
+            'date_scraped': datetime(2024, 1, 1),
+        }
+
+
+def _job_listings(row_count, seed=0):
+    """
+    Listings resembling a long-running scrape: 95% already enriched in id order, the rest
+    pending or failed, a few untitled, companies skewed towards a small head, one year of dates.
+    """
+    rng = random.Random(seed)
+    enriched_until = int(row_count * 0.95)
+    start_date = datetime(2024, 1, 1)
+
+    for listing_id in range(1, row_count + 1):
+        enriched = listing_id <= enriched_until
+        yield {
+            'id': listing_id,
+            'job_search_id': (listing_id - 1) // LISTINGS_PER_SEARCH + 1,
+            'date_scraped': start_date + timedelta(minutes=listing_id * 525600 // row_count),
+            'page_number': (listing_id - 1) % LISTINGS_PER_SEARCH // 15 + 1,
+            'job_title': 'N/A' if listing_id % 200 == 0 else f"Job {listing_id}",
+            'company': f"Company {int(rng.paretovariate(1.2)) % 50000}",
+            'location': rng.choice(('London', 'Manchester', 'Leeds', 'Remote')),
+            'posted_date': 'Posted 3 days ago',
+            'job_link': f"https://www.indeed.com/rc/clk?jk={listing_id:016x}",
+            'job_key': f"{listing_id:016x}",
+            'full_description': "Description " * 8 if enriched else None,
+            'apply_now_link': f"https://apply.example.com/{listing_id}" if enriched else None,
+            'scrape_status': SCRAPE_DONE if enriched else rng.choice((SCRAPE_PENDING, SCRAPE_FAILED)),
+            'scrape_attempts': 1 if enriched else rng.randint(0, 3),
+        }
+
+
+def _insert_rows(engine, model, rows):
+    row_count = 0
+
+    while chunk := list(islice(rows, INSERT_CHUNK_SIZE)):
+        with engine.begin() as connection:
+            connection.execute(insert(model), chunk)
+        row_count += len(chunk)
+
+    return row_count
+
+
+def _queries(row_count):
+    """
+    The queries the scraper, cleanup and maintenance code run, keyed by a short description.
+    """
+    cutoff = datetime(2024, 1, 1) + timedelta(days=30)
+    search_id = row_count // LISTINGS_PER_SEARCH // 2 or 1
+
+    return {
+        'claim outstanding batch': (
+            select(JobListing.id, JobListing.job_link)
+            .where(JobListing.id > 0, outstanding_job_listing_filter())
+            .order_by(JobListing.id).limit(1000)
+        ),
+        'count N/A titles': select(func.count(JobListing.id)).where(JobListing.job_title == 'N/A'),
+        'listings of a search': select(JobListing.id).where(JobListing.job_search_id == search_id),
+        'scrape progress': select(JobListing.scrape_status, func.count(JobListing.id)).group_by(JobListing.scrape_status),
+        'job count by company': (
+            select(JobListing.company, func.count(JobListing.id).label('job_count'))
+            .group_by(JobListing.company).order_by(desc('job_count')).limit(100)
+        ),
+        'count stale listings': select(func.count(JobListing.id)).where(JobListing.date_scraped < cutoff),
+        'zero page searches': select(func.count(JobSearch.id)).where(JobSearch.last_page_number == 0),
+    }
+
+
+def _time_queries(engine, queries, repeat):
+    """
+    Best wall-clock time of every query over `repeat` runs, in milliseconds.
+    """
+    timings = {}
+
+    with engine.connect() as connection:
+        for name, query in queries.items():
+            best = float('inf')
+
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                connection.execute(query).fetchall()
+                best = min(best, time.perf_counter() - start_time)
+
+            timings[name] = best * 1000
+
+    return timings
+
+
+def _query_plans(engine, queries):
+    explain = "EXPLAIN QUERY PLAN" if engine.dialect.name == 'sqlite' else "EXPLAIN"
+    plans = {}
+
+    with engine.connect() as connection:
+        for name, query in queries.items():
+            compiled = query.compile(engine, compile_kwargs={'literal_binds': True})
+            rows = connection.execute(text(f"{explain} {compiled}")).fetchall()
+            plans[name] = "; ".join(str(row[-1]) for row in rows)
+
+    return plans
+
+
+def run_benchmark(database_uri, row_count, repeat=3):
+    """
+    Fills a scratch database with row_count generated job listings, times the scraper's queries
+    without secondary indexes, creates the model indexes and times them again.
+    The tables in database_uri are dropped and recreated: never point it at the scraper's database.
+    """
+    engine = create_engine(database_uri)
+    tables = [JobSearch.__table__, JobListing.__table__]
+
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+
+    indexes = [index for table in tables for index in table.indexes]
+    for index in indexes:
+        index.drop(bind=engine)
+
+    start_time = time.time()
+    _insert_rows(engine, JobSearch, _job_searches(row_count // LISTINGS_PER_SEARCH + 1))
+    _insert_rows(engine, JobListing, _job_listings(row_count))
+    logging.info(f"Generated {row_count} job listings in {time.time() - start_time:.1f} seconds")
+
+    queries = _queries(row_count)
+    before = _time_queries(engine, queries, repeat)
+
+    start_time = time.time()
+    for index in indexes:
+        index.create(bind=engine)
+
+    #! SQLite's ANALYZE keeps no per-value statistics, after which its planner prefers scanning the
+    #! table for the outstanding batch; the scraper never runs it, so only other databases are analyzed
+    if engine.dialect.name != 'sqlite':
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+    logging.info(f"Created {len(indexes)} indexes in {time.time() - start_time:.1f} seconds")
+
+    after = _time_queries(engine, queries, repeat)
+    plans = _query_plans(engine, queries)
+
+    logging.info(f"{'query':<26}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name in queries:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        logging.info(f"{name:<26}{before[name]:>12.1f}{after[name]:>12.1f}{speedup:>9.1f}x  {plans[name]}")
+
+    engine.dispose()
+    return before, after
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times the scraper's queries before and after the model indexes.")
+    parser.add_argument('--database-uri', default='sqlite:///index_benchmark.db', help="scratch database; its tables are dropped")
+    parser.add_argument('--rows', type=int, default=5_000_000, help="job listings to generate")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per query; the best time is reported")
+    args = parser.parse_args()
+
+    run_benchmark(args.database_uri, args.rows, args.repeat)
@@ -0,0 +1,180 @@
+import io
+import csv
+import time
+from itertools import islice
+from config import logging, Config
+from database import engine
+from datetime import datetime, timezone
+from database.models import JobListing
+from sqlalchemy import insert, text, Integer, DateTime
+from sqlalchemy.dialects import postgresql, sqlite
+from scraper_utils.html_parser import job_key_from_link
+
+
+# Use Config class to access ENVs
+IMPORT_CHUNK_SIZE = Config.IMPORT_CHUNK_SIZE
+
+# Session-local table that COPY loads into before rows are upserted into job_listing
+STAGING_TABLE = 'job_listing_import'
+
+# Field COPY reads as NULL
+COPY_NULL = r'\N'
+
+
+def _import_columns(header):
+    """
+    Table columns filled from a CSV header. Ids are always assigned by the database;
+    date_scraped and job_key are filled in when the CSV does not have them.
+    """
+    table = JobListing.__table__
+    names = [name for name in header if name in table.c and name != 'id']
+
+    for name in ('date_scraped', 'job_key'):
+        if name not in names:
+            names.append(name)
+
+    return [table.c[name] for name in names]
+
+
+def _convert(value, column):
+    """
+    Converts a CSV field to the column's Python type; empty fields become NULL or the column default,
+    and stay empty strings in NOT NULL columns without a default.
+    """
+    if value is None or value == '':
+        if column.nullable:
+            return None
+        if column.default is not None and column.default.is_scalar:
+            return column.default.arg
+        return ''
+
+    if isinstance(column.type, Integer):
+        return int(value)
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+
+    return value
+
+
+def _prepare_chunk(records, columns):
+    """
+    Turns CSV records into row dicts, keeping only the last row of every job key
+    so a single upsert statement never touches the same row twice.
+    """
+    rows = {}
+    now = datetime.now(timezone.utc)
+
+    for position, record in enumerate(records):
+        row = {column.name: _convert(record.get(column.name), column) for column in columns}
+
+        if row['date_scraped'] is None:
+            row['date_scraped'] = now
+        if row['job_key'] is None:
+            row['job_key'] = job_key_from_link(row['job_link'])
+
+        rows[row['job_key'] or ('no key', position)] = row
+
+    return list(rows.values())
+
+
+def _upsert_statement(dialect_name, columns):
+    """
+    INSERT ... ON CONFLICT (job_key) DO UPDATE for the dialects that support it, a plain INSERT otherwise.
+    """
+    table = JobListing.__table__
+
+    if dialect_name == 'postgresql':
+        statement = postgresql.insert(table)
+    elif dialect_name == 'sqlite':
+        statement = sqlite.insert(table)
+    else:
+        return insert(table)
+
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.job_key],
+        set_={column.name: statement.excluded[column.name] for column in columns if column.name != 'job_key'},
+    )
+
+
+def _copy_chunk(connection, columns, rows):
+    """
+    Loads a chunk into the staging table with COPY FROM STDIN, then upserts it into job_listing
+    in one INSERT ... SELECT.
+    """
+    names = [column.name for column in columns]
+    column_list = ", ".join(names)
+    updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in names if name != 'job_key')
+
+    #! COPY reads an unquoted empty CSV field as NULL, so NULL gets its own marker and '' stays an empty string
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [COPY_NULL if row[name] is None else row[name] for name in names] for row in rows
+    )
+    buffer.seek(0)
+
+    copy_statement = f"COPY {STAGING_TABLE} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    cursor = connection.connection.cursor()
+
+    try:
+        if hasattr(cursor, 'copy_expert'):  # psycopg2
+            cursor.copy_expert(copy_statement, buffer)
+        else:  # psycopg 3
+            with cursor.copy(copy_statement) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+    connection.execute(text(
+        f"INSERT INTO job_listing ({column_list}) SELECT {column_list} FROM {STAGING_TABLE} "
+        f"ON CONFLICT (job_key) DO UPDATE SET {updates}"
+    ))
+    connection.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+
+
+def import_job_listings_from_csv(csv_file, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Streams a CSV of job listings (e.g. a JobListing.csv export) into the JobListing table,
+    chunk_size rows per transaction, and returns the number of rows inserted or updated.
+    On Postgres every chunk is loaded with COPY into a staging table; other databases use
+    a Core executemany. Rows whose job key already exists update the stored listing, and
+    only the last of the rows repeating a job key within a chunk is written.
+    """
+    start_time = time.time()
+    row_count = 0
+    repeated_count = 0
+    use_copy = engine.dialect.name == 'postgresql'
+
+    with open(csv_file, 'r', newline='') as file, engine.connect() as connection:
+        reader = csv.DictReader(file)
+        columns = _import_columns(reader.fieldnames or [])
+
+        if use_copy:
+            column_list = ", ".join(column.name for column in columns)
+            connection.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+            connection.execute(text(
+                f"CREATE TEMP TABLE {STAGING_TABLE} AS SELECT {column_list} FROM job_listing WITH NO DATA"
+            ))
+        else:
+            statement = _upsert_statement(engine.dialect.name, columns)
+
+        while records := list(islice(reader, chunk_size)):
+            rows = _prepare_chunk(records, columns)
+
+            if use_copy:
+                _copy_chunk(connection, columns, rows)
+            else:
+                connection.execute(statement, rows)
+
+            connection.commit()
+            row_count += len(rows)
+            repeated_count += len(records) - len(rows)
+
+            elapsed = time.time() - start_time
+            logging.info(f"Imported {row_count} job listings ({row_count / max(elapsed, 1e-6):.0f} rows/sec)")
+
+    elapsed = time.time() - start_time
+    logging.info(
+        f"Imported {row_count} job listings from {csv_file} in {elapsed:.2f} seconds "
+        f"({row_count / max(elapsed, 1e-6):.0f} rows/sec), skipped {repeated_count} rows repeating a job key"
+    )
+    return row_count
@@ -0,0 +1,45 @@
+from itertools import islice
+from database import engine
+from config import logging
+from sqlalchemy import select, delete, insert, func
+from database.models import JobListing, CompanyAlias
+from scraper_utils.company_names import cluster_company_names
+
+
+# Aliases inserted per statement
+INSERT_CHUNK_SIZE = 5000
+
+
+def build_company_index() -> dict:
+    """
+    Rebuilds the company_alias table from the company names of the job listings, mapping
+    each scraped name to its canonical company (see cluster_company_names), and returns the mapping.
+    """
+    with engine.connect() as connection:
+        job_counts = dict(connection.execute(
+            select(JobListing.company, func.count(JobListing.id))
+            .where(JobListing.company.isnot(None))
+            .group_by(JobListing.company)
+        ).all())
+
+    canonical = cluster_company_names(job_counts)
+    aliases = iter({'company': name, 'canonical_company': canonical_name} for name, canonical_name in canonical.items())
+
+    #* Replaced in one transaction, so exports never see a half-built index
+    with engine.begin() as connection:
+        connection.execute(delete(CompanyAlias))
+
+        while chunk := list(islice(aliases, INSERT_CHUNK_SIZE)):
+            connection.execute(insert(CompanyAlias), chunk)
+
+    logging.info(f"Company index: {len(canonical)} company names collapsed into {len(set(canonical.values()))} companies")
+    return canonical
+
+
+def canonical_company_map() -> dict:
+    """
+    Returns the canonical company of every company name in the company_alias table,
+    as last built by build_company_index.
+    """
+    with engine.connect() as connection:
+        return dict(connection.execute(select(CompanyAlias.company, CompanyAlias.canonical_company)).all())
@@ -1,38 +1,91 @@
 import os
 import csv
-from config import logging
+import gzip
+from itertools import islice
 from database import get_session
+from config import logging, Config
 from database.models import JobSearch, JobListing
 
 
-def db_table_to_csv(query, filename):
+# Use Config class to access ENVs
+EXPORT_CHUNK_SIZE = Config.EXPORT_CHUNK_SIZE
+EXPORT_GZIP = Config.EXPORT_GZIP
+
+
+def open_export_file(path, compress=EXPORT_GZIP):
+    """
+    Opens an export file for writing text, gzip-compressed when compress is set.
+    """
+    if compress:
+        return gzip.open(path, 'wt', newline='', compresslevel=6)
+
+    return open(path, mode='w', newline='')
+
+
+def export_path(output_file, compress=EXPORT_GZIP):
     """
-    Exports a database table query result to a CSV file.
+    Returns the path an export is actually written to, with a .gz suffix when compress is set.
     """
+    if compress and not output_file.endswith('.gz'):
+        return f"{output_file}.gz"
+
+    return output_file
+
+
+def write_query_to_csv(query, output_file, header, chunk_size=EXPORT_CHUNK_SIZE, compress=EXPORT_GZIP):
+    """
+    Streams the rows of a query into a CSV file and returns the number of rows written.
+    Rows are read with yield_per (a server-side cursor where the database supports one) and
+    written chunk_size at a time, so memory stays constant however large the result is.
+    The file is written under a temporary name and only moved into place once complete;
+    an empty result writes no file.
+    """
+    output_file = export_path(output_file, compress)
+    partial_file = f"{output_file}.part"
+    row_count = 0
+
     try:
-        # Fetch all records
-        records = query.all()
+        with open_export_file(partial_file, compress) as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+
+            rows = iter(query.yield_per(chunk_size))
+
+            while chunk := list(islice(rows, chunk_size)):
+                writer.writerows(chunk)
+                row_count += len(chunk)
+
+        if row_count:
+            os.replace(partial_file, output_file)
+
+    finally:
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+
+    return row_count
 
-        if not records:
-            logging.warning(f"No data found for {filename}.")
-            return
 
+def db_table_to_csv(query, filename):
+    """
+    Exports a database table query result to a CSV file, streaming it in chunks.
+    """
+    try:
         # Create CSV directory if it doesn't exist
         csv_dir = 'csv_exports'
         os.makedirs(csv_dir, exist_ok=True)
 
         # Define the CSV file path
-        csv_file_path = os.path.join(csv_dir, f"{filename}.csv")
+        csv_file_path = export_path(os.path.join(csv_dir, f"{filename}.csv"))
 
-        # Write to CSV file
-        with open(csv_file_path, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(records[0].__table__.columns.keys())  # Write header
+        #* Select plain column tuples instead of ORM objects, in table column order
+        columns = query.column_descriptions[0]['entity'].__table__.columns
+        record_count = write_query_to_csv(query.with_entities(*columns), csv_file_path, columns.keys())
 
-            for record in records:
-                writer.writerow([getattr(record, col) for col in record.__table__.columns.keys()])
+        if not record_count:
+            logging.warning(f"No data found for {filename}, no CSV file written.")
+            return
 
-        logging.info(f"{filename}.csv has been created with {len(records)} records.")
+        logging.info(f"{csv_file_path} has been created with {record_count} records.")
 
     except Exception as e:
         logging.error(f"Failed to export {filename} to CSV: {e}")
@@ -46,4 +99,4 @@ def export_tables_to_csv():
         # db_table_to_csv(session.query(JobSearch), 'JobSearch')
         db_table_to_csv(session.query(JobListing), 'JobListing')
 
-    logging.info("All tables have been exported to CSV.")
\ No newline at end of file
+    logging.info("All tables have been exported to CSV.")
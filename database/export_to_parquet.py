@@ -0,0 +1,158 @@
+import os
+import json
+import shutil
+from itertools import islice
+from database import get_session
+from config import logging, Config
+from sqlalchemy import Integer, DateTime, JSON
+from database.models import JobSearch, JobListing
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for columnar exports
+    pa = pq = None
+
+
+# Use Config class to access ENVs
+EXPORT_CHUNK_SIZE = Config.EXPORT_CHUNK_SIZE
+COLUMNAR_EXPORT_FORMAT = Config.COLUMNAR_EXPORT_FORMAT
+COLUMNAR_EXPORT_COMPRESSION = Config.COLUMNAR_EXPORT_COMPRESSION
+
+# Low-cardinality text columns stored once per distinct value
+DICTIONARY_COLUMNS = ('company', 'location', 'job_type')
+
+# Partition directory for rows without a date_scraped, as Hive-style readers expect
+DEFAULT_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+FILE_EXTENSIONS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+
+def _arrow_schema(table, dictionary_columns=DICTIONARY_COLUMNS):
+    """
+    Maps the columns of a table to an Arrow schema. JSON columns are stored as JSON text.
+    """
+    fields = []
+
+    for column in table.columns:
+        if isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp('us')
+        elif column.name in dictionary_columns:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            arrow_type = pa.string()
+
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable or column.primary_key))
+
+    return pa.schema(fields)
+
+
+def _open_writer(path, schema, export_format, compression):
+    if export_format == 'arrow':
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        return pa.ipc.new_file(path, schema, options=options)
+
+    return pq.ParquetWriter(path, schema, compression=compression, use_dictionary=list(DICTIONARY_COLUMNS))
+
+
+def _record_batch(rows, schema, json_columns):
+    """
+    Builds an Arrow record batch from row tuples ordered like the schema.
+    """
+    columns = list(zip(*rows))
+
+    for index in json_columns:
+        columns[index] = [json.dumps(value) if value is not None else None for value in columns[index]]
+
+    return pa.record_batch(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def export_table_to_columnar(model, output_dir='columnar_exports', export_format=COLUMNAR_EXPORT_FORMAT,
+                             compression=COLUMNAR_EXPORT_COMPRESSION, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Exports a table to Parquet (or Arrow IPC) files partitioned by the day of date_scraped:
+    <output_dir>/<table>/date_scraped_day=YYYY-MM-DD/part-0.parquet.
+    Rows are streamed with yield_per and written as one record batch per chunk and day,
+    so memory stays bounded by chunk_size. The previous export of the table is replaced
+    only once the new one is complete. Returns the number of rows written.
+    """
+    if pa is None:
+        raise ImportError("Columnar exports need pyarrow: pip install pyarrow")
+
+    if export_format not in FILE_EXTENSIONS:
+        raise ValueError(f"Unknown columnar export format {export_format!r}, expected one of {list(FILE_EXTENSIONS)}")
+
+    table = model.__table__
+    columns = list(table.columns)
+    #! Arrow IPC files allow one dictionary per column, but every record batch builds its own,
+    #! so dictionary columns are written as plain strings there (Parquet encodes them per row group)
+    schema = _arrow_schema(table, DICTIONARY_COLUMNS if export_format == 'parquet' else ())
+    json_columns = [index for index, column in enumerate(columns) if isinstance(column.type, JSON)]
+    date_index = columns.index(table.c.date_scraped)
+
+    table_dir = os.path.join(output_dir, table.name)
+    partial_dir = f"{table_dir}.part"
+    shutil.rmtree(partial_dir, ignore_errors=True)
+
+    writers = {}
+    row_count = 0
+
+    try:
+        with get_session() as session:
+            rows = iter(session.query(*columns).order_by(table.c.id).yield_per(chunk_size))
+
+            while chunk := list(islice(rows, chunk_size)):
+                partitions = {}
+
+                for row in chunk:
+                    date_scraped = row[date_index]
+                    day = date_scraped.date().isoformat() if date_scraped else DEFAULT_PARTITION
+                    partitions.setdefault(day, []).append(row)
+
+                for day, day_rows in partitions.items():
+                    writer = writers.get(day)
+
+                    if writer is None:
+                        partition_dir = os.path.join(partial_dir, f"date_scraped_day={day}")
+                        os.makedirs(partition_dir, exist_ok=True)
+
+                        path = os.path.join(partition_dir, f"part-0.{FILE_EXTENSIONS[export_format]}")
+                        writer = writers[day] = _open_writer(path, schema, export_format, compression)
+
+                    writer.write_batch(_record_batch(day_rows, schema, json_columns))
+
+                row_count += len(chunk)
+
+    except Exception:
+        for writer in writers.values():
+            writer.close()
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        raise
+
+    for writer in writers.values():
+        writer.close()
+
+    shutil.rmtree(table_dir, ignore_errors=True)
+    if writers:
+        os.replace(partial_dir, table_dir)
+
+    logging.info(f"Exported {row_count} {table.name} rows to {len(writers)} {export_format} partitions in {table_dir}")
+    return row_count
+
+
+def export_tables_to_columnar(output_dir='columnar_exports', export_format=COLUMNAR_EXPORT_FORMAT):
+    """
+    Exports the JobSearch and JobListing tables to partitioned Parquet (or Arrow IPC) files.
+    """
+    for model in (JobSearch, JobListing):
+        try:
+            export_table_to_columnar(model, output_dir, export_format)
+        except Exception as e:
+            logging.error(f"Failed to export {model.__tablename__} to {export_format}: {e}")
+
+    logging.info(f"All tables have been exported to {export_format}.")
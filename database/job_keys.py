@@ -0,0 +1,71 @@
+import threading
+from config import logging
+from database import get_session
+from database.models import JobListing
+
+
+class SeenJobKeys:
+    """
+    In-memory set of the job keys already stored, consulted before job cards are inserted
+    so a job found again under another title or page is neither stored nor detail-scraped twice.
+    The set is loaded from the job_key column on first use; the unique index on that column
+    still guards against other processes writing to the same database.
+    """
+
+    def __init__(self):
+        self._keys = None
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def _load(self):
+        with get_session() as session:
+            rows = session.query(JobListing.job_key).filter(JobListing.job_key.isnot(None)).yield_per(10000)
+            self._keys = {job_key for (job_key,) in rows}
+
+        logging.info(f"Loaded {len(self._keys)} known job keys")
+
+    def claim(self, job_key: str) -> bool:
+        """
+        Returns True and records the key if it has not been seen yet; counts a duplicate otherwise.
+        """
+        with self._lock:
+            if self._keys is None:
+                self._load()
+
+            if job_key in self._keys:
+                self.duplicates += 1
+                return False
+
+            self._keys.add(job_key)
+            return True
+
+    def release(self, job_keys):
+        """
+        Forgets claimed keys whose listings could not be stored, so a retry can store them.
+        """
+        with self._lock:
+            if self._keys is not None:
+                self._keys.difference_update(job_keys)
+
+    def log_stats(self):
+        logging.info(
+            f"Deduplication skipped {self.duplicates} job cards already stored, "
+            f"saving {self.duplicates} ScraperAPI detail requests"
+        )
+
+
+_seen_job_keys = SeenJobKeys()
+
+
+def get_seen_job_keys() -> SeenJobKeys:
+    """
+    Returns the job key set shared by all workers of this process.
+    """
+    return _seen_job_keys
+
+
+def log_dedup_stats():
+    """
+    Logs how many duplicate job cards (and detail requests) deduplication saved in this run.
+    """
+    _seen_job_keys.log_stats()
@@ -0,0 +1,171 @@
+import argparse
+from database import engine, init_database
+from config import Config, logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, delete, update, func
+from database.models import JobSearch, JobListing, SCRAPE_DUPLICATE
+
+
+# Use Config class to access ENVs
+MAINTENANCE_BATCH_SIZE = Config.MAINTENANCE_BATCH_SIZE
+STALE_LISTING_DAYS = Config.STALE_LISTING_DAYS
+
+
+def count_matching(model, condition) -> int:
+    """
+    Counts the rows of a table matching a condition with a single SELECT count(*).
+    """
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(model).where(condition)).scalar_one()
+
+
+def _batch_ids(model, condition, batch_size):
+    """
+    Subquery selecting the ids of the next batch of matching rows.
+    """
+    return select(model.id).where(condition).order_by(model.id).limit(batch_size).scalar_subquery()
+
+
+def batched_delete(model, condition, description, batch_size=MAINTENANCE_BATCH_SIZE, dry_run=False) -> int:
+    """
+    Deletes the rows matching a condition with one DELETE ... WHERE id IN (SELECT ... LIMIT batch_size)
+    per batch, committing after each batch so locks and transactions stay short.
+    No rows are loaded into Python. Returns the number of rows deleted, or that would be with dry_run.
+    """
+    if dry_run:
+        record_count = count_matching(model, condition)
+        logging.info(f"Dry run: would delete {record_count} {description} from {model.__tablename__} table.")
+        return record_count
+
+    record_count = 0
+
+    while True:
+        with engine.begin() as connection:
+            deleted = connection.execute(
+                delete(model).where(model.id.in_(_batch_ids(model, condition, batch_size)))
+            ).rowcount
+
+        record_count += deleted
+        if deleted < batch_size:
+            break
+
+        logging.info(f"Deleted {record_count} {description} from {model.__tablename__} table so far")
+
+    if record_count:
+        logging.info(f"Deleted {record_count} {description} from {model.__tablename__} table.")
+    else:
+        logging.info(f"No {description} found in {model.__tablename__} table.")
+
+    return record_count
+
+
+def batched_update(model, condition, values, description, batch_size=MAINTENANCE_BATCH_SIZE, dry_run=False) -> int:
+    """
+    Applies values to the rows matching a condition in batches of batch_size, like batched_delete.
+    The condition must stop matching once values are applied, or the loop would never end.
+    Returns the number of rows updated, or that would be with dry_run.
+    """
+    if dry_run:
+        record_count = count_matching(model, condition)
+        logging.info(f"Dry run: would update {record_count} {description} in {model.__tablename__} table.")
+        return record_count
+
+    record_count = 0
+
+    while True:
+        with engine.begin() as connection:
+            updated = connection.execute(
+                update(model).where(model.id.in_(_batch_ids(model, condition, batch_size))).values(values)
+            ).rowcount
+
+        record_count += updated
+        if updated < batch_size:
+            break
+
+    logging.info(f"Updated {record_count} {description} in {model.__tablename__} table.")
+    return record_count
+
+
+def delete_zero_page_searches(batch_size=MAINTENANCE_BATCH_SIZE, dry_run=False) -> int:
+    """
+    Deletes all records from the JobSearch table where the last_page_number is 0.
+    """
+    return batched_delete(
+        JobSearch, JobSearch.last_page_number == 0, "records with last_page_number = 0", batch_size, dry_run
+    )
+
+
+def delete_na_job_titles(batch_size=MAINTENANCE_BATCH_SIZE, dry_run=False) -> int:
+    """
+    Deletes all records from the JobListing table where job_title is 'N/A'.
+    """
+    return batched_delete(
+        JobListing, JobListing.job_title == 'N/A', "records with job_title = 'N/A'", batch_size, dry_run
+    )
+
+
+def prune_stale_listings(days=STALE_LISTING_DAYS, batch_size=MAINTENANCE_BATCH_SIZE, dry_run=False) -> int:
+    """
+    Deletes job listings scraped more than the given number of days ago.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+    return batched_delete(
+        JobListing, JobListing.date_scraped < cutoff, f"job listings older than {days} days", batch_size, dry_run
+    )
+
+
+def collapse_duplicate_listings(batch_size=MAINTENANCE_BATCH_SIZE, dry_run=False) -> int:
+    """
+    Deletes the job listings marked as duplicates of an earlier listing with the same job key.
+    Keyless listings are kept: their links cannot tell jobs apart (cards that failed to parse all
+    share the 'N/A' link), so matching them on job_link would delete distinct jobs.
+    """
+    return batched_delete(
+        JobListing, JobListing.scrape_status == SCRAPE_DUPLICATE, "duplicate job listings", batch_size, dry_run
+    )
+
+
+def count_unique_companies() -> int:
+    """
+    Counts the distinct company names in the JobListing table with a single SELECT count(DISTINCT company).
+    """
+    with engine.connect() as connection:
+        unique_companies_count = connection.execute(
+            select(func.count(JobListing.company.distinct()))
+        ).scalar_one()
+
+    logging.info(f"Total number of unique companies: {unique_companies_count}")
+    return unique_companies_count
+
+
+# Operations available from the command line: python -m database.maintenance <operation>
+OPERATIONS = {
+    'zero-page-searches': delete_zero_page_searches,
+    'na-job-titles': delete_na_job_titles,
+    'stale-listings': prune_stale_listings,
+    'duplicate-listings': collapse_duplicate_listings,
+    'unique-companies': count_unique_companies,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Set-based maintenance of the job scraper database.")
+    parser.add_argument('operation', choices=list(OPERATIONS))
+    parser.add_argument('--dry-run', action='store_true', help="only count the rows that would change")
+    parser.add_argument('--batch-size', type=int, default=MAINTENANCE_BATCH_SIZE, help="rows per DELETE/UPDATE statement")
+    parser.add_argument('--days', type=int, default=STALE_LISTING_DAYS, help="age in days of stale listings")
+    args = parser.parse_args(argv)
+    init_database()
+
+    if args.operation == 'unique-companies':
+        return count_unique_companies()
+
+    if args.operation == 'stale-listings':
+        return prune_stale_listings(args.days, args.batch_size, args.dry_run)
+
+    return OPERATIONS[args.operation](args.batch_size, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+from config import logging
+from sqlalchemy import inspect, text, bindparam
+from scraper_utils.html_parser import job_key_from_link
+from .models import Base, SCRAPE_DONE, SCRAPE_DUPLICATE
+
+
+def backfill_job_keys(connection, batch_size=10000):
+    """
+    Sets the job key of existing listings from their job links. The first listing of every key
+    keeps it; later listings with the same key are marked as duplicates and keep a NULL key,
+    so the unique index can be created and they are never detail-scraped.
+    """
+    seen_job_keys = set()
+    last_id = 0
+    duplicates = 0
+
+    set_job_key = text("UPDATE job_listing SET job_key = :job_key WHERE id = :row_id")
+    mark_duplicate = text(f"UPDATE job_listing SET scrape_status = '{SCRAPE_DUPLICATE}' WHERE id = :row_id")
+
+    while True:
+        rows = connection.execute(
+            text("SELECT id, job_link FROM job_listing WHERE id > :last_id ORDER BY id LIMIT :batch_size")
+            .bindparams(bindparam("last_id"), bindparam("batch_size")),
+            {"last_id": last_id, "batch_size": batch_size},
+        ).fetchall()
+
+        if not rows:
+            break
+
+        keyed, duplicated = [], []
+
+        for row_id, job_link in rows:
+            job_key = job_key_from_link(job_link)
+
+            if job_key is None:
+                continue
+
+            if job_key in seen_job_keys:
+                duplicated.append({"row_id": row_id})
+            else:
+                seen_job_keys.add(job_key)
+                keyed.append({"job_key": job_key, "row_id": row_id})
+
+        if keyed:
+            connection.execute(set_job_key, keyed)
+        if duplicated:
+            connection.execute(mark_duplicate, duplicated)
+
+        duplicates += len(duplicated)
+        last_id = rows[-1][0]
+
+    logging.warning(f"Backfilled {len(seen_job_keys)} job keys, marked {duplicates} duplicate job listings")
+
+
+# Run once, after the column they depend on has been added to an existing table:
+# SQL statements, or functions called with the migration's connection.
+# Backfills may touch any model column, so they run once all missing columns exist
+BACKFILLS = {
+    ('job_listing', 'scrape_status'): [
+        # Listings enriched before scrape state existed must not be scraped again; the job key
+        # backfill runs first (job_key is declared first) and its duplicates stay marked
+        f"UPDATE job_listing SET scrape_status = '{SCRAPE_DONE}' "
+        f"WHERE apply_now_link IS NOT NULL AND scrape_status != '{SCRAPE_DUPLICATE}'",
+    ],
+    ('job_listing', 'job_key'): [
+        backfill_job_keys,
+    ],
+}
+
+
+def add_missing_columns(engine):
+    """
+    Adds model columns that are missing from existing tables.
+    Base.metadata.create_all only creates missing tables, so new columns on
+    job_search/job_listing are added here with ALTER TABLE and then backfilled.
+    """
+    inspector = inspect(engine)
+    existing_tables = inspector.get_table_names()
+    added_columns = []
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                column_type = column.type.compile(dialect=engine.dialect)
+                statement = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+
+                if column.server_default is not None:
+                    statement += f" DEFAULT '{column.server_default.arg}'"
+                if not column.nullable:
+                    statement += " NOT NULL"
+
+                connection.execute(text(statement))
+                added_columns.append((table.name, column.name))
+                logging.warning(f"Added column {table.name}.{column.name}")
+
+        #! job_key is declared before scrape_status, but its backfill marks duplicates through it
+        for added_column in added_columns:
+            for backfill in BACKFILLS.get(added_column, []):
+                if callable(backfill):
+                    backfill(connection)
+                else:
+                    connection.execute(text(backfill))
+
+
+def create_missing_indexes(engine):
+    """
+    Creates model indexes that are missing from existing tables, after their columns
+    have been added and backfilled.
+    """
+    inspector = inspect(engine)
+    existing_tables = inspector.get_table_names()
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+
+                index.create(bind=connection)
+                logging.warning(f"Created index {index.name} on {table.name}")
+
+
+def run_migrations(engine):
+    """
+    Brings an existing database up to date with the models.
+    """
+    add_missing_columns(engine)
+    create_missing_indexes(engine)
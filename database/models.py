@@ -1,10 +1,19 @@
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Text, Index
 
 Base = declarative_base()
 
+# Detail scraping states of a JobListing
+SCRAPE_PENDING = 'pending'
+SCRAPE_IN_PROGRESS = 'in_progress'
+SCRAPE_DONE = 'done'
+SCRAPE_FAILED = 'failed'
+SCRAPE_DUPLICATE = 'duplicate'  # Same job key as an earlier listing; never detail-scraped
+SCRAPE_STATUSES = (SCRAPE_PENDING, SCRAPE_IN_PROGRESS, SCRAPE_DONE, SCRAPE_FAILED, SCRAPE_DUPLICATE)
+OUTSTANDING_STATUSES = (SCRAPE_PENDING, SCRAPE_FAILED)  # States the detail phase may still pick up
+
 class JobSearch(Base):
     __tablename__ = 'job_search'
     
@@ -18,6 +27,11 @@ class JobSearch(Base):
     # Relationship to JobListing
     job_listings = relationship("JobListing", back_populates="job_search")
 
+    __table_args__ = (
+        # Partial index: only the few searches the cleanup deletes are indexed
+        Index('ix_job_search_zero_pages', 'id', postgresql_where=last_page_number == 0, sqlite_where=last_page_number == 0),
+    )
+
 
 class JobListing(Base):
     __tablename__ = 'job_listing'
@@ -31,12 +45,39 @@ class JobListing(Base):
     location = Column(String, nullable=True)
     posted_date = Column(String, nullable=True)  # May not always be a datetime
     job_link = Column(String, nullable=False)
+    job_key = Column(String, nullable=True)  # Indeed's jk parameter; the same job found again is not stored twice
 
     # New fields
     stars = Column(String, nullable=True)  # Store rating as string
     job_type = Column(String, nullable=True)
     full_description = Column(Text, nullable=True)  # Use Text for long descriptions
     apply_now_link = Column(String, nullable=True)
+
+    # Detail scraping state, so interrupted runs resume with outstanding listings only
+    scrape_status = Column(String, nullable=False, default=SCRAPE_PENDING, server_default=SCRAPE_PENDING)
+    scrape_attempts = Column(Integer, nullable=False, default=0, server_default='0')
+    scrape_error = Column(Text, nullable=True)
+    scrape_updated_at = Column(DateTime, nullable=True)
     
     # Relationship back to JobSearch
-    job_search = relationship("JobSearch", back_populates="job_listings")
\ No newline at end of file
+    job_search = relationship("JobSearch", back_populates="job_listings")
+
+    __table_args__ = (
+        Index('ix_job_listing_job_key', 'job_key', unique=True),
+        Index('ix_job_listing_job_search_id', 'job_search_id'),
+        Index('ix_job_listing_company', 'company'),  # Job counts by company
+        Index('ix_job_listing_date_scraped', 'date_scraped'),  # Stale listing pruning
+        Index('ix_job_listing_scrape_status', 'scrape_status', 'id'),  # Scrape progress counts and requeues
+        # Partial indexes: listings not yet enriched (claimed in id order by the detail phase)
+        # and listings without a title (cleanup)
+        Index('ix_job_listing_outstanding', 'id',
+              postgresql_where=scrape_status.in_(OUTSTANDING_STATUSES), sqlite_where=scrape_status.in_(OUTSTANDING_STATUSES)),
+        Index('ix_job_listing_na_title', 'id', postgresql_where=job_title == 'N/A', sqlite_where=job_title == 'N/A'),
+    )
+
+class CompanyAlias(Base):
+    __tablename__ = 'company_alias'
+
+    # Company name as scraped, and the name its variants are grouped and enriched under
+    company = Column(String, primary_key=True)
+    canonical_company = Column(String, nullable=False, index=True)
@@ -0,0 +1,85 @@
+import time
+import threading
+from config import logging
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+# Checkouts waiting longer than this count as having waited for a free connection
+WAIT_THRESHOLD = 0.001
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long every checkout waited for a connection, so a pool
+    too small for the number of workers shows up in the logs instead of as slow phases.
+    Time spent opening new connections is recorded separately and not counted as waiting.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkout = threading.local()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self.peak_checked_out = 0
+
+    def _create_connection(self):
+        start_time = time.perf_counter()
+
+        try:
+            return super()._create_connection()
+        finally:
+            self._checkout.connect_seconds += time.perf_counter() - start_time
+
+    def _do_get(self):
+        self._checkout.connect_seconds = 0.0
+        start_time = time.perf_counter()
+
+        try:
+            connection = super()._do_get()
+
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+
+        connect_seconds = self._checkout.connect_seconds
+        waited = time.perf_counter() - start_time - connect_seconds
+
+        with self._stats_lock:
+            self.checkouts += 1
+            if connect_seconds:
+                self.connects += 1
+                self.connect_seconds += connect_seconds
+            self.wait_seconds += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+            if waited > WAIT_THRESHOLD:
+                self.waits += 1
+
+        return connection
+
+    def log_stats(self):
+        """
+        Logs checkout and wait-time statistics; warns when workers waited on the pool.
+        """
+        with self._stats_lock:
+            average_wait = self.wait_seconds / self.checkouts * 1000 if self.checkouts else 0.0
+            average_connect = self.connect_seconds / self.connects * 1000 if self.connects else 0.0
+            message = (
+                f"DB pool: {self.checkouts} checkouts, {self.waits} waited over {WAIT_THRESHOLD * 1000:.0f} ms "
+                f"(avg {average_wait:.1f} ms, max {self.max_wait * 1000:.1f} ms), {self.timeouts} timeouts, "
+                f"{self.connects} new connections (avg {average_connect:.1f} ms to connect), "
+                f"peak {self.peak_checked_out} of {self.size()} + {self._max_overflow} overflow connections"
+            )
+
+        if self.timeouts or self.max_wait > 1:
+            logging.warning(f"{message}; raise DB_POOL_SIZE or DB_MAX_OVERFLOW")
+        else:
+            logging.info(message)
@@ -1,4 +1,4 @@
-from typing import TypedDict
+from typing import NamedTuple, TypedDict
 
 
 class EnrichedData(TypedDict):
@@ -17,4 +17,10 @@ class ApolloPayload(TypedDict):
     departments: list
     page: int
     per_page: int
-    q_keywords: str
\ No newline at end of file
+    q_keywords: str
+
+
+class JobListingRef(NamedTuple):
+    # Lightweight handle on a stored listing: all the detail phase needs is the id and the link
+    id: int
+    job_link: str
\ No newline at end of file
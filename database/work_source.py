@@ -0,0 +1,190 @@
+import asyncio
+from sqlalchemy import func, or_, and_, bindparam
+from config import Config, logging
+from database import get_session
+from datetime import datetime, timezone
+from database.types import JobListingRef
+from database.batch_writer import Increment, apply_update
+from database.models import (
+    JobListing, SCRAPE_PENDING, SCRAPE_IN_PROGRESS, SCRAPE_DONE, SCRAPE_FAILED, SCRAPE_DUPLICATE, SCRAPE_STATUSES,
+    OUTSTANDING_STATUSES
+)
+
+
+# Use Config class to access ENVs
+WORK_BATCH_SIZE = Config.WORK_BATCH_SIZE
+MAX_SCRAPE_ATTEMPTS = Config.MAX_SCRAPE_ATTEMPTS
+
+
+def outstanding_job_listing_filter():
+    """
+    Listings that still need their details scraped: never attempted, or failed
+    without using up MAX_SCRAPE_ATTEMPTS across runs.
+    The redundant status IN term lets the planner use the ix_job_listing_outstanding partial index;
+    its values are rendered inline because SQLite only matches partial indexes against literals.
+    """
+    outstanding_statuses = bindparam('outstanding_statuses', list(OUTSTANDING_STATUSES), expanding=True, literal_execute=True)
+
+    return and_(
+        JobListing.scrape_status.in_(outstanding_statuses),
+        or_(
+            JobListing.scrape_status == SCRAPE_PENDING,
+            and_(JobListing.scrape_status == SCRAPE_FAILED, JobListing.scrape_attempts < MAX_SCRAPE_ATTEMPTS),
+        ),
+    )
+
+
+def reset_interrupted_job_listings() -> int:
+    """
+    Returns listings left in progress by an interrupted run to the pending state.
+    """
+    with get_session() as session:
+        reset_count = (
+            session.query(JobListing)
+            .filter(JobListing.scrape_status == SCRAPE_IN_PROGRESS)
+            .update({JobListing.scrape_status: SCRAPE_PENDING}, synchronize_session=False)
+        )
+        session.commit()
+
+    if reset_count:
+        logging.warning(f"Resuming {reset_count} job listings interrupted in a previous run")
+
+    return reset_count
+
+
+def fetch_job_listing_batch(after_id: int, batch_size: int = WORK_BATCH_SIZE) -> list:
+    """
+    Claims the next keyset page of outstanding job listings with an id greater than after_id.
+    Only id and job_link are selected, so descriptions are never loaded; the claimed rows
+    are marked in progress in a single UPDATE.
+    """
+    with get_session() as session:
+        rows = (
+            session.query(JobListing.id, JobListing.job_link)
+            .filter(JobListing.id > after_id, outstanding_job_listing_filter())
+            .order_by(JobListing.id)
+            .limit(batch_size)
+            .all()
+        )
+
+        if rows:
+            (
+                session.query(JobListing)
+                .filter(JobListing.id.in_([row.id for row in rows]))
+                .update({JobListing.scrape_status: SCRAPE_IN_PROGRESS}, synchronize_session=False)
+            )
+            session.commit()
+
+    return [JobListingRef(row.id, row.job_link) for row in rows]
+
+
+def iter_job_listing_refs(batch_size: int = WORK_BATCH_SIZE):
+    """
+    Streams every outstanding job listing as a JobListingRef, one keyset page at a time.
+    Memory stays bounded by batch_size however large the table grows.
+    """
+    last_id = 0
+
+    while True:
+        batch = fetch_job_listing_batch(last_id, batch_size)
+
+        if not batch:
+            return
+
+        yield from batch
+        last_id = batch[-1].id
+
+
+async def iter_job_listing_refs_async(batch_size: int = WORK_BATCH_SIZE):
+    """
+    Asyncio counterpart of iter_job_listing_refs; each page is queried off the event loop.
+    """
+    last_id = 0
+
+    while True:
+        batch = await asyncio.to_thread(fetch_job_listing_batch, last_id, batch_size)
+
+        if not batch:
+            return
+
+        for job_listing in batch:
+            yield job_listing
+
+        last_id = batch[-1].id
+
+
+def mark_job_listing_failed(job_id: int, attempts: int, error: str, writer=None):
+    """
+    Records a failed detail scrape, adding the attempts made to the listing's running total.
+    """
+    values = {
+        'scrape_status': SCRAPE_FAILED,
+        'scrape_attempts': Increment(attempts),
+        'scrape_error': error,
+        'scrape_updated_at': datetime.now(timezone.utc),
+    }
+
+    if writer:
+        writer.update(JobListing, job_id, values)
+    else:
+        apply_update(JobListing, job_id, values)
+
+
+def release_job_listing(job_id: int, writer=None):
+    """
+    Returns a claimed listing to the pending state without counting an attempt.
+    """
+    values = {'scrape_status': SCRAPE_PENDING}
+
+    if writer:
+        writer.update(JobListing, job_id, values)
+    else:
+        apply_update(JobListing, job_id, values)
+
+
+def requeue_job_listings(statuses=(SCRAPE_DONE, SCRAPE_FAILED)) -> int:
+    """
+    Puts listings back in the pending state so the detail phase processes them again,
+    e.g. to re-run extraction from the response cache in offline mode after a selector change.
+    """
+    with get_session() as session:
+        requeued_count = (
+            session.query(JobListing)
+            .filter(JobListing.scrape_status.in_(statuses))
+            .update({JobListing.scrape_status: SCRAPE_PENDING}, synchronize_session=False)
+        )
+        session.commit()
+
+    logging.info(f"Requeued {requeued_count} job listings for detail scraping")
+    return requeued_count
+
+
+def scrape_progress() -> dict:
+    """
+    Counts job listings per scrape status.
+    """
+    with get_session() as session:
+        rows = (
+            session.query(JobListing.scrape_status, func.count(JobListing.id))
+            .group_by(JobListing.scrape_status)
+            .all()
+        )
+
+    progress = {status: 0 for status in SCRAPE_STATUSES}
+    progress.update(dict(rows))
+    return progress
+
+
+def log_scrape_progress():
+    """
+    Logs detail scraping progress from the persisted scrape state.
+    """
+    progress = scrape_progress()
+    total = sum(progress.values())
+    done_rate = (progress[SCRAPE_DONE] / total) * 100 if total > 0 else 0
+
+    logging.info(
+        f"Job listings: {total}, done: {progress[SCRAPE_DONE]} ({done_rate:.2f}%), "
+        f"pending: {progress[SCRAPE_PENDING]}, in progress: {progress[SCRAPE_IN_PROGRESS]}, "
+        f"failed: {progress[SCRAPE_FAILED]}, duplicates: {progress[SCRAPE_DUPLICATE]}"
+    )
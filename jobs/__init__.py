@@ -1,3 +1,3 @@
-from .job_cleaner import clean_job_titles
-from .job_scraper import scrape_jobs_from_page, scrape_job_details
-from .link_generator import read_job_titles, generate_url, store_generated_urls, generate_pagination_links, store_pagination_links
\ No newline at end of file
+from .job_cleaner import clean_job_titles, canonical_job_title, near_duplicate_key
+from .job_scraper import scrape_jobs_from_page, scrape_job_details, scrape_jobs_from_page_async, scrape_job_details_async, scrape_search_page, scrape_search_page_async
+from .link_generator import read_job_titles, generate_url, store_generated_urls, generate_page_url, generate_pagination_links, last_page_from_job_count, store_pagination_links
\ No newline at end of file
@@ -2,15 +2,79 @@ import re
 from config import logging
 
 
-def clean_job_titles(input_file, output_file):
-
-    #* Open the input file for reading and the output file for writing
-    with open(input_file, 'r') as infile, open(output_file, 'w') as outfile:
-        for line in infile:
-            #! Use regex to remove text within parentheses
-            cleaned_line = re.sub(r'\s*\(.*?\)\s*', ' ', line).strip()
-            
-            #? Write the cleaned line to the output file
-            outfile.write(cleaned_line + '\n')
-
-    logging.warning(f"Cleaned job titles have been written to '{output_file}'.")
\ No newline at end of file
+# Text within parentheses, e.g. "General Practitioner (GP)"; it never spans lines
+_PARENTHESES = re.compile(r'[ \t]*\([^()\n]*\)[ \t]*')
+_WHITESPACE = re.compile(r'\s+')
+
+# Differences that do not make two titles different searches
+_NON_ALPHANUMERIC = re.compile(r'[\W_]+')  # "Audio-Visual", "Clean Room", "Workers' / Workers’"
+_PLURAL = re.compile(r"(?<=\w\w)s\b")  # "Contracts Manager", "Events Coordinator"
+_SPELLING = [
+    (re.compile(r'ae'), 'e'),  # "Paediatrician", "Anaesthetist"
+    (re.compile(r'our\b'), 'or'),  # "Behaviour", "Labour"
+    (re.compile(r'is(e|ed|ing|ation)\b'), r'iz\1'),  # "Organisation", "Specialised"
+    (re.compile(r'(\w)\1'), r'\1'),  # "Counsellor", "Modelling"
+]
+
+
+def canonical_job_title(title):
+    """
+    Form of a job title exact duplicates share: casefolded with collapsed whitespace.
+    """
+    return _WHITESPACE.sub(' ', title).strip().casefold()
+
+
+def near_duplicate_key(title):
+    """
+    Form of a job title its near-duplicates share: singular words, British spellings
+    and doubled letters folded, without spaces or punctuation ("Cabinet Makers" and "cabinetmaker").
+    """
+    key = _PLURAL.sub('', canonical_job_title(title))
+
+    for pattern, replacement in _SPELLING:
+        key = pattern.sub(replacement, key)
+
+    return _NON_ALPHANUMERIC.sub('', key)
+
+
+def clean_job_titles(input_file, output_file=None):
+    """
+    Reads the target job titles, removes text within parentheses and drops exact
+    (case and whitespace insensitive) and near-duplicate titles, keeping the first one.
+
+    Parameters:
+    - input_file: str, the path of the job titles, one per line.
+    - output_file: str, optional path to also write the cleaned titles to.
+
+    Returns:
+    - list of cleaned job titles, ready for store_generated_urls.
+    """
+
+    #* The whole file is cleaned with one pass of the precompiled pattern instead of line by line
+    with open(input_file, 'r') as infile:
+        lines = [line for line in _PARENTHESES.sub(' ', infile.read()).splitlines() if line.strip()]
+
+    titles = {}
+    for line in lines:
+        title = _WHITESPACE.sub(' ', line).strip()
+        titles.setdefault(canonical_job_title(title), title)
+
+    #? Near-duplicates are matched by key, so the whole list is deduplicated in one pass
+    job_titles = {}
+    for title in titles.values():
+        job_titles.setdefault(near_duplicate_key(title), title)
+
+    job_titles = list(job_titles.values())
+
+    logging.warning(
+        f"Cleaned {len(job_titles)} job titles: removed {len(lines) - len(titles)} duplicate "
+        f"and {len(titles) - len(job_titles)} near-duplicate searches"
+    )
+
+    if output_file:
+        with open(output_file, 'w') as outfile:
+            outfile.writelines(f"{title}\n" for title in job_titles)
+
+        logging.warning(f"Cleaned job titles have been written to '{output_file}'.")
+
+    return job_titles
@@ -1,127 +1,192 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+from config import logging
 from database import get_session
-from config import logging, Config
-from database.models import JobListing
+from database.models import JobListing, SCRAPE_DONE
+from database.types import JobListingRef
+from sqlalchemy.exc import IntegrityError
+from database.job_keys import get_seen_job_keys
+from database.batch_writer import Increment, apply_update
 from datetime import datetime, timezone
+from scraper_utils.scraper_api import fetch_html
+from scraper_utils.html_parser import parse_job_cards, parse_job_details, parse_search_page, job_key_from_link
+from scraper_utils.parse_pool import parse_in_pool, parse_in_pool_async
 
 
-# Use Config class to access ENVs
-BASE_URL = Config.BASE_URL
-SCRAPER_API_KEY = Config.SCRAPER_API_KEY
-SCRAPER_API_URL = Config.SCRAPER_API_URL
+def store_job_cards(job_cards, page_number, job_search_id):
+    """
+    Stores parsed job cards as new rows in the JobListing table.
+    Cards whose job key is already stored (the same job under another title or page) are skipped,
+    so only new listings are returned as JobListingRef tuples and handed to detail workers.
+    """
+    seen_job_keys = get_seen_job_keys()
+    job_listings = []
+
+    for job_card in job_cards:
+        job_key = job_key_from_link(job_card['job_link'])
+
+        if job_key is not None and not seen_job_keys.claim(job_key):
+            continue  # Duplicate: already stored, its details are scraped once
+
+        job_listings.append(JobListing(
+            job_search_id=job_search_id,
+            date_scraped=datetime.now(timezone.utc),
+            page_number=page_number,
+            job_key=job_key,
+            **job_card
+        ))
+
+    try:
+        with get_session() as session:
+            try:
+                session.add_all(job_listings)
+                session.flush()
+
+                #* Read before the commit expires the listings, which would reload each one with a SELECT
+                job_listing_refs = [JobListingRef(listing.id, listing.job_link) for listing in job_listings]
+                session.commit()
+
+            except IntegrityError:
+                #! Another process stored some of these keys first: insert row by row, skipping those
+                session.rollback()
+                job_listing_refs = _store_job_listings_individually(session, job_listings)
+
+            return job_listing_refs
+
+    except Exception:
+        seen_job_keys.release(listing.job_key for listing in job_listings if listing.job_key)
+        raise
+
+
+def _store_job_listings_individually(session, job_listings):
+    """
+    Inserts listings one savepoint at a time, dropping those whose job key is already stored,
+    and returns the stored ones as JobListingRef tuples.
+    """
+    stored = []
+
+    for listing in job_listings:
+        try:
+            with session.begin_nested():
+                session.add(listing)
+            stored.append(JobListingRef(listing.id, listing.job_link))
+        except IntegrityError:
+            logging.info(f"Job key {listing.job_key} was stored by another process")
+
+    session.commit()
+    return stored
+
+
+def store_job_details(job_id, job_details, attempts=1, writer=None):
+    """
+    Updates an existing JobListing row with the details scraped from its job page
+    and marks its scrape state as done. With a BatchWriter the update is queued
+    and written together with other workers' updates.
+    """
+    values = {
+        **job_details,
+        'scrape_status': SCRAPE_DONE,
+        'scrape_attempts': Increment(attempts),
+        'scrape_error': None,
+        'scrape_updated_at': datetime.now(timezone.utc),
+    }
+
+    if writer:
+        writer.update(JobListing, job_id, values)
+    else:
+        apply_update(JobListing, job_id, values)
 
 
 def scrape_jobs_from_page(page_url, page_number, job_search_id):
     """
     Scrapes job details from a given page URL using ScraperAPI and stores each job in the JobListing table.
+    Returns the stored listings as JobListingRef tuples. Errors are logged and re-raised so the
+    bot manager can retry the page.
     """
     try:
-        # Set up ScraperAPI endpoint and parameters
-        payload = {
-            'api_key': SCRAPER_API_KEY,
-            'url': page_url,
-            # 'country': 'GB'
-        }
-
         # Make request to ScraperAPI
-        response = requests.get(SCRAPER_API_URL, params=payload, timeout=60)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        job_listings = []
-
-        # Find each job card element
-        job_cards = soup.select('li.css-1ac2h1w')  # Each job is within a list element
-
-        for job in job_cards:
-            # Extract job title
-            job_title_element = job.select_one('a.jcs-JobTitle')
-            job_title = job_title_element.get_text(strip=True) if job_title_element else "N/A"
-
-            # Extract company name
-            company_element = job.select_one('span[data-testid="company-name"]')
-            company = company_element.get_text(strip=True) if company_element else "N/A"
-
-            # Extract job location
-            location_element = job.select_one('div[data-testid="text-location"]')
-            location = location_element.get_text(strip=True) if location_element else "N/A"
-
-            # Extract posted date
-            posted_date_element = job.select_one('span[data-testid="myJobsStateDate"]')
-            posted_date = posted_date_element.get_text(strip=True).replace("Posted", "").strip() if posted_date_element else "N/A"
-
-            # Extract job link
-            job_link_element = job_title_element.get("href") if job_title_element else None
-            job_link = f"{BASE_URL}{job_link_element}" if job_link_element else "N/A"
-
-            # Append job data to list
-            job_listings.append(JobListing(
-                job_search_id=job_search_id,
-                date_scraped=datetime.now(timezone.utc),
-                page_number=page_number,
-                job_title=job_title,
-                company=company,
-                location=location,
-                posted_date=posted_date,
-                job_link=job_link
-            ))
-
-        # Store job listings in the database
-        with get_session() as session:
-            session.add_all(job_listings)
-            session.commit()
+        html = fetch_html(page_url, timeout=60)
+
+        # Parse the job cards and store them in the database
+        job_listings = store_job_cards(parse_in_pool(parse_job_cards, html), page_number, job_search_id)
 
         logging.info(f"Scraped {len(job_listings)} jobs from page {page_number} for job search ID {job_search_id}")
+        return job_listings
 
     except Exception as e:
         logging.error(f"Failed to scrape jobs from page {page_number} for job search ID {job_search_id}: {e}")
+        raise
 
 
-def scrape_job_details(job_listing):
+def scrape_search_page(page_url, page_number, job_search_id):
+    """
+    Scrapes and stores the job cards of a search results page like scrape_jobs_from_page, and also
+    returns the page's pagination details (job_count, has_next_page, no_results) from parse_search_page.
+    Errors are raised so the caller can retry.
+    """
+    html = fetch_html(page_url, timeout=60)
+
+    search_page = parse_in_pool(parse_search_page, html)
+    job_listings = store_job_cards(search_page.pop('job_cards'), page_number, job_search_id)
+
+    logging.info(f"Scraped {len(job_listings)} jobs from page {page_number} for job search ID {job_search_id}")
+    return job_listings, search_page
+
+
+def scrape_job_details(job_listing, attempts=1, writer=None):
     """
     Visits an individual job link to scrape additional details like stars, job type,
-    full job description, and apply now link. Retries if a timeout occurs.
+    full job description, and apply now link. Errors are logged and re-raised so the
+    bot manager can retry and record the failure in the listing's scrape state.
     """
     try:
-        # Construct the ScraperAPI request for the job link
-        payload = {
-            'api_key': SCRAPER_API_KEY,
-            'url': job_listing.job_link,
-            # 'country': 'GB'
-        }
-
         # Send request to ScraperAPI
-        response = requests.get(SCRAPER_API_URL, params=payload, timeout=120)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extract the stars rating
-        stars_element = soup.select_one('div.css-1unnuiz span')
-        stars = stars_element.get_text(strip=True) if stars_element else "N/A"
-        
-        # Extract the job type
-        job_type_element = soup.select_one('div.js-match-insights-provider-g6kqeb .js-match-insights-provider-tvvxwd')
-        job_type = job_type_element.get_text(strip=True) if job_type_element else "N/A"
-
-        # Extract the full job description
-        description_element = soup.select_one('#jobDescriptionText')
-        full_description = description_element.get_text(strip=True) if description_element else "N/A"
-
-        # Extract the "Apply Now" link
-        apply_now_element = soup.select_one('button[contenthtml="Apply now"]')
-        apply_now_link = apply_now_element['href'] if apply_now_element and apply_now_element.has_attr('href') else "Apply now"
+        html = fetch_html(job_listing.job_link, timeout=120)
 
         # Update job listing with new details
-        with get_session() as session:
-            listing = session.query(JobListing).filter_by(id=job_listing.id).first()
-            listing.stars = stars
-            listing.job_type = job_type
-            listing.full_description = full_description
-            listing.apply_now_link = apply_now_link
-            session.commit()
+        store_job_details(job_listing.id, parse_in_pool(parse_job_details, html), attempts, writer)
 
         logging.info(f"Detailed information scraped for job ID {job_listing.id}")
 
     except Exception as e:
-        logging.error(f"Failed to scrape details for job ID {job_listing.id}: {e}")
\ No newline at end of file
+        logging.error(f"Failed to scrape details for job ID {job_listing.id}: {e}")
+        raise
+
+
+async def scrape_jobs_from_page_async(fetch_engine, page_url, page_number, job_search_id):
+    """
+    Asyncio counterpart of scrape_jobs_from_page, fetching through the shared AsyncFetchEngine.
+    Network errors are raised so the caller can retry; parsing and database writes run off the event loop.
+    """
+    html = await fetch_engine.fetch(page_url, timeout=60)
+
+    job_cards = await parse_in_pool_async(parse_job_cards, html)
+    job_listings = await asyncio.to_thread(store_job_cards, job_cards, page_number, job_search_id)
+
+    logging.info(f"Scraped {len(job_listings)} jobs from page {page_number} for job search ID {job_search_id}")
+    return job_listings
+
+
+async def scrape_search_page_async(fetch_engine, page_url, page_number, job_search_id):
+    """
+    Asyncio counterpart of scrape_search_page, fetching through the shared AsyncFetchEngine.
+    """
+    html = await fetch_engine.fetch(page_url, timeout=60)
+
+    search_page = await parse_in_pool_async(parse_search_page, html)
+    job_listings = await asyncio.to_thread(store_job_cards, search_page.pop('job_cards'), page_number, job_search_id)
+
+    logging.info(f"Scraped {len(job_listings)} jobs from page {page_number} for job search ID {job_search_id}")
+    return job_listings, search_page
+
+
+async def scrape_job_details_async(fetch_engine, job_listing, attempts=1, writer=None):
+    """
+    Asyncio counterpart of scrape_job_details, fetching through the shared AsyncFetchEngine.
+    Network errors are raised so the caller can retry; parsing and database writes run off the event loop.
+    """
+    html = await fetch_engine.fetch(job_listing.job_link, timeout=120)
+
+    job_details = await parse_in_pool_async(parse_job_details, html)
+    await asyncio.to_thread(store_job_details, job_listing.id, job_details, attempts, writer)
+
+    logging.info(f"Detailed information scraped for job ID {job_listing.id}")
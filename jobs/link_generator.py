@@ -1,9 +1,13 @@
+import math
 from database import get_session
 from config import logging, Config
 from database.models import JobSearch
+from jobs.job_cleaner import canonical_job_title
 
 
 BASE_URL = Config.BASE_URL
+RESULTS_PER_PAGE = Config.RESULTS_PER_PAGE
+MAX_SEARCH_PAGES = Config.MAX_SEARCH_PAGES
 
 
 def read_job_titles(file_path):
@@ -23,36 +27,53 @@ def generate_url(job_title, location="London"):
 
 
 def store_generated_urls(job_titles):
+    """
+    Stores a job search for every title that has none yet, so rerunning the pipeline
+    with the same target list does not probe the same searches again.
+    """
     with get_session() as session:
+        stored_titles = {canonical_job_title(title) for title, in session.query(JobSearch.job_title)}
+        new_titles = {}
 
         for title in job_titles:
-            url = generate_url(title)
-            job_entry = JobSearch(job_title=title, generated_link=url)
+            key = canonical_job_title(title)
+            if key not in stored_titles:
+                new_titles.setdefault(key, title)
 
-            try:
-                session.add(job_entry)
-            except Exception as e:
-                logging.error(f"Error adding job entry for {title}: {e}")
+        session.add_all(JobSearch(job_title=title, generated_link=generate_url(title)) for title in new_titles.values())
 
         try:
             session.commit()
         except Exception as e:
             logging.error(f"Error committing to the database: {e}")
+            return
+
+    logging.info(f"Stored {len(new_titles)} job searches, skipped {len(job_titles) - len(new_titles)} already stored or repeated titles")
+
+
+def generate_page_url(base_url, page_num):
+    """
+    Generate the link of one results page (page_num starts at 1).
+    """
+    if page_num == 1:
+        return base_url  # First page without "&start"
+
+    return f"{base_url}&start={(page_num - 1) * RESULTS_PER_PAGE}"
 
 
 def generate_pagination_links(base_url, last_page):
     """
     Generate pagination links for all pages from 1 to last_page.
     """
-    pagination_links = []
+    return [generate_page_url(base_url, page_num) for page_num in range(1, last_page + 1)]
 
-    for page_num in range(last_page):
-        if page_num == 0:
-            pagination_links.append(base_url)  # First page without "&start"
-        else:
-            pagination_links.append(f"{base_url}&start={page_num * 10}")
 
-    return pagination_links
+def last_page_from_job_count(job_count):
+    """
+    Number of results pages needed for the job count shown on the first page, at most
+    MAX_SEARCH_PAGES: Indeed repeats its last page past the pages it serves, whatever the count says.
+    """
+    return min(MAX_SEARCH_PAGES, max(1, math.ceil(job_count / RESULTS_PER_PAGE)))
 
 
 def store_pagination_links():
@@ -1,12 +1,15 @@
 # import os
 # import requests
 # from config import logging, Config
+# from scraper_utils.http_session import get_http_session
 # from bots.bot_manager import run_bot_manager
 # from jobs.job_cleaner import clean_job_titles
 # from database import engine, Base, get_session
-# from database.models import JobListing, JobSearch
+# from sqlalchemy import func
+# from database.work_source import scrape_progress
+# from database.models import JobListing, JobSearch, SCRAPE_PENDING, SCRAPE_IN_PROGRESS, SCRAPE_DONE, SCRAPE_FAILED
 # from database.export_to_csv import export_tables_to_csv
-# from jobs.link_generator import read_job_titles, store_generated_urls, store_pagination_links
+# from jobs.link_generator import store_generated_urls, store_pagination_links
 
 
 # # Use Config class to access ENVs
@@ -26,7 +29,7 @@
 #     }
 
 #     try:
-#         response = requests.get(SCRAPER_API_URL, params=params, timeout=30)
+#         response = get_http_session().get(SCRAPER_API_URL, params=params, timeout=30)
 #         if response.status_code == 200:
 #             logging.info("ScraperAPI is reachable.")
 #             return True
@@ -42,16 +45,21 @@
 #     """
 #     Logs overall performance metrics of the scraper.
 #     """
+#     progress = scrape_progress()
+#     total_jobs = sum(progress.values())
+#     total_scraped = progress[SCRAPE_DONE]
+#     success_rate = (total_scraped / total_jobs) * 100 if total_jobs > 0 else 0
+
 #     with get_session() as session:
-#         total_jobs = session.query(JobListing).count()
-#         total_scraped = session.query(JobListing).filter(JobListing.apply_now_link.isnot(None)).count()
-#         success_rate = (total_scraped / total_jobs) * 100 if total_jobs > 0 else 0
+#         # Every detail scrape attempt is one ScraperAPI request
+#         credits_used = session.query(func.coalesce(func.sum(JobListing.scrape_attempts), 0)).scalar()
 
-#         logging.info(f"Total job titles: {total_jobs}")
-#         logging.warning(f"Successfully scraped: {total_scraped}")
-#         logging.info(f"Scraping success rate: {success_rate:.2f}%")
-#         logging.warning(f"Concurrent threads used: {Config.MAX_BOTS}")
-#         logging.info(f"API credits used this session: {session.query(JobListing).count()}")  # Approximate API usage metric
+#     logging.info(f"Total job titles: {total_jobs}")
+#     logging.warning(f"Successfully scraped: {total_scraped}")
+#     logging.info(f"Pending: {progress[SCRAPE_PENDING]}, in progress: {progress[SCRAPE_IN_PROGRESS]}, failed: {progress[SCRAPE_FAILED]}")
+#     logging.info(f"Scraping success rate: {success_rate:.2f}%")
+#     logging.warning(f"Concurrent threads used: {Config.MAX_BOTS}")
+#     logging.info(f"API credits used for job details: {credits_used}")
 
 
 # def main():
@@ -63,19 +71,15 @@
 #     # Validate environment variables
 #     Config.validate_env()
 
-#     #? Define the input and output file names using absolute paths
+#     #? Define the input file name using an absolute path
 #     input_txt_file = os.path.join(os.path.dirname(__file__), 'jobs/target_jobs.txt')
 #     # input_txt_file = os.path.join(os.path.dirname(__file__), 'jobs/test_jobs.txt')
-#     output_txt_file = os.path.join(os.path.dirname(__file__), 'jobs/cleaned_jobs.txt')
-
-#     # Run the job cleaner to create cleaned_jobs.txt
-#     clean_job_titles(input_txt_file, output_txt_file)
 
 #     # Initialize the database (create tables if they don't exist)
 #     Base.metadata.create_all(engine)
 
-#     # Read job titles from the cleaned_jobs.txt file
-#     job_titles = read_job_titles(output_txt_file)
+#     # Clean the job titles and drop duplicate and near-duplicate searches in memory
+#     job_titles = clean_job_titles(input_txt_file)
 
 #     logging.warning("job_titles length below!")
 #     logging.info(len(job_titles))
@@ -85,14 +89,6 @@
 #     logging.info("Process completed: Job links generated and stored.")
 
 
-#     # Clean up the temporary cleaned_jobs.txt file
-#     try:
-#         os.remove(output_txt_file)
-#         logging.info("cleaned_jobs file has been deleted.")
-#     except Exception as e:
-#         logging.warning(f"Failed to delete cleaned_jobs file: {e}")
-
-
 #     # Run bot manager for last page processing
 #     run_bot_manager(phase="last_page")
 
@@ -114,6 +110,7 @@
 
 import os
 from config import Config, logging
+from database import init_database
 from csvs.process_csv import process_csv
 
 
@@ -130,6 +127,7 @@ HEADERS = {
 }
 
 if __name__ == "__main__":
+    init_database()
     process_csv(
         input_file=input_csv_file,
         output_file=output_csv_file,
@@ -1,6 +1,8 @@
 from config import logging, Config
+from database import init_database
 from bots.bot_manager import run_bot_manager
 from database.export_to_csv import export_tables_to_csv
+# from database.export_to_parquet import export_tables_to_columnar
 from main import log_performance_metrics, scraper_api_health_check
 
 
@@ -13,13 +15,22 @@ def run():
     # Validate environment variables
     Config.validate_env()
 
+    # Create the tables and apply migrations before any bot touches the database
+    init_database()
+
     # Run the bot manager to handle concurrent job scraping and detailed job information retrieval
     # run_bot_manager(phase="job_search_scraping")
     run_bot_manager(phase="job_listing_scraping")
 
+    # Or scrape job listing details while the job search pages are still being scraped
+    # run_bot_manager(phase="pipeline")
+
     # Export tables to CSV files
     export_tables_to_csv()
 
+    # Or to Parquet files partitioned by scrape day (needs pyarrow)
+    # export_tables_to_columnar()
+
     # Log performance metrics after scraping
     log_performance_metrics()
     logging.warning("All tasks completed and performance metrics logged")
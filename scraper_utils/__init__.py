@@ -1 +1,8 @@
-from .last_page_finder import get_last_page
\ No newline at end of file
+from .last_page_finder import get_last_page, get_last_page_async
+from .fetch_engine import AsyncFetchEngine, run_async
+from .http_session import get_http_session, connection_stats, log_connection_stats
+from .html_parser import parse_job_cards, parse_job_details, parse_last_page, parse_search_page, job_key_from_link
+from .parse_pool import parse_in_pool, parse_in_pool_async, shutdown_parse_pool
+from .response_cache import ResponseCache, CacheMissError, get_response_cache
+from .adaptive_limiter import AdaptiveLimiter, AsyncAdaptiveLimiter, get_adaptive_limiter
+from .company_names import normalize_company_name, cluster_company_names
\ No newline at end of file
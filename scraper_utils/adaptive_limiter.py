@@ -0,0 +1,188 @@
+import math
+import time
+import asyncio
+import threading
+from config import logging, Config
+
+
+# Use Config class to access ENVs
+MAX_BOTS = Config.MAX_BOTS
+ADAPTIVE_CONCURRENCY = Config.ADAPTIVE_CONCURRENCY
+ADAPTIVE_MIN_BOTS = Config.ADAPTIVE_MIN_BOTS
+ADAPTIVE_MAX_BOTS = Config.ADAPTIVE_MAX_BOTS
+TARGET_LATENCY = Config.TARGET_LATENCY
+ERROR_RATE_THRESHOLD = Config.ERROR_RATE_THRESHOLD
+
+# Request outcomes reported to the limiter
+OUTCOME_SUCCESS = "success"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_THROTTLED = "throttled"  # HTTP 429
+OUTCOME_SERVER_ERROR = "server_error"  # HTTP 5xx
+OUTCOME_CLIENT_ERROR = "client_error"  # Other failures; not a sign of overload
+OVERLOAD_OUTCOMES = (OUTCOME_TIMEOUT, OUTCOME_THROTTLED, OUTCOME_SERVER_ERROR)
+
+DECREASE_FACTOR = 0.7  # Multiplicative decrease when the error rate is too high
+
+
+def outcome_for_status(status_code: int) -> str:
+    if status_code == 429:
+        return OUTCOME_THROTTLED
+    if status_code >= 500:
+        return OUTCOME_SERVER_ERROR
+    if status_code >= 400:
+        return OUTCOME_CLIENT_ERROR
+    return OUTCOME_SUCCESS
+
+
+class AdaptiveLimiter:
+    """
+    Adaptive cap on in-flight requests for worker threads.
+    After every window of completed requests the limit is recomputed:
+    - timeouts, 429s and 5xx above ERROR_RATE_THRESHOLD cut it multiplicatively;
+    - otherwise it follows the latency gradient (TARGET_LATENCY / p95, at most 1)
+      plus sqrt(limit) of headroom, so it grows while latency is on target and
+      shrinks in proportion once p95 drifts above it.
+
+    Usage:
+        limiter.acquire()
+        start = time.time()
+        ...
+        limiter.release(time.time() - start, outcome)
+    """
+
+    def __init__(self, initial: int = MAX_BOTS, min_limit: int = ADAPTIVE_MIN_BOTS,
+                 max_limit: int = ADAPTIVE_MAX_BOTS, target_latency: float = TARGET_LATENCY,
+                 error_rate_threshold: float = ERROR_RATE_THRESHOLD):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.target_latency = target_latency
+        self.error_rate_threshold = error_rate_threshold
+        self.in_flight = 0
+        self.completed = 0
+        self.p95_latency = 0.0
+        self.error_rate = 0.0
+        self.throughput = 0.0
+        self._latencies = []
+        self._overloads = 0
+        self._window_started = time.time()
+        self._started = self._window_started
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Blocks until the number of in-flight requests is below the current limit.
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, outcome: str):
+        """
+        Records a finished request and lets waiting workers re-check the limit.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self._record(latency, outcome)
+            self._condition.notify_all()
+
+    def _record(self, latency: float, outcome: str):
+        self.completed += 1
+        self._latencies.append(latency)
+        if outcome in OVERLOAD_OUTCOMES:
+            self._overloads += 1
+
+        if len(self._latencies) >= max(20, int(self.limit)):
+            self._adjust()
+
+    def _adjust(self):
+        now = time.time()
+        latencies = sorted(self._latencies)
+        samples = len(latencies)
+
+        self.p95_latency = latencies[min(samples - 1, int(samples * 0.95))]
+        self.error_rate = self._overloads / samples
+        self.throughput = samples / max(now - self._window_started, 1e-6)
+        previous_limit = self.limit
+
+        if self.error_rate > self.error_rate_threshold:
+            new_limit = self.limit * DECREASE_FACTOR
+        else:
+            gradient = min(1.0, self.target_latency / max(self.p95_latency, 1e-6))
+            new_limit = self.limit * gradient + math.sqrt(self.limit)
+
+        self.limit = min(max(new_limit, self.min_limit), self.max_limit)
+        self._latencies = []
+        self._overloads = 0
+        self._window_started = now
+
+        if int(self.limit) != int(previous_limit):
+            logging.info(
+                f"Concurrency limit {int(previous_limit)} -> {int(self.limit)} "
+                f"(p95 {self.p95_latency:.2f}s, error rate {self.error_rate:.2%}, {self.throughput:.2f} req/s)"
+            )
+
+    def snapshot(self) -> dict:
+        """
+        Current limit and throughput metrics.
+        """
+        elapsed = max(time.time() - self._started, 1e-6)
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "p95_latency": self.p95_latency,
+            "error_rate": self.error_rate,
+            "window_throughput": self.throughput,
+            "overall_throughput": self.completed / elapsed,
+        }
+
+    def log_metrics(self):
+        metrics = self.snapshot()
+        logging.info(
+            f"Adaptive concurrency limit: {metrics['limit']}, completed: {metrics['completed']}, "
+            f"p95 latency: {metrics['p95_latency']:.2f}s, error rate: {metrics['error_rate']:.2%}, "
+            f"throughput: {metrics['overall_throughput']:.2f} req/s"
+        )
+
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """
+    AdaptiveLimiter for coroutines on a single event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._async_condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._async_condition:
+            await self._async_condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, outcome: str):
+        async with self._async_condition:
+            self.in_flight -= 1
+            self._record(latency, outcome)
+            self._async_condition.notify_all()
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_adaptive_limiter():
+    """
+    Returns the limiter shared by worker threads, or None when ADAPTIVE_CONCURRENCY is off.
+    """
+    global _limiter
+
+    if not ADAPTIVE_CONCURRENCY:
+        return None
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveLimiter()
+
+    return _limiter
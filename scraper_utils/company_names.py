@@ -0,0 +1,131 @@
+import re
+from difflib import SequenceMatcher
+from collections import defaultdict
+from config import Config
+
+
+# Use Config class to access ENVs
+COMPANY_MATCH_THRESHOLD = Config.COMPANY_MATCH_THRESHOLD
+
+# Trailing words that do not tell companies apart
+LEGAL_SUFFIXES = {
+    "ltd", "limited", "plc", "llp", "llc", "lp", "inc", "incorporated", "corp", "corporation",
+    "co", "company", "gmbh", "ag", "sa", "bv", "nv", "group", "holdings",
+}
+REGION_QUALIFIERS = {"uk", "gb", "england", "london", "europe", "emea", "international", "global"}
+REGION_PHRASES = {("united", "kingdom")}
+
+# Words after which a suffix is part of the name ("Bank of England")
+CONNECTORS = {"of", "and", "for", "the"}
+
+# Characters of names fitting in one blocking key; only names sharing a key are compared
+BLOCK_KEY_LENGTH = 4
+
+# Shortest name that other names extending it by qualifiers (e.g. "amazon web services") are merged into
+MIN_PREFIX_LENGTH = 4
+
+# Words naming a division of a company rather than another company ("Amazon Web Services", "Deloitte Digital")
+DIVISION_WORDS = {
+    "web", "services", "service", "solutions", "technology", "technologies", "tech", "digital", "consulting",
+    "retail", "financial", "capital", "partners", "labs", "systems", "operations", "logistics", "careers", "jobs",
+}
+
+# Shortest name matched by character similarity: short names a letter apart ("Boots", "Booths") are different companies
+MIN_FUZZY_LENGTH = 10
+
+_PARENTHESES = re.compile(r"\([^)]*\)")
+_DROPPED = re.compile(r"[.']")
+_SEPARATORS = re.compile(r"[^\w\s]")
+
+
+def normalize_company_name(name) -> str:
+    """
+    Canonical form of a company name used to match its variants: casefolded, without
+    parenthesised parts, punctuation, a leading "the", or trailing legal suffixes and
+    region qualifiers ("Amazon UK Ltd." -> "amazon").
+    """
+    if not name:
+        return ""
+
+    name = _PARENTHESES.sub(" ", name.casefold()).replace("&", " and ")
+    name = _SEPARATORS.sub(" ", _DROPPED.sub("", name))
+    tokens = name.split()
+
+    if len(tokens) > 1 and tokens[0] == "the":
+        tokens = tokens[1:]
+
+    while len(tokens) > 1:
+        if tuple(tokens[-2:]) in REGION_PHRASES and len(tokens) > 2 and tokens[-3] not in CONNECTORS:
+            tokens = tokens[:-2]
+        elif (tokens[-1] in LEGAL_SUFFIXES or tokens[-1] in REGION_QUALIFIERS) and tokens[-2] not in CONNECTORS:
+            tokens.pop()
+        else:
+            break
+
+    return " ".join(tokens)
+
+
+def _same_company(leader: str, name: str, threshold: float) -> bool:
+    """
+    Whether name (at least as long as leader) is a variant of leader: it extends leader by
+    qualifier words only (legal suffixes, regions, divisions), or the two are long enough and
+    similar enough character by character (typos, spacing). "Bank of America" does not extend
+    "Bank", and "National Trust" does not extend "National".
+    """
+    if len(leader) >= MIN_PREFIX_LENGTH and name.startswith(f"{leader} "):
+        extra_tokens = name[len(leader):].split()
+        return all(token in LEGAL_SUFFIXES or token in REGION_QUALIFIERS or token in DIVISION_WORDS for token in extra_tokens)
+
+    if len(leader) < MIN_FUZZY_LENGTH:
+        return False
+
+    matcher = SequenceMatcher(None, leader, name)
+    return matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+
+def cluster_company_names(job_counts: dict, threshold: float = COMPANY_MATCH_THRESHOLD) -> dict:
+    """
+    Maps every raw company name to its canonical name.
+    Names are grouped by normalized form, then forms are blocked by their first characters
+    and, within a block, compared to the shortest form of each cluster found so far, so the
+    work grows with names x clusters per block rather than with all pairs.
+    The canonical name of a cluster is its raw name with the most job listings.
+
+    :param job_counts: dict, Job listing count of every raw company name
+    :param threshold: float, SequenceMatcher ratio from which two names are the same company
+    :return: dict, Canonical name of every raw company name
+    """
+    names_by_form = defaultdict(list)
+    for name in job_counts:
+        names_by_form[normalize_company_name(name)].append(name)
+
+    blocks = defaultdict(list)
+    for form in names_by_form:
+        blocks[form[:BLOCK_KEY_LENGTH]].append(form)
+
+    leader_of_form = {}
+
+    for forms in blocks.values():
+        leaders = []
+
+        for form in sorted(forms, key=len):
+            leader = next((leader for leader in leaders if _same_company(leader, form, threshold)), None)
+
+            if leader is None:
+                leaders.append(form)
+                leader = form
+
+            leader_of_form[form] = leader
+
+    clusters = defaultdict(list)
+    for form, names in names_by_form.items():
+        clusters[leader_of_form[form]].extend(names)
+
+    canonical = {}
+    for names in clusters.values():
+        canonical_name = min(names, key=lambda name: (-job_counts[name], len(name), name))
+
+        for name in names:
+            canonical[name] = canonical_name
+
+    return canonical
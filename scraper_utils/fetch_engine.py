@@ -0,0 +1,186 @@
+import time
+import asyncio
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+from config import logging, Config
+from scraper_utils.response_cache import get_response_cache
+from scraper_utils.adaptive_limiter import (
+    AsyncAdaptiveLimiter, outcome_for_status, OUTCOME_TIMEOUT, OUTCOME_SERVER_ERROR, OUTCOME_CLIENT_ERROR
+)
+
+
+# Use Config class to access ENVs
+SCRAPER_API_KEY = Config.SCRAPER_API_KEY
+SCRAPER_API_URL = Config.SCRAPER_API_URL
+MAX_BOTS = Config.MAX_BOTS
+ADAPTIVE_CONCURRENCY = Config.ADAPTIVE_CONCURRENCY
+MAX_CONCURRENT_REQUESTS = Config.MAX_CONCURRENT_REQUESTS
+ASYNC_THREAD_WORKERS = Config.ASYNC_THREAD_WORKERS
+HTTP_KEEPALIVE_TIMEOUT = Config.HTTP_KEEPALIVE_TIMEOUT
+
+
+class AsyncFetchEngine:
+    """
+    Asyncio based ScraperAPI client shared by every scraping phase.
+    A single event loop keeps thousands of requests in flight while a bounded
+    semaphore caps how many are actually open against ScraperAPI at once.
+    With ADAPTIVE_CONCURRENCY on, an AsyncAdaptiveLimiter starting at MAX_BOTS
+    moves the effective cap between ADAPTIVE_MIN_BOTS and the semaphore size.
+
+    Usage:
+        async with AsyncFetchEngine() as fetch_engine:
+            html = await fetch_engine.fetch(url, timeout=60)
+    """
+
+    def __init__(self, max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS):
+        self.max_concurrent_requests = max_concurrent_requests
+        self._semaphore = None
+        self._session = None
+        self.limiter = None
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        if ADAPTIVE_CONCURRENCY:
+            self.limiter = AsyncAdaptiveLimiter(initial=MAX_BOTS, max_limit=self.max_concurrent_requests)
+
+        # Count new vs reused connections so keep-alive can be verified
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrent_requests,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self.log_connection_stats()
+
+        if self.limiter:
+            self.limiter.log_metrics()
+
+    async def _on_connection_created(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connections_reused += 1
+
+    def log_connection_stats(self):
+        """
+        Logs how many requests reused a kept-alive connection instead of opening a new one.
+        """
+        total = self.connections_created + self.connections_reused
+        reuse_rate = (self.connections_reused / total) * 100 if total > 0 else 0
+        logging.info(
+            f"Async fetch engine requests: {total}, new connections: {self.connections_created}, "
+            f"connection reuse: {reuse_rate:.2f}%"
+        )
+
+    async def fetch(self, url: str, timeout: int = 60) -> bytes:
+        """
+        Fetches a target URL through ScraperAPI and returns the raw response body.
+        Responses are served from and saved to the response cache when it is enabled.
+        Raises asyncio.TimeoutError or aiohttp.ClientError on failure so callers can retry.
+        """
+        cache = get_response_cache()
+
+        if cache:
+            cached_body = await asyncio.to_thread(cache.get, url)
+            if cached_body is not None:
+                return cached_body
+
+        params = {
+            'api_key': SCRAPER_API_KEY,
+            'url': url,
+            # 'country': 'GB'
+        }
+
+        if self.limiter:
+            await self.limiter.acquire()
+
+        start_time = time.time()
+        outcome = OUTCOME_CLIENT_ERROR
+
+        try:
+            async with self._semaphore:
+                async with self._session.get(
+                    SCRAPER_API_URL, params=params, timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    outcome = outcome_for_status(response.status)
+                    response.raise_for_status()
+                    body = await response.read()
+
+        except asyncio.TimeoutError:
+            outcome = OUTCOME_TIMEOUT
+            raise
+
+        except aiohttp.ClientConnectionError:
+            outcome = OUTCOME_SERVER_ERROR
+            raise
+
+        finally:
+            if self.limiter:
+                await self.limiter.release(time.time() - start_time, outcome)
+
+        if cache:
+            await asyncio.to_thread(cache.put, url, body)
+
+        return body
+
+
+def run_async(coroutine):
+    """
+    Runs a coroutine to completion from synchronous code (e.g. the bot manager).
+    asyncio.to_thread work runs on ASYNC_THREAD_WORKERS threads, which the database pool is sized for.
+    """
+    async def run_with_thread_workers():
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=ASYNC_THREAD_WORKERS, thread_name_prefix="async-worker")
+        )
+        return await coroutine
+
+    return asyncio.run(run_with_thread_workers())
+
+
+async def gather_and_log(coroutines, phase: str):
+    """
+    Awaits a collection of coroutines, logging (rather than raising) individual failures.
+    Concurrency is bounded by the fetch engine semaphore, not by the number of coroutines.
+    """
+    results = await asyncio.gather(*coroutines, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error(f"Bot manager encountered an error in {phase} phase: {result}")
+
+    return results
+
+
+async def gather_windowed(items, make_coroutine, window: int, phase: str):
+    """
+    Runs make_coroutine(item) for every item of an async iterator, keeping at most
+    `window` tasks alive at once so memory does not grow with the number of items.
+    """
+    in_flight = set()
+
+    def log_failures(done):
+        for task in done:
+            if task.exception():
+                logging.error(f"Bot manager encountered an error in {phase} phase: {task.exception()}")
+
+    async for item in items:
+        if len(in_flight) >= window:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            log_failures(done)
+
+        in_flight.add(asyncio.create_task(make_coroutine(item)))
+
+    if in_flight:
+        done, _ = await asyncio.wait(in_flight)
+        log_failures(done)
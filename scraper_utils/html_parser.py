@@ -0,0 +1,185 @@
+import re
+import importlib.util
+import soupsieve as sv
+from urllib.parse import urlsplit, parse_qs
+from config import logging, Config
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+# Use Config class to access ENVs
+BASE_URL = Config.BASE_URL
+
+# Parser backend: lxml's C parser when it is installed, otherwise Python's html.parser
+HTML_PARSER = Config.HTML_PARSER or ("lxml" if importlib.util.find_spec("lxml") else "html.parser")
+
+#? Selectors are compiled once at import instead of on every select_one call
+JOB_CARD = sv.compile('li.css-1ac2h1w')  # Each job is within a list element
+JOB_TITLE = sv.compile('a.jcs-JobTitle')
+COMPANY = sv.compile('span[data-testid="company-name"]')
+LOCATION = sv.compile('div[data-testid="text-location"]')
+POSTED_DATE = sv.compile('span[data-testid="myJobsStateDate"]')
+
+STARS = sv.compile('div.css-1unnuiz span')
+JOB_TYPE = sv.compile('div.js-match-insights-provider-g6kqeb .js-match-insights-provider-tvvxwd')
+DESCRIPTION = sv.compile('#jobDescriptionText')
+APPLY_NOW = sv.compile('button[contenthtml="Apply now"]')
+
+NO_RESULTS = sv.compile('.jobsearch-NoResult-messageContainer')
+CURRENT_PAGE = sv.compile('a[data-testid="pagination-page-current"]')
+NEXT_PAGE = sv.compile('a[data-testid="pagination-page-next"]')
+JOB_COUNT = sv.compile('div.jobsearch-JobCountAndSortPane-jobCount')
+
+
+def _has_class(attrs, class_name):
+    return class_name in (attrs.get('class') or '').split()
+
+
+#* Strainers keep only the subtrees the selectors above look at, so the rest of the page is never built
+JOB_CARDS_ONLY = SoupStrainer(lambda name, attrs: name == 'li' and _has_class(attrs, 'css-1ac2h1w'))
+
+JOB_DETAILS_ONLY = SoupStrainer(lambda name, attrs: (
+    (name == 'div' and _has_class(attrs, 'css-1unnuiz'))
+    or (name == 'div' and _has_class(attrs, 'js-match-insights-provider-g6kqeb'))
+    or attrs.get('id') == 'jobDescriptionText'
+    or (name == 'button' and attrs.get('contenthtml') == 'Apply now')
+))
+
+PAGINATION_ONLY = SoupStrainer(lambda name, attrs: (
+    _has_class(attrs, 'jobsearch-NoResult-messageContainer')
+    or (name == 'a' and attrs.get('data-testid') == 'pagination-page-current')
+))
+
+SEARCH_PAGE_ONLY = SoupStrainer(lambda name, attrs: (
+    (name == 'li' and _has_class(attrs, 'css-1ac2h1w'))
+    or (name == 'div' and _has_class(attrs, 'jobsearch-JobCountAndSortPane-jobCount'))
+    or _has_class(attrs, 'jobsearch-NoResult-messageContainer')
+    or (name == 'a' and attrs.get('data-testid') == 'pagination-page-next')
+))
+
+
+def make_soup(html, parse_only=None):
+    """
+    Parses HTML with the configured backend, optionally restricted to a strainer.
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+def _text(pattern, tag, default="N/A"):
+    element = pattern.select_one(tag)
+    return element.get_text(strip=True) if element else default
+
+
+def job_key_from_link(job_link):
+    """
+    Returns Indeed's job key (the jk query parameter) of a job link, or None if it has none.
+    """
+    values = parse_qs(urlsplit(job_link).query).get('jk')
+    return values[0] if values else None
+
+
+def parse_job_cards(html):
+    """
+    Extracts the job cards of a search results page into plain dictionaries.
+    """
+    return _extract_job_cards(make_soup(html, JOB_CARDS_ONLY))
+
+
+def _extract_job_cards(soup):
+    job_cards = []
+
+    # Find each job card element
+    for job in JOB_CARD.select(soup):
+        # Extract job title
+        job_title_element = JOB_TITLE.select_one(job)
+        job_title = job_title_element.get_text(strip=True) if job_title_element else "N/A"
+
+        # Extract posted date
+        posted_date = _text(POSTED_DATE, job)
+        if posted_date != "N/A":
+            posted_date = posted_date.replace("Posted", "").strip()
+
+        # Extract job link
+        job_link_element = job_title_element.get("href") if job_title_element else None
+        job_link = f"{BASE_URL}{job_link_element}" if job_link_element else "N/A"
+
+        job_cards.append({
+            'job_title': job_title,
+            'company': _text(COMPANY, job),
+            'location': _text(LOCATION, job),
+            'posted_date': posted_date,
+            'job_link': job_link,
+        })
+
+    return job_cards
+
+
+def parse_job_details(html):
+    """
+    Extracts stars, job type, full description and apply now link from a job page.
+    """
+    soup = make_soup(html, JOB_DETAILS_ONLY)
+
+    # Extract the "Apply Now" link
+    apply_now_element = APPLY_NOW.select_one(soup)
+    apply_now_link = apply_now_element['href'] if apply_now_element and apply_now_element.has_attr('href') else "Apply now"
+
+    return {
+        'stars': _text(STARS, soup),
+        'job_type': _text(JOB_TYPE, soup),
+        'full_description': _text(DESCRIPTION, soup),
+        'apply_now_link': apply_now_link,
+    }
+
+
+def parse_search_page(html):
+    """
+    Extracts the job cards of a search results page together with what it says about pagination:
+    the total job count (None if the page does not show it), whether a next page control
+    is present, whether Indeed reports no results, and the job keys of all cards on the page.
+    """
+    soup = make_soup(html, SEARCH_PAGE_ONLY)
+    job_cards = _extract_job_cards(soup)
+
+    job_count = None
+    job_count_element = JOB_COUNT.select_one(soup)
+
+    if job_count_element:
+        digits = re.search(r'\d[\d,.]*', job_count_element.get_text())
+        if digits:
+            job_count = int(re.sub(r'[,.]', '', digits.group()))
+
+    return {
+        'job_cards': job_cards,
+        'job_keys': [job_key_from_link(job_card['job_link']) or job_card['job_link'] for job_card in job_cards],
+        'job_count': job_count,
+        'has_next_page': NEXT_PAGE.select_one(soup) is not None,
+        'no_results': NO_RESULTS.select_one(soup) is not None,
+    }
+
+
+def parse_last_page(html, search_url):
+    """
+    Extracts the last page number from the HTML of a search results page,
+    returning 0 when Indeed reports no results.
+    """
+    soup = make_soup(html, PAGINATION_ONLY)
+
+    # Check for "no results" message
+    if NO_RESULTS.select_one(soup):
+        logging.info(f"No search results found for {search_url}")
+        return 0  # Indicates that no pages are available for this search
+
+    # Locate the pagination container and extract the last page number
+    current_page = CURRENT_PAGE.select_one(soup)
+
+    logging.warning("current_page below!")
+    logging.info(current_page)
+
+    # Retrieve and convert the last page number if found
+    if current_page and current_page.get_text().isdigit():
+        last_page = int(current_page.get_text())
+    else:
+        last_page = 1  # Default to 1 if pagination is not found or accessible
+
+    logging.info(f"Last page for {search_url} is {last_page}")
+    return last_page
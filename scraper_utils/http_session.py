@@ -0,0 +1,93 @@
+import threading
+import requests
+from urllib3.util.retry import Retry
+from config import logging, Config
+from requests.adapters import HTTPAdapter
+
+
+# Use Config class to access ENVs
+HTTP_POOL_SIZE = Config.HTTP_POOL_SIZE
+HTTP_RETRIES = Config.HTTP_RETRIES
+
+# One session per worker thread, plus a registry so statistics can be collected across all of them
+_thread_local = threading.local()
+_sessions = []
+_sessions_lock = threading.Lock()
+
+
+def create_http_session(pool_size: int = HTTP_POOL_SIZE, retries: int = HTTP_RETRIES) -> requests.Session:
+    """
+    Creates a requests Session whose connections are pooled and kept alive between calls.
+    The mounted adapter retries connection failures and gateway errors at the transport level;
+    anything else is left to the callers' own retry logic.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,  # Hand the last response back so raise_for_status() still applies
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the pooled session of the calling worker thread, creating it on first use.
+    """
+    session = getattr(_thread_local, "session", None)
+
+    if session is None:
+        session = create_http_session()
+        _thread_local.session = session
+
+        with _sessions_lock:
+            _sessions.append(session)
+
+    return session
+
+
+def connection_stats() -> dict:
+    """
+    Aggregates connection reuse across every worker session.
+    A reuse rate close to 100% means almost no request paid for a new TCP+TLS handshake.
+    """
+    connections = 0
+    requests_sent = 0
+
+    with _sessions_lock:
+        sessions = list(_sessions)
+
+    for session in sessions:
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+
+            for key in pools.keys():
+                pool = pools[key]
+                connections += pool.num_connections
+                requests_sent += pool.num_requests
+
+    reuse_rate = (1 - connections / requests_sent) * 100 if requests_sent > 0 else 0
+
+    return {
+        "sessions": len(sessions),
+        "requests": requests_sent,
+        "connections": connections,
+        "reuse_rate": reuse_rate,
+    }
+
+
+def log_connection_stats():
+    """
+    Logs the connection reuse statistics of the pooled sessions.
+    """
+    stats = connection_stats()
+    logging.info(
+        f"HTTP sessions: {stats['sessions']}, requests: {stats['requests']}, "
+        f"new connections: {stats['connections']}, connection reuse: {stats['reuse_rate']:.2f}%"
+    )
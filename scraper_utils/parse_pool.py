@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import multiprocessing
+from functools import partial
+from config import logging, Config
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Use Config class to access ENVs
+PARSER_PROCESSES = Config.PARSER_PROCESSES
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool():
+    """
+    Returns the shared pool of parser processes, or None when PARSER_PROCESSES is 0.
+    Workers are spawned rather than forked because the parent already runs fetch and writer threads.
+    """
+    global _pool
+
+    if PARSER_PROCESSES <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PARSER_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
+            logging.info(f"Started {PARSER_PROCESSES} parser processes")
+
+    return _pool
+
+
+def parse_in_pool(parse_fn, html, *args):
+    """
+    Runs a parser from scraper_utils.html_parser on raw page bytes in a parser process,
+    returning its compact extracted records. Parses in the calling thread when the pool is disabled.
+    """
+    pool = get_parse_pool()
+
+    if pool is None:
+        return parse_fn(html, *args)
+
+    return pool.submit(parse_fn, html, *args).result()
+
+
+async def parse_in_pool_async(parse_fn, html, *args):
+    """
+    Asyncio counterpart of parse_in_pool; falls back to a worker thread when the pool is disabled.
+    """
+    pool = get_parse_pool()
+
+    if pool is None:
+        return await asyncio.to_thread(parse_fn, html, *args)
+
+    return await asyncio.get_running_loop().run_in_executor(pool, partial(parse_fn, html, *args))
+
+
+def shutdown_parse_pool():
+    """
+    Stops the parser processes, if any were started.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,204 @@
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from config import logging, Config
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Use Config class to access ENVs
+RESPONSE_CACHE_MODE = Config.RESPONSE_CACHE_MODE
+RESPONSE_CACHE_DIR = Config.RESPONSE_CACHE_DIR
+RESPONSE_CACHE_TTL = Config.RESPONSE_CACHE_TTL
+RESPONSE_CACHE_MAX_MB = Config.RESPONSE_CACHE_MAX_MB
+
+# Cache modes
+CACHE_OFF = "off"
+CACHE_ON = "on"  # Serve fresh entries from disk, fetch and store everything else
+CACHE_OFFLINE = "offline"  # Serve from disk only, whatever the entry's age; never touch the network
+
+
+class CacheMissError(LookupError):
+    """
+    Raised in offline mode when a URL has no cached response.
+    """
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalises a target URL so equivalent URLs share a cache entry:
+    lower-cased scheme and host, sorted query parameters, no fragment.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class ResponseCache:
+    """
+    Content-addressed store of compressed response bodies.
+    Bodies live in zlib-compressed files named by the SHA-256 of the normalised key;
+    a small SQLite index tracks size and access time for TTL checks and LRU eviction.
+    """
+
+    def __init__(self, directory: str = RESPONSE_CACHE_DIR, ttl: int = RESPONSE_CACHE_TTL,
+                 max_bytes: int = RESPONSE_CACHE_MAX_MB * 1024 * 1024, offline: bool = False):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._index = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self._index.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, url TEXT, size INTEGER, created_at REAL, accessed_at REAL)"
+        )
+        self._index.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        self._total_bytes = self._index.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _path(self, key_hash: str) -> str:
+        return os.path.join(self.directory, key_hash[:2], f"{key_hash}.z")
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(normalize_url(key).encode()).hexdigest()
+
+    def get(self, key: str):
+        """
+        Returns the cached body for a URL, or None if it is missing or older than the TTL.
+        In offline mode a miss raises CacheMissError and the TTL is ignored.
+        """
+        key_hash = self._hash(key)
+
+        #* The lock only guards the SQLite index; file reads and decompression run concurrently
+        with self._lock:
+            row = self._index.execute("SELECT created_at FROM entries WHERE key = ?", (key_hash,)).fetchone()
+
+        fresh = row is not None and (self.offline or time.time() - row[0] <= self.ttl)
+
+        if fresh:
+            try:
+                with open(self._path(key_hash), "rb") as f:
+                    body = zlib.decompress(f.read())
+            except (OSError, zlib.error):
+                with self._lock:
+                    self._delete(key_hash)
+                    self._index.commit()
+                fresh = False
+
+        if not fresh:
+            with self._lock:
+                self.misses += 1
+
+            if self.offline:
+                raise CacheMissError(f"No cached response for {key}")
+            return None
+
+        with self._lock:
+            self._index.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key_hash))
+            self._index.commit()
+            self.hits += 1
+
+        return body
+
+    def put(self, key: str, body: bytes):
+        """
+        Stores a response body, evicting least recently used entries if the cache is over its size limit.
+        The file is written under a temporary name and renamed into place, so readers never see a partial body.
+        """
+        key_hash = self._hash(key)
+        compressed = zlib.compress(body, 6)
+        path = self._path(key_hash)
+        partial_path = f"{path}.{threading.get_ident()}.part"
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(partial_path, "wb") as f:
+            f.write(compressed)
+        os.replace(partial_path, path)
+
+        with self._lock:
+            previous = self._index.execute("SELECT size FROM entries WHERE key = ?", (key_hash,)).fetchone()
+            now = time.time()
+            self._index.execute(
+                "INSERT OR REPLACE INTO entries (key, url, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key_hash, key, len(compressed), now, now),
+            )
+            self._total_bytes += len(compressed) - (previous[0] if previous else 0)
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+            self._index.commit()
+
+    def _delete(self, key_hash: str):
+        row = self._index.execute("SELECT size FROM entries WHERE key = ?", (key_hash,)).fetchone()
+        self._index.execute("DELETE FROM entries WHERE key = ?", (key_hash,))
+        self._total_bytes -= row[0] if row else 0
+
+        try:
+            os.remove(self._path(key_hash))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """
+        Drops least recently used entries until the cache is back under 90% of its size limit.
+        """
+        target = self.max_bytes * 0.9
+        evicted = 0
+
+        while self._total_bytes > target:
+            rows = self._index.execute("SELECT key FROM entries ORDER BY accessed_at LIMIT 100").fetchall()
+            if not rows:
+                break
+
+            for (key_hash,) in rows:
+                self._delete(key_hash)
+                evicted += 1
+
+                if self._total_bytes <= target:
+                    break
+
+        logging.info(f"Response cache evicted {evicted} entries")
+
+    def log_stats(self):
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total) * 100 if total > 0 else 0
+        logging.info(
+            f"Response cache hits: {self.hits}, misses: {self.misses} ({hit_rate:.2f}% hit rate), "
+            f"size: {self._total_bytes / (1024 * 1024):.1f} MB"
+        )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Returns the shared response cache, or None when RESPONSE_CACHE_MODE is off.
+    """
+    global _cache
+
+    if RESPONSE_CACHE_MODE == CACHE_OFF:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(offline=RESPONSE_CACHE_MODE == CACHE_OFFLINE)
+
+    return _cache
+
+
+def log_response_cache_stats():
+    """
+    Logs hit/miss statistics of the shared response cache, if it is enabled.
+    """
+    if _cache is not None:
+        _cache.log_stats()
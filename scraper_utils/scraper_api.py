@@ -0,0 +1,64 @@
+import time
+import requests
+from config import Config
+from scraper_utils.http_session import get_http_session
+from scraper_utils.response_cache import get_response_cache
+from scraper_utils.adaptive_limiter import (
+    get_adaptive_limiter, outcome_for_status, OUTCOME_TIMEOUT, OUTCOME_SERVER_ERROR, OUTCOME_CLIENT_ERROR
+)
+
+
+# Use Config class to access ENVs
+SCRAPER_API_KEY = Config.SCRAPER_API_KEY
+SCRAPER_API_URL = Config.SCRAPER_API_URL
+
+
+def fetch_html(url, timeout=60):
+    """
+    Fetches a target URL through ScraperAPI on the calling thread's pooled session
+    and returns the raw page bytes; decoding is left to the parser.
+    Responses are served from and saved to the response cache when it is enabled,
+    and network requests wait for a slot of the adaptive limiter when it is enabled.
+    Raises a requests exception on failure so callers can retry.
+    """
+    cache = get_response_cache()
+
+    if cache:
+        cached_body = cache.get(url)
+        if cached_body is not None:
+            return cached_body
+
+    payload = {
+        'api_key': SCRAPER_API_KEY,
+        'url': url,
+        # 'country': 'GB'
+    }
+
+    limiter = get_adaptive_limiter()
+    if limiter:
+        limiter.acquire()
+
+    start_time = time.time()
+    outcome = OUTCOME_CLIENT_ERROR
+
+    try:
+        response = get_http_session().get(SCRAPER_API_URL, params=payload, timeout=timeout)
+        outcome = outcome_for_status(response.status_code)
+        response.raise_for_status()  # Raise an error if the request fails
+
+    except requests.exceptions.Timeout:
+        outcome = OUTCOME_TIMEOUT
+        raise
+
+    except requests.exceptions.ConnectionError:
+        outcome = OUTCOME_SERVER_ERROR
+        raise
+
+    finally:
+        if limiter:
+            limiter.release(time.time() - start_time, outcome)
+
+    if cache:
+        cache.put(url, response.content)
+
+    return response.content
@@ -0,0 +1,24 @@
+import os
+import sys
+import tempfile
+
+# Config reads the environment on import, so the required variables are set before any project module is imported
+_test_dir = tempfile.mkdtemp(prefix="indeed-scraper-tests-")
+
+os.environ.setdefault("BASE_URL", "https://uk.indeed.com")
+os.environ.setdefault("MAX_BOTS", "4")
+os.environ.setdefault("RETRY_LIMIT", "3")
+os.environ.setdefault("LOCATION", "London")
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{os.path.join(_test_dir, 'test.db')}")
+os.environ.setdefault("SCRAPER_API_KEY", "test")
+os.environ.setdefault("SCRAPER_API_URL", "http://127.0.0.1:9/")
+os.environ.setdefault("TIMEOUT_URLS_FILE", os.path.join(_test_dir, "timeouts.txt"))
+os.environ.setdefault("APOLLO_API_KEY", "test")
+os.environ.setdefault("APOLLO_API_URL", "http://127.0.0.1:9/")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The package no longer creates its schema on import; the tests share one database, created here
+from database import init_database
+
+init_database()
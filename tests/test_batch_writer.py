@@ -0,0 +1,26 @@
+from database import engine
+from sqlalchemy import delete, insert, select
+from database.models import JobSearch, JobListing
+from database.batch_writer import BatchWriter
+
+
+def test_failed_flush_falls_back_to_row_by_row_updates():
+    with engine.begin() as connection:
+        connection.execute(delete(JobListing))
+        connection.execute(delete(JobSearch))
+        connection.execute(insert(JobSearch), [{"id": 1, "job_title": "Nurse", "generated_link": "link"}])
+        connection.execute(
+            insert(JobListing),
+            [{"id": row_id, "job_search_id": 1, "page_number": 1, "job_title": "Nurse", "job_link": "N/A"} for row_id in (1, 2)],
+        )
+
+    writer = BatchWriter(batch_size=100)
+    writer.update(JobListing, 1, {"stars": "4.5"})
+    writer.update(JobListing, 2, {"job_title": None})  # Violates NOT NULL, failing the whole batch
+    writer.flush()
+
+    with engine.connect() as connection:
+        assert connection.execute(select(JobListing.stars).where(JobListing.id == 1)).scalar_one() == "4.5"
+
+    assert writer.rows_written == 1
+    assert writer.rows_failed == 1
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from database import engine, get_session
+from sqlalchemy import delete, insert
+from database.models import JobSearch, JobListing
+from bots import bot_manager
+
+
+@pytest.fixture
+def job_search(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot_manager, "TIMEOUT_URLS_FILE", str(tmp_path / "timeouts.txt"))
+
+    with engine.begin() as connection:
+        connection.execute(delete(JobListing))
+        connection.execute(delete(JobSearch))
+        connection.execute(insert(JobSearch), [{"id": 1, "job_title": "Nurse", "generated_link": "https://uk.indeed.com/jobs?q=Nurse"}])
+
+    with get_session() as session:
+        job_search = session.get(JobSearch, 1)
+        session.expunge(job_search)
+
+    return job_search
+
+
+def _failing_search_page(*args):
+    raise ConnectionError("ScraperAPI unreachable")
+
+
+def _assert_left_unsized(tmp_path):
+    with get_session() as session:
+        assert session.get(JobSearch, 1).last_page_number is None
+
+    assert (tmp_path / "timeouts.txt").read_text() == "https://uk.indeed.com/jobs?q=Nurse\n"
+
+
+def test_streamed_search_failing_on_page_one_is_left_unsized(job_search, tmp_path, monkeypatch):
+    monkeypatch.setattr(bot_manager, "scrape_search_page", _failing_search_page)
+
+    bot_manager.process_search_streaming(job_search, retry_count=bot_manager.RETRY_LIMIT - 1)
+
+    _assert_left_unsized(tmp_path)
+
+
+def test_async_streamed_search_failing_on_page_one_is_left_unsized(job_search, tmp_path, monkeypatch):
+    async def failing_search_page(*args):
+        _failing_search_page()
+
+    monkeypatch.setattr(bot_manager, "scrape_search_page_async", failing_search_page)
+
+    asyncio.run(bot_manager.process_search_streaming_async(None, job_search, retry_count=bot_manager.RETRY_LIMIT - 1))
+
+    _assert_left_unsized(tmp_path)
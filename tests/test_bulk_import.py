@@ -0,0 +1,42 @@
+import csv
+from database import engine
+from sqlalchemy import delete, insert, select
+from database.models import JobSearch, JobListing
+from database.bulk_import import import_job_listings_from_csv, _convert
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["job_search_id", "page_number", "job_title", "company", "job_link"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_import_counts_rows_written_not_rows_read(tmp_path):
+    with engine.begin() as connection:
+        connection.execute(delete(JobListing))
+        connection.execute(delete(JobSearch))
+        connection.execute(insert(JobSearch), [{"id": 1, "job_title": "Nurse", "generated_link": "link"}])
+
+    csv_file = tmp_path / "listings.csv"
+    _write_csv(csv_file, [
+        {"job_search_id": 1, "page_number": 1, "job_title": "Nurse", "company": "A", "job_link": "https://uk.indeed.com/rc/clk?jk=aaa111"},
+        {"job_search_id": 1, "page_number": 2, "job_title": "Nurse", "company": "B", "job_link": "https://uk.indeed.com/rc/clk?jk=aaa111&from=vj"},
+        {"job_search_id": 1, "page_number": 1, "job_title": "", "company": "", "job_link": "https://uk.indeed.com/rc/clk?jk=bbb222"},
+    ])
+
+    assert import_job_listings_from_csv(str(csv_file)) == 2
+    assert import_job_listings_from_csv(str(csv_file)) == 2
+
+    with engine.connect() as connection:
+        rows = connection.execute(select(JobListing.job_key, JobListing.job_title, JobListing.company).order_by(JobListing.job_key)).all()
+
+    assert rows == [("aaa111", "Nurse", "B"), ("bbb222", "", None)]
+
+
+def test_empty_fields_stay_empty_in_not_null_columns():
+    table = JobListing.__table__
+
+    assert _convert("", table.c.job_title) == ""
+    assert _convert("", table.c.company) is None
+    assert _convert("", table.c.scrape_status) == "pending"
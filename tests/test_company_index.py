@@ -0,0 +1,26 @@
+from database import engine
+from sqlalchemy import delete, insert
+from database.models import JobSearch, JobListing
+from database.company_index import build_company_index, canonical_company_map
+
+
+def test_company_index_is_stored_and_read_back():
+    with engine.begin() as connection:
+        connection.execute(delete(JobListing))
+        connection.execute(delete(JobSearch))
+        connection.execute(insert(JobSearch), [{"id": 1, "job_title": "Nurse", "generated_link": "link"}])
+        connection.execute(
+            insert(JobListing),
+            [
+                {"job_search_id": 1, "page_number": 1, "job_title": "Nurse", "job_link": "N/A", "company": company}
+                for company in ["Amazon", "Amazon", "Amazon UK", "Amazon Web Services (AWS)", "Boots", "Booths"]
+            ],
+        )
+
+    assert build_company_index() == canonical_company_map() == {
+        "Amazon": "Amazon",
+        "Amazon UK": "Amazon",
+        "Amazon Web Services (AWS)": "Amazon",
+        "Boots": "Boots",
+        "Booths": "Booths",
+    }
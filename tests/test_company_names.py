@@ -0,0 +1,40 @@
+from scraper_utils.company_names import normalize_company_name, cluster_company_names
+
+
+def _cluster(*names):
+    return cluster_company_names({name: 1 for name in names}, threshold=0.9)
+
+
+def test_normalize_strips_suffixes_regions_and_parentheses():
+    assert normalize_company_name("Amazon UK Ltd.") == "amazon"
+    assert normalize_company_name("The Boots Company PLC") == "boots"
+    assert normalize_company_name("Amazon Web Services (AWS)") == "amazon web services"
+
+
+def test_normalize_keeps_suffixes_after_connectors():
+    assert normalize_company_name("Bank of England") == "bank of england"
+    assert normalize_company_name("Bank of America") == "bank of america"
+
+
+def test_variants_collapse_into_one_company():
+    canonical = cluster_company_names({"Amazon": 10, "Amazon UK": 3, "amazon ltd": 1, "Amazon Web Services (AWS)": 2})
+
+    assert set(canonical.values()) == {"Amazon"}
+
+
+def test_typos_of_long_names_collapse():
+    canonical = _cluster("PricewaterhouseCoopers", "Pricewaterhouse Coopers")
+
+    assert len(set(canonical.values())) == 1
+
+
+def test_names_extending_a_short_name_by_other_words_stay_apart():
+    canonical = _cluster("Bank", "Bank of England", "Bank of America", "National", "National Grid", "National Trust")
+
+    assert len(set(canonical.values())) == 6
+
+
+def test_short_names_a_letter_apart_stay_apart():
+    canonical = _cluster("Boots", "Booths")
+
+    assert canonical == {"Boots": "Boots", "Booths": "Booths"}
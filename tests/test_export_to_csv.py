@@ -0,0 +1,53 @@
+import csv
+from database import engine, get_session
+from sqlalchemy import delete, insert
+from database.models import JobSearch, JobListing
+from database.export_to_csv import export_path, write_query_to_csv
+
+
+def _reset(listings):
+    with engine.begin() as connection:
+        connection.execute(delete(JobListing))
+        connection.execute(delete(JobSearch))
+        connection.execute(insert(JobSearch), [{"id": 1, "job_title": "Nurse", "generated_link": "link"}])
+        if listings:
+            connection.execute(
+                insert(JobListing),
+                [{"job_search_id": 1, "page_number": 1, "job_title": "Nurse", "job_link": "N/A", **listing} for listing in listings],
+            )
+
+
+def test_empty_result_writes_no_file(tmp_path):
+    _reset([])
+    output_file = tmp_path / "empty.csv"
+
+    with get_session() as session:
+        assert write_query_to_csv(session.query(JobListing.id), str(output_file), ["ID"], compress=False) == 0
+
+    assert not output_file.exists()
+    assert not (tmp_path / "empty.csv.part").exists()
+
+
+def test_rows_are_written_in_chunks(tmp_path):
+    _reset([{"company": f"Company {index}"} for index in range(5)])
+    output_file = tmp_path / "companies.csv"
+
+    with get_session() as session:
+        query = session.query(JobListing.company).order_by(JobListing.id)
+        assert write_query_to_csv(query, str(output_file), ["Company"], chunk_size=2, compress=False) == 5
+
+    with open(output_file, newline="") as file:
+        assert [row[0] for row in csv.reader(file)] == ["Company"] + [f"Company {index}" for index in range(5)]
+
+
+def test_export_path_matches_the_written_file(tmp_path):
+    _reset([{"company": "Company 0"}])
+    output_file = str(tmp_path / "companies.csv")
+
+    with get_session() as session:
+        assert write_query_to_csv(session.query(JobListing.company), output_file, ["Company"], compress=True) == 1
+
+    assert export_path(output_file, compress=True) == f"{output_file}.gz"
+    assert export_path(f"{output_file}.gz", compress=True) == f"{output_file}.gz"
+    assert export_path(output_file, compress=False) == output_file
+    assert (tmp_path / "companies.csv.gz").exists()
@@ -0,0 +1,52 @@
+import pytest
+from datetime import datetime
+from database import engine
+from sqlalchemy import delete, insert
+from database.models import JobSearch, JobListing
+from database.export_to_parquet import export_table_to_columnar
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def listings():
+    with engine.begin() as connection:
+        connection.execute(delete(JobListing))
+        connection.execute(delete(JobSearch))
+        connection.execute(insert(JobSearch), [{"id": 1, "job_title": "Nurse", "generated_link": "link"}])
+        connection.execute(
+            insert(JobListing),
+            [
+                {
+                    "job_search_id": 1,
+                    "page_number": 1,
+                    "job_title": "Nurse",
+                    "job_link": f"https://uk.indeed.com/rc/clk?jk={index:06d}",
+                    "job_key": f"{index:06d}",
+                    "company": f"Company {index % 7}",
+                    "location": "London",
+                    "date_scraped": datetime(2024, 5, 1 + index % 2),
+                }
+                for index in range(45)
+            ],
+        )
+
+
+def test_arrow_export_writes_several_batches_per_partition(listings, tmp_path):
+    assert export_table_to_columnar(JobListing, str(tmp_path), export_format='arrow', chunk_size=10) == 45
+
+    tables = [
+        pa.ipc.open_file(str(path)).read_all()
+        for path in sorted((tmp_path / "job_listing").glob("*/part-0.arrow"))
+    ]
+
+    assert len(tables) == 2
+    assert sum(table.num_rows for table in tables) == 45
+    assert set(pa.concat_tables(tables).column("company").to_pylist()) == {f"Company {index}" for index in range(7)}
+
+
+def test_parquet_export_writes_several_batches_per_partition(listings, tmp_path):
+    assert export_table_to_columnar(JobListing, str(tmp_path), export_format='parquet', chunk_size=10) == 45
+
+    assert pq.read_table(str(tmp_path / "job_listing")).num_rows == 45
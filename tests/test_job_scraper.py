@@ -0,0 +1,36 @@
+from database import engine
+from sqlalchemy import delete, insert, event
+from database.models import JobSearch, JobListing
+from database.job_keys import get_seen_job_keys
+from jobs.job_scraper import store_job_cards
+
+
+def test_storing_job_cards_does_not_reload_the_stored_listings():
+    with engine.begin() as connection:
+        connection.execute(delete(JobListing))
+        connection.execute(delete(JobSearch))
+        connection.execute(insert(JobSearch), [{"id": 1, "job_title": "Nurse", "generated_link": "link"}])
+
+    job_cards = [
+        {"job_title": "Nurse", "company": "NHS", "job_link": f"https://uk.indeed.com/rc/clk?jk=store{index:04d}"}
+        for index in range(14)
+    ]
+    seen_job_keys = get_seen_job_keys()
+    seen_job_keys.claim("preload")  # Loads the known keys before SELECTs are counted
+    seen_job_keys.release(["preload"] + [f"store{index:04d}" for index in range(14)])
+
+    selects = []
+
+    def count_selects(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_selects)
+    try:
+        job_listings = store_job_cards(job_cards, 1, 1)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_selects)
+
+    assert [listing.job_link for listing in job_listings] == [card["job_link"] for card in job_cards]
+    assert all(listing.id for listing in job_listings)
+    assert selects == []
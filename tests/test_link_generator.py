@@ -0,0 +1,15 @@
+from jobs.link_generator import generate_page_url, last_page_from_job_count, RESULTS_PER_PAGE, MAX_SEARCH_PAGES
+
+
+def test_page_urls_step_by_results_per_page():
+    assert generate_page_url("https://uk.indeed.com/jobs?q=Nurse", 1) == "https://uk.indeed.com/jobs?q=Nurse"
+    assert generate_page_url("https://uk.indeed.com/jobs?q=Nurse", 3).endswith(f"&start={2 * RESULTS_PER_PAGE}")
+
+
+def test_page_count_follows_the_job_count():
+    assert last_page_from_job_count(0) == 1
+    assert last_page_from_job_count(RESULTS_PER_PAGE + 1) == 2
+
+
+def test_page_count_is_clamped_to_the_pages_indeed_serves():
+    assert last_page_from_job_count(1_000_000) == MAX_SEARCH_PAGES
@@ -0,0 +1,34 @@
+from database import engine
+from sqlalchemy import delete, insert, select
+from database.models import JobSearch, JobListing, SCRAPE_DUPLICATE, SCRAPE_PENDING
+from database.maintenance import collapse_duplicate_listings
+
+
+def _insert_listings(listings):
+    with engine.begin() as connection:
+        connection.execute(delete(JobListing))
+        connection.execute(delete(JobSearch))
+        connection.execute(insert(JobSearch), [{"id": 1, "job_title": "Nurse", "generated_link": "link"}])
+        connection.execute(
+            insert(JobListing),
+            [{"job_search_id": 1, "page_number": 1, "job_title": "Nurse", **listing} for listing in listings],
+        )
+
+
+def test_collapse_keeps_distinct_jobs_sharing_the_na_link():
+    _insert_listings([{"job_link": "N/A", "company": f"Company {index}"} for index in range(4)])
+
+    assert collapse_duplicate_listings(dry_run=True) == 0
+    assert collapse_duplicate_listings() == 0
+
+
+def test_collapse_deletes_listings_marked_as_duplicates():
+    _insert_listings([
+        {"job_link": "https://uk.indeed.com/rc/clk?jk=aaa111", "job_key": "aaa111", "scrape_status": SCRAPE_PENDING},
+        {"job_link": "https://uk.indeed.com/rc/clk?jk=aaa111&from=vj", "job_key": None, "scrape_status": SCRAPE_DUPLICATE},
+    ])
+
+    assert collapse_duplicate_listings(batch_size=1) == 1
+
+    with engine.connect() as connection:
+        assert connection.execute(select(JobListing.job_key)).scalars().all() == ["aaa111"]
@@ -0,0 +1,87 @@
+from sqlalchemy import create_engine, text
+from database.migrations import run_migrations
+from database.models import SCRAPE_DONE, SCRAPE_DUPLICATE, SCRAPE_PENDING
+
+
+# Tables as created before scrape state and job keys existed
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE job_search (
+        id INTEGER PRIMARY KEY,
+        job_title VARCHAR NOT NULL,
+        generated_link VARCHAR NOT NULL,
+        last_page_number INTEGER,
+        pagination_links JSON,
+        date_scraped DATETIME
+    )
+    """,
+    """
+    CREATE TABLE job_listing (
+        id INTEGER PRIMARY KEY,
+        job_search_id INTEGER NOT NULL REFERENCES job_search (id),
+        date_scraped DATETIME,
+        page_number INTEGER NOT NULL,
+        job_title VARCHAR NOT NULL,
+        company VARCHAR,
+        location VARCHAR,
+        posted_date VARCHAR,
+        job_link VARCHAR NOT NULL,
+        stars VARCHAR,
+        job_type VARCHAR,
+        full_description TEXT,
+        apply_now_link VARCHAR
+    )
+    """,
+]
+
+
+def _baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+
+    with engine.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.execute(text(statement))
+
+        connection.execute(text("INSERT INTO job_search (id, job_title, generated_link) VALUES (1, 'Nurse', 'link')"))
+        connection.execute(
+            text(
+                "INSERT INTO job_listing (id, job_search_id, page_number, job_title, job_link, apply_now_link) "
+                "VALUES (:id, 1, 1, 'Nurse', :job_link, :apply_now_link)"
+            ),
+            [
+                {"id": 1, "job_link": "https://uk.indeed.com/rc/clk?jk=aaa111&from=serp", "apply_now_link": "https://apply/1"},
+                {"id": 2, "job_link": "https://uk.indeed.com/rc/clk?jk=aaa111&from=vj", "apply_now_link": "https://apply/2"},
+                {"id": 3, "job_link": "https://uk.indeed.com/rc/clk?jk=bbb222", "apply_now_link": None},
+                {"id": 4, "job_link": "N/A", "apply_now_link": None},
+                {"id": 5, "job_link": "https://uk.indeed.com/rc/clk?jk=bbb222&from=vj", "apply_now_link": None},
+            ],
+        )
+
+    return engine
+
+
+def test_upgrades_baseline_database_with_duplicate_job_links(tmp_path):
+    engine = _baseline_engine(tmp_path)
+
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT id, job_key, scrape_status FROM job_listing ORDER BY id")).fetchall()
+
+    assert rows == [
+        (1, "aaa111", SCRAPE_DONE),
+        (2, None, SCRAPE_DUPLICATE),
+        (3, "bbb222", SCRAPE_PENDING),
+        (4, None, SCRAPE_PENDING),
+        (5, None, SCRAPE_DUPLICATE),
+    ]
+
+
+def test_migrations_are_idempotent(tmp_path):
+    engine = _baseline_engine(tmp_path)
+
+    run_migrations(engine)
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM job_listing WHERE job_key IS NOT NULL")).scalar() == 2
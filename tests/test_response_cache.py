@@ -0,0 +1,31 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from scraper_utils.response_cache import ResponseCache, CacheMissError
+
+
+def test_round_trip_with_equivalent_urls(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=60)
+    cache.put("https://uk.indeed.com/jobs?q=Nurse&l=London", b"<html>nurse</html>")
+
+    assert cache.get("https://UK.indeed.com/jobs?l=London&q=Nurse") == b"<html>nurse</html>"
+    assert cache.get("https://uk.indeed.com/jobs?q=Chef") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_offline_miss_raises(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=60, offline=True)
+
+    with pytest.raises(CacheMissError):
+        cache.get("https://uk.indeed.com/jobs?q=Chef")
+
+
+def test_concurrent_reads_and_writes(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=60)
+    urls = [f"https://uk.indeed.com/jobs?q=title{index}" for index in range(200)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda url: cache.put(url, url.encode() * 100), urls))
+        bodies = list(executor.map(cache.get, urls))
+
+    assert bodies == [url.encode() * 100 for url in urls]
+    assert not list(tmp_path.glob("*/*.part"))